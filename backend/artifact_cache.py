@@ -0,0 +1,121 @@
+"""
+CV Artifact Cache - derived data keyed by content hash
+Stores extracted CV text (keyed by file SHA-256 + extractor version) and
+parsed resumes (keyed by text SHA-256 + prompt version) so identical
+re-uploads skip extraction and the LLM parse call entirely.
+"""
+import hashlib
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+# Artifact kinds
+EXTRACTED_TEXT = "extracted_text"
+PARSED_RESUME = "parsed_resume"
+
+
+def text_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ArtifactCache:
+    """
+    Persistent cache in the `cv_artifact_cache` collection.
+
+    - Entries expire `ttl_days` after their last write (Mongo TTL index)
+    - When the collection grows past `max_entries` the least recently used
+      entries are evicted
+    - Hit/miss counters are kept per artifact kind for the metrics endpoint
+    """
+
+    def __init__(self, db, ttl_days: int = 30, max_entries: int = 50000, eviction_check_every: int = 100):
+        self.collection = db.cv_artifact_cache
+        self.ttl_days = ttl_days
+        self.max_entries = max_entries
+        self.eviction_check_every = eviction_check_every
+        self._writes_since_check = 0
+        self._counters = {
+            kind: {"hits": 0, "misses": 0, "writes": 0}
+            for kind in (EXTRACTED_TEXT, PARSED_RESUME)
+        }
+        self._evicted = 0
+
+    @staticmethod
+    def cache_key(kind: str, content_hash: str, version: str) -> str:
+        return f"{kind}:{version}:{content_hash}"
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("cache_key", unique=True)
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        await self.collection.create_index("last_accessed_at")
+
+    async def get(self, kind: str, content_hash: str, version: str) -> Optional[dict]:
+        """Return the cached value and refresh its LRU timestamp, or None"""
+        entry = await self.collection.find_one_and_update(
+            {"cache_key": self.cache_key(kind, content_hash, version)},
+            {
+                "$set": {"last_accessed_at": datetime.now(timezone.utc)},
+                "$inc": {"hits": 1}
+            },
+            projection={"_id": 0, "value": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if entry is None:
+            self._counters[kind]["misses"] += 1
+            return None
+        self._counters[kind]["hits"] += 1
+        return entry["value"]
+
+    async def put(self, kind: str, content_hash: str, version: str, value: dict):
+        now = datetime.now(timezone.utc)
+        await self.collection.update_one(
+            {"cache_key": self.cache_key(kind, content_hash, version)},
+            {
+                "$set": {
+                    "kind": kind,
+                    "content_hash": content_hash,
+                    "version": version,
+                    "value": value,
+                    "last_accessed_at": now,
+                    "expires_at": now + timedelta(days=self.ttl_days)
+                },
+                "$setOnInsert": {"created_at": now, "hits": 0}
+            },
+            upsert=True
+        )
+        self._counters[kind]["writes"] += 1
+
+        self._writes_since_check += 1
+        if self._writes_since_check >= self.eviction_check_every:
+            self._writes_since_check = 0
+            await self._evict_lru()
+
+    async def _evict_lru(self):
+        excess = await self.collection.estimated_document_count() - self.max_entries
+        if excess <= 0:
+            return
+        stale = await self.collection.find(
+            {}, {"_id": 1}
+        ).sort("last_accessed_at", 1).limit(excess).to_list(excess)
+        result = await self.collection.delete_many({"_id": {"$in": [e["_id"] for e in stale]}})
+        self._evicted += result.deleted_count
+        logger.info(f"Artifact cache evicted {result.deleted_count} least recently used entries")
+
+    def metrics(self) -> dict:
+        kinds = {}
+        for kind, counters in self._counters.items():
+            lookups = counters["hits"] + counters["misses"]
+            kinds[kind] = {
+                **counters,
+                "hit_rate": round(counters["hits"] / lookups, 3) if lookups else None
+            }
+        return {
+            "ttl_days": self.ttl_days,
+            "max_entries": self.max_entries,
+            "evicted": self._evicted,
+            "kinds": kinds
+        }
@@ -0,0 +1,98 @@
+"""
+LLM Client Benchmark
+Drives concurrent CV parse calls through the shared LLMClient (rate limiter
+and request hedging included) against an OpenAI-compatible endpoint -
+normally benchmarks/mock_llm_server.py - and reports throughput, latency
+percentiles, retries, hedges and timeouts.
+
+Usage (from backend/, with the mock server running):
+    LLM_BASE_URL=http://localhost:8089/v1 python benchmarks/llm_client_benchmark.py --calls 200 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from cv_extraction import extract_text_from_path  # noqa: E402
+from llm_client import LLMClient  # noqa: E402
+
+UPLOADS_DIR = BACKEND_DIR / "uploads"
+
+SYSTEM_PROMPT = "You are an expert CV/Resume parser. Return ONLY valid JSON."
+
+
+def load_cv_texts() -> list[str]:
+    texts = []
+    for path in sorted(UPLOADS_DIR.iterdir()):
+        try:
+            text = extract_text_from_path(str(path), path.name)
+        except Exception:
+            continue
+        if text.strip():
+            texts.append(text)
+    return texts or ["Jane Roe\nSkills\nPython, SQL"]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+async def run(calls: int, concurrency: int) -> dict:
+    client = LLMClient.from_env()
+    client.start(os.environ.get('EMERGENT_LLM_KEY') or "mock")
+    texts = load_cv_texts()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one(index: int):
+        nonlocal failures
+        prompt = f"RESUME TEXT:\n---\n{texts[index % len(texts)]}\n---\n"
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                json.loads(await client.chat(SYSTEM_PROMPT, prompt))
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(calls)))
+    elapsed = time.perf_counter() - started
+    await client.close()
+
+    report = {
+        "calls": calls,
+        "concurrency": concurrency,
+        "failures": failures,
+        "wall_seconds": round(elapsed, 2),
+        "calls_per_second": round(calls / elapsed, 2),
+    }
+    if latencies:
+        report.update({
+            f"p{pct}_ms": round(percentile(latencies, pct) * 1000, 1) for pct in (50, 95, 99)
+        })
+    report["client"] = client.metrics()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    if not os.environ.get('LLM_BASE_URL'):
+        print("LLM_BASE_URL is not set - this would call the real provider", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(asyncio.run(run(args.calls, args.concurrency)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
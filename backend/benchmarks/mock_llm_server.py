@@ -0,0 +1,293 @@
+"""
+Mock LLM Server - local OpenAI-compatible chat-completions endpoint
+Answers the CV parse, candidate story and combined parse + story prompts with
+deterministic JSON built from the prompt itself (the resume text is parsed by
+the local rule-based parser), so the ingestion path can run and be load-tested
+without a key. Latency, errors, 429s and hung requests are injected from a
+seeded random source to exercise the rate limiter and request hedging.
+
+Usage (from backend/):
+    python benchmarks/mock_llm_server.py --port 8089 --latency lognormal --latency-ms 1500 --rate-limit-rate 0.05
+
+Then start the app with:
+    LLM_BASE_URL=http://localhost:8089/v1 EMERGENT_LLM_KEY=mock CV_LOCAL_PARSE=false
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from llm_rate_limiter import estimate_tokens  # noqa: E402
+from local_cv_parser import parse_cv_locally  # noqa: E402
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+_RESUME_TEXT = re.compile(r"RESUME TEXT:\n---\n(.*?)\n---\n", re.DOTALL)
+_CANDIDATE_DATA = re.compile(r"CANDIDATE DATA:\n(\{.*?\n\})\n", re.DOTALL)
+_JOB_TITLE = re.compile(r"^- Title: (.*)$", re.MULTILINE)
+_JOB_SKILLS = re.compile(r"^- Required Skills: (.*)$", re.MULTILINE)
+
+
+class MockConfig:
+    """Latency, failure injection and seed for one mock server instance"""
+
+    def __init__(
+        self,
+        latency: str = "lognormal",
+        latency_ms: float = 1500.0,
+        latency_sigma: float = 0.5,
+        tokens_per_second: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after_seconds: float = 1.0,
+        hang_rate: float = 0.0,
+        hang_seconds: float = 60.0,
+        seed: int = 0
+    ):
+        if latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency must be one of {LATENCY_DISTRIBUTIONS}")
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after_seconds = retry_after_seconds
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.random = random.Random(seed)
+
+    def sample_latency(self) -> float:
+        """Seconds before the first token"""
+        median = self.latency_ms / 1000.0
+        if self.latency == "fixed":
+            return median
+        if self.latency == "uniform":
+            return self.random.uniform(0, 2 * median)
+        return median * math.exp(self.random.gauss(0, self.latency_sigma))
+
+    def sample_outcome(self) -> str:
+        """"ok", "rate_limited", "error" or "hang" for the next request"""
+        roll = self.random.random()
+        for outcome, rate in (("rate_limited", self.rate_limit_rate), ("error", self.error_rate), ("hang", self.hang_rate)):
+            if roll < rate:
+                return outcome
+            roll -= rate
+        return "ok"
+
+
+# ============ DETERMINISTIC RESPONSES ============
+
+def _digest_int(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def mock_parse(resume_text: str) -> dict:
+    """ParsedResume-shaped JSON from the rule-based parser"""
+    parsed, _ = parse_cv_locally(resume_text)
+    if not parsed["summary"]:
+        role = parsed["current_role"] or "Professional"
+        parsed["summary"] = f"{role} with experience across {len(parsed['experience'])} roles."
+    return parsed
+
+
+def mock_story(candidate: dict, job_title: str, job_skills: list[str]) -> dict:
+    """CandidateStory-shaped JSON; fit score from required-skill overlap"""
+    skills = candidate.get("skills") or []
+    candidate_skills = {skill.lower() for skill in skills}
+    matched = [skill for skill in job_skills if skill.lower() in candidate_skills]
+    overlap = len(matched) / len(job_skills) if job_skills else 0.5
+    # Deterministic +/-5 spread so identical skill sets do not all tie
+    fit_score = max(5, min(95, round(25 + 60 * overlap) + _digest_int(json.dumps(candidate, sort_keys=True)) % 11 - 5))
+    experience = candidate.get("experience") or []
+    return {
+        "headline": f"{candidate.get('name') or 'Candidate'} - {candidate.get('current_role') or 'Professional'}",
+        "summary": (
+            f"{candidate.get('current_role') or 'Candidate'} with {len(experience)} "
+            f"role{'' if len(experience) == 1 else 's'} on record, "
+            + (f"matching {len(matched)} of {len(job_skills)} required skills for {job_title}."
+               if job_skills else f"applying for {job_title}.")
+        ),
+        "timeline": [
+            {
+                "year": exp.get("duration", ""),
+                "title": exp.get("role", ""),
+                "company": exp.get("company", ""),
+                "achievement": (exp.get("achievements") or [""])[0],
+            }
+            for exp in experience[:5]
+        ],
+        "skills": skills[:15],
+        "highlights": [f"Has {skill}" for skill in matched[:3]] or ["Review candidate profile for details"],
+        "fit_score": fit_score,
+    }
+
+
+def mock_completion_content(system_prompt: str, user_prompt: str) -> str:
+    """Response text for a parse, story or combined prompt (JSON in every case)"""
+    title_match = _JOB_TITLE.search(user_prompt)
+    skills_match = _JOB_SKILLS.search(user_prompt)
+    job_title = title_match.group(1).strip() if title_match else "Position"
+    job_skills = []
+    if skills_match and skills_match.group(1).strip() != "Not specified":
+        job_skills = [skill.strip() for skill in skills_match.group(1).split(",") if skill.strip()]
+
+    resume_match = _RESUME_TEXT.search(user_prompt)
+    if resume_match:
+        resume = mock_parse(resume_match.group(1))
+        if "=== TASK 2" in system_prompt:
+            return json.dumps({"resume": resume, "story": mock_story(resume, job_title, job_skills)})
+        return json.dumps(resume)
+
+    candidate_match = _CANDIDATE_DATA.search(user_prompt)
+    candidate = json.loads(candidate_match.group(1)) if candidate_match else {}
+    return json.dumps(mock_story(candidate, job_title, job_skills))
+
+
+# ============ HTTP API ============
+
+def _error(status_code: int, message: str, error_type: str, headers: dict = None) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": {"message": message, "type": error_type, "code": None}},
+        headers=headers
+    )
+
+
+def create_app(config: MockConfig) -> FastAPI:
+    app = FastAPI(title="Mock LLM Server")
+    stats = {"requests": 0, "rate_limited": 0, "errors": 0, "hung": 0}
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "mock"}]}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+        outcome = config.sample_outcome()
+        if outcome == "rate_limited":
+            stats["rate_limited"] += 1
+            return _error(429, "Rate limit reached (mock)", "rate_limit_error",
+                          headers={"retry-after": str(config.retry_after_seconds)})
+        if outcome == "error":
+            stats["errors"] += 1
+            return _error(500, "Internal server error (mock)", "server_error")
+
+        messages = body.get("messages") or []
+        system_prompt = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+        user_prompt = next((m.get("content", "") for m in messages if m.get("role") == "user"), "")
+        content = mock_completion_content(system_prompt, user_prompt)
+        prompt_tokens = estimate_tokens(system_prompt + user_prompt)
+        completion_tokens = estimate_tokens(content)
+        model = body.get("model", "mock")
+        completion_id = f"chatcmpl-mock{_digest_int(user_prompt):08x}"
+        created = int(time.time())
+
+        first_token = config.sample_latency()
+        if outcome == "hang":
+            stats["hung"] += 1
+            first_token = config.hang_seconds
+        generation = completion_tokens / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+        if not body.get("stream"):
+            await asyncio.sleep(first_token + generation)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
+                }
+            }
+
+        async def events():
+            await asyncio.sleep(first_token)
+            pieces = [content[i:i + 24] for i in range(0, len(content), 24)]
+            for index, piece in enumerate(pieces):
+                delta = {"content": piece} if index else {"role": "assistant", "content": piece}
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": None}]
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                if generation:
+                    await asyncio.sleep(generation / len(pieces))
+            done = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+            }
+            yield f"data: {json.dumps(done)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=1500.0, help="median time to first token")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="lognormal spread")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="generation speed (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="fraction of requests that hang")
+    parser.add_argument("--hang-seconds", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        seed=args.seed
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
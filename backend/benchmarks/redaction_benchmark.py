@@ -0,0 +1,93 @@
+"""
+PII Redaction Benchmark
+Compares the original five-pass `re.sub` redaction with the single-pass span
+scanner on the CVs in backend/uploads, and reports per-candidate storage for
+a full redacted copy versus the span list.
+
+Usage (from backend/):
+    python benchmarks/redaction_benchmark.py [--repeat 200]
+"""
+import argparse
+import json
+import re
+import sys
+import timeit
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from cv_extraction import extract_text_from_path  # noqa: E402
+from pii_redaction import find_pii_spans, render_redacted  # noqa: E402
+
+UPLOADS_DIR = BACKEND_DIR / "uploads"
+
+
+def legacy_redact_text(text: str) -> str:
+    """The previous implementation - one re.sub pass per PII type"""
+    text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '[EMAIL REDACTED]', text)
+    text = re.sub(r'\b(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3,4}[-.\s]?\d{4}\b', '[PHONE REDACTED]', text)
+    text = re.sub(r'\b\d{3}-\d{4}\b', '[PHONE REDACTED]', text)
+    text = re.sub(r'https?://(www\.)?linkedin\.com/[^\s]+', '[LINKEDIN REDACTED]', text)
+    text = re.sub(r'https?://[^\s]+', '[URL REDACTED]', text)
+    return text
+
+
+def load_fixtures() -> list[tuple[str, str]]:
+    fixtures = []
+    for path in sorted(UPLOADS_DIR.iterdir()):
+        if path.is_file() and path.suffix.lower() in {".pdf", ".docx", ".txt"}:
+            fixtures.append((path.name, extract_text_from_path(str(path), path.name)))
+    return fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="Redactions per fixture")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    if not fixtures:
+        print(f"No CV fixtures found in {UPLOADS_DIR}")
+        return
+    total_chars = sum(len(text) for _, text in fixtures)
+    print(f"{len(fixtures)} CVs, {total_chars:,} chars, {args.repeat} runs each\n")
+
+    def run_legacy():
+        for _, text in fixtures:
+            legacy_redact_text(text)
+
+    def run_scan():
+        for _, text in fixtures:
+            find_pii_spans(text)
+
+    def run_scan_and_render():
+        for _, text in fixtures:
+            render_redacted(text, find_pii_spans(text))
+
+    results = {}
+    for label, fn in [
+        ("legacy 5-pass re.sub", run_legacy),
+        ("single-pass spans (write path)", run_scan),
+        ("single-pass spans + render (read path)", run_scan_and_render),
+    ]:
+        seconds = min(timeit.repeat(fn, number=args.repeat, repeat=3)) / args.repeat
+        results[label] = seconds
+        print(f"{label:<40} {seconds * 1000:8.3f} ms/batch  {total_chars / seconds / 1e6:7.1f} M chars/s")
+
+    legacy = results["legacy 5-pass re.sub"]
+    print(f"\nwrite path speedup: {legacy / results['single-pass spans (write path)']:.2f}x")
+
+    redacted_bytes = sum(len(legacy_redact_text(text).encode("utf-8")) for _, text in fixtures)
+    span_bytes = sum(len(json.dumps(find_pii_spans(text)).encode("utf-8")) for _, text in fixtures)
+    print(f"\nstored per batch: redacted copies {redacted_bytes:,} B vs span lists {span_bytes:,} B")
+
+    mismatches = [
+        name for name, text in fixtures
+        if legacy_redact_text(text) != render_redacted(text, find_pii_spans(text))
+    ]
+    print(f"output differs from legacy on {len(mismatches)} of {len(fixtures)} CVs {mismatches or ''}")
+
+
+if __name__ == "__main__":
+    main()
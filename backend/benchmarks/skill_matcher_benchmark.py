@@ -0,0 +1,93 @@
+"""
+Skill Matcher Benchmark
+Compares the pairwise substring loop previously used by calculate_fit_score
+with the prebuilt Aho-Corasick SkillMatcher on synthetic skill lists, checks
+that both give the same exact / partial hits, and reports the speedup as the
+job and candidate skill lists grow. "cold" builds a fresh matcher per run;
+"warm" reuses the cached matcher, whose per-skill hits are already memoized.
+
+Usage (from backend/):
+    python benchmarks/skill_matcher_benchmark.py [--candidates 500] [--repeat 3]
+"""
+import argparse
+import random
+import string
+import sys
+import timeit
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from skill_matcher import SkillMatcher  # noqa: E402
+
+COMMON_SKILLS = [
+    "python", "java", "javascript", "typescript", "react", "react native", "node.js", "sql", "nosql",
+    "postgresql", "mysql", "aws", "azure", "gcp", "docker", "kubernetes", "go", "c++", "c#",
+    "machine learning", "deep learning", "excel", "power bi", "tableau", "scala", "spark", "airflow",
+]
+
+
+def pairwise_hits(candidate_skills: set[str], job_skills: list[str]) -> tuple[set[int], set[int]]:
+    """The previous O(job skills x candidate skills) loop"""
+    exact, partial = set(), set()
+    for index, js in enumerate(job_skills):
+        if js in candidate_skills:
+            exact.add(index)
+            continue
+        for cs in candidate_skills:
+            if js in cs or cs in js:
+                partial.add(index)
+                break
+    return exact, partial
+
+
+def synthetic_skills(rng: random.Random, count: int) -> list[str]:
+    skills = list(COMMON_SKILLS)
+    while len(skills) < count:
+        words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        skills.append(" ".join(words))
+    return skills[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=500, help="Candidates scored per run")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repeats (best is reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{args.candidates} candidates per run\n")
+    print(f"{'job skills':>10} {'cand skills':>11} {'pairwise ms':>12} {'cold ms':>8} {'warm ms':>8} {'build ms':>9} {'speedup':>8}")
+    for job_count, candidate_count in [(10, 15), (25, 40), (50, 100), (100, 200), (200, 400)]:
+        pool = synthetic_skills(rng, max(job_count, candidate_count) * 3)
+        job_skills = sorted(set(rng.sample(pool, job_count)))
+        candidates = [set(rng.sample(pool, candidate_count)) for _ in range(args.candidates)]
+
+        build_seconds = min(timeit.repeat(lambda: SkillMatcher(job_skills), number=1, repeat=args.repeat))
+        matcher = SkillMatcher(job_skills)
+        for candidate_skills in candidates:
+            assert matcher.match_skills(candidate_skills) == pairwise_hits(candidate_skills, job_skills)
+
+        pairwise = min(timeit.repeat(
+            lambda: [pairwise_hits(skills, job_skills) for skills in candidates], number=1, repeat=args.repeat
+        ))
+
+        def cold_run():
+            fresh = SkillMatcher(job_skills)
+            return [fresh.match_skills(skills) for skills in candidates]
+
+        cold = min(timeit.repeat(cold_run, number=1, repeat=args.repeat))
+        warm = min(timeit.repeat(
+            lambda: [matcher.match_skills(skills) for skills in candidates], number=1, repeat=args.repeat
+        ))
+        print(
+            f"{len(job_skills):>10} {candidate_count:>11} {pairwise * 1000:>12.1f} {cold * 1000:>8.1f} {warm * 1000:>8.1f} "
+            f"{build_seconds * 1000:>9.2f} {pairwise / cold:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+"""
+CV Text Extraction Engine - PDF/DOCX parsing off the event loop
+Runs pdfplumber / the streaming DOCX reader in a recycled process pool so a large CV
+never blocks other requests on the same uvicorn worker
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from xml.etree import ElementTree
+
+# PDF parsing (DOCX is read straight from the zip, see iter_docx_blocks)
+import pdfplumber
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction output changes so cached text is not reused
+CV_EXTRACTOR_VERSION = "2"
+
+
+# ============ EXTRACTION (runs inside worker processes) ============
+
+def _clean_extracted_text(extracted_text: str) -> str:
+    """Remove excessive whitespace but preserve structure"""
+    extracted_text = re.sub(r'\n{3,}', '\n\n', extracted_text)
+    extracted_text = re.sub(r' {2,}', ' ', extracted_text)
+    return extracted_text.strip()
+
+
+def iter_pdf_page_texts(file_path: str):
+    """Yield (page_number, page_count, text) one page at a time, freeing each page's layout cache"""
+    # pdfplumber reads pages lazily from the file instead of a bytes copy
+    with pdfplumber.open(file_path) as pdf:
+        page_count = len(pdf.pages)
+        for page_number, page in enumerate(pdf.pages, start=1):
+            page_text = page.extract_text()
+            page.flush_cache()
+            yield page_number, page_count, page_text or ""
+
+
+# ---- DOCX: stream word/document.xml instead of building the python-docx object model ----
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY = _W_NS + "body"
+_W_P = _W_NS + "p"
+_W_R = _W_NS + "r"
+_W_HYPERLINK = _W_NS + "hyperlink"
+_W_T = _W_NS + "t"
+_W_TBL = _W_NS + "tbl"
+_W_TR = _W_NS + "tr"
+_W_TC = _W_NS + "tc"
+_W_VAL = _W_NS + "val"
+_W_TYPE = _W_NS + "type"
+
+# Text equivalents of run content, as python-docx renders them (w:t and w:br handled separately)
+_RUN_CHAR_TAGS = {
+    _W_NS + "tab": "\t",
+    _W_NS + "ptab": "\t",
+    _W_NS + "cr": "\n",
+    _W_NS + "noBreakHyphen": "-",
+}
+_OFFICE_DOCUMENT_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+_PACKAGE_RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def _docx_main_part(archive: zipfile.ZipFile) -> str:
+    """Name of the main document part, normally word/document.xml"""
+    try:
+        rels = ElementTree.fromstring(archive.read("_rels/.rels"))
+    except KeyError:
+        return "word/document.xml"
+    for rel in rels.iter(_PACKAGE_RELS_NS + "Relationship"):
+        if rel.get("Type") == _OFFICE_DOCUMENT_REL:
+            return rel.get("Target", "word/document.xml").lstrip("/")
+    return "word/document.xml"
+
+
+def _run_text(run) -> str:
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == _W_T:
+            parts.append(child.text or "")
+        elif tag == _W_NS + "br":
+            if child.get(_W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            char = _RUN_CHAR_TAGS.get(tag)
+            if char:
+                parts.append(char)
+    return "".join(parts)
+
+
+def _paragraph_text(paragraph) -> str:
+    """Direct runs and hyperlink runs of a w:p, matching python-docx Paragraph.text"""
+    parts = []
+    for child in paragraph:
+        if child.tag == _W_R:
+            parts.append(_run_text(child))
+        elif child.tag == _W_HYPERLINK:
+            parts.extend(_run_text(run) for run in child.iterfind(_W_R))
+    return "".join(parts)
+
+
+def _int_property(parent, path: str, default: int) -> int:
+    element = parent.find(path)
+    if element is None:
+        return default
+    return int(element.get(_W_VAL, default))
+
+
+def _table_row_cells(row, row_above: dict) -> tuple[list[str], dict]:
+    """
+    Cell texts of a w:tr, one entry per layout-grid column a cell spans,
+    matching python-docx Row.cells. A vertically merged cell repeats the cell
+    it continues in `row_above` (grid offset -> (text, span) of the previous
+    row); returns the texts and this row's offset map for the next row.
+    """
+    grid_offset = _int_property(row, f"{_W_NS}trPr/{_W_NS}gridBefore", 0)
+    cells = {}
+    texts = []
+    for tc in row.iterfind(_W_TC):
+        grid_span = _int_property(tc, f"{_W_NS}tcPr/{_W_NS}gridSpan", 1)
+        v_merge = tc.find(f"{_W_NS}tcPr/{_W_NS}vMerge")
+        if v_merge is not None and v_merge.get(_W_VAL, "continue") == "continue":
+            if grid_offset not in row_above:
+                # python-docx raises here too, so the whole document falls back
+                raise ValueError(f"no cell above grid offset {grid_offset} to continue a vertical merge")
+            cell = row_above[grid_offset]
+        else:
+            cell = ("\n".join(_paragraph_text(p) for p in tc.iterfind(_W_P)), grid_span)
+        cells[grid_offset] = cell
+        texts.extend([cell[0]] * cell[1])
+        grid_offset += grid_span
+    return texts, cells
+
+
+def iter_docx_blocks(file_path: str):
+    """
+    Yield ("paragraph", text) for each top-level paragraph and ("row", cells)
+    for each row of a top-level table, in document order. word/document.xml is
+    parsed incrementally and every paragraph / row is discarded once read, so
+    memory stays bounded by the largest single row rather than the document.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open(_docx_main_part(archive)) as document_xml:
+            depth = 0
+            body = None
+            table = None
+            row_above = {}
+            for event, element in ElementTree.iterparse(document_xml, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if depth == 2 and element.tag == _W_BODY:
+                        body = element
+                    elif depth == 3 and body is not None and element.tag == _W_TBL:
+                        table = element
+                        row_above = {}
+                    continue
+
+                depth -= 1
+                if table is not None and depth == 3 and element.tag == _W_TR:
+                    texts, row_above = _table_row_cells(element, row_above)
+                    yield "row", texts
+                    table.remove(element)
+                elif body is not None and depth == 2:
+                    if element.tag == _W_P:
+                        yield "paragraph", _paragraph_text(element)
+                    table = None
+                    body.remove(element)
+
+
+def extract_docx_text(file_path: str) -> str:
+    """Raw DOCX text: body paragraphs first, then every top-level table row by row"""
+    paragraph_parts = []
+    table_parts = []
+    for kind, block in iter_docx_blocks(file_path):
+        if kind == "paragraph":
+            paragraph_parts.append(block)
+            paragraph_parts.append("\n")
+        else:
+            for cell_text in block:
+                table_parts.append(cell_text)
+                table_parts.append(" ")
+            table_parts.append("\n")
+    return "".join(paragraph_parts) + "".join(table_parts)
+
+
+def extract_text_prefix(
+    file_path: str,
+    filename: str,
+    max_chars: Optional[int] = None,
+    max_pages: Optional[int] = None
+) -> tuple[str, bool]:
+    """
+    Extract text from a CV file on disk (PDF, DOCX, or plain text).
+    PDFs stop at the first page boundary where `max_chars` cleaned characters
+    or `max_pages` pages have been read; returns (text, complete).
+    """
+    lower_name = filename.lower()
+    extracted_text = ""
+    complete = True
+
+    try:
+        if lower_name.endswith('.pdf'):
+            for page_number, page_count, page_text in iter_pdf_page_texts(file_path):
+                if page_text:
+                    extracted_text += page_text + "\n"
+                if page_number == page_count:
+                    break
+                if (max_pages and page_number >= max_pages) or (
+                    max_chars and len(_clean_extracted_text(extracted_text)) >= max_chars
+                ):
+                    complete = False
+                    break
+            logger.debug(f"Extracted {len(extracted_text)} chars from PDF (complete={complete})")
+
+        elif lower_name.endswith('.docx'):
+            extracted_text = extract_docx_text(file_path)
+            logger.debug(f"Extracted {len(extracted_text)} chars from DOCX")
+
+        elif lower_name.endswith('.doc'):
+            # For .doc files, try basic decoding
+            with open(file_path, "rb") as f:
+                file_content = f.read()
+            try:
+                extracted_text = file_content.decode('utf-8', errors='ignore')
+            except Exception:
+                extracted_text = file_content.decode('latin-1', errors='ignore')
+            logger.debug(f"Extracted {len(extracted_text)} chars from DOC (basic)")
+
+        else:
+            # Plain text files (.txt, .rtf) and UTF-8 fallback for anything else
+            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                extracted_text = f.read()
+            logger.debug(f"Extracted {len(extracted_text)} chars from text file")
+
+    except Exception as e:
+        logger.error(f"Text extraction failed for {filename}: {e}")
+        extracted_text = ""
+        complete = True
+
+    if extracted_text:
+        extracted_text = _clean_extracted_text(extracted_text)
+
+    return (extracted_text if extracted_text else f"CV Upload - {filename}"), complete
+
+
+def extract_text_from_path(file_path: str, filename: str) -> str:
+    """Extract the full text from a CV file on disk"""
+    return extract_text_prefix(file_path, filename)[0]
+
+
+def _run_extraction_job(
+    file_path: str,
+    filename: str,
+    max_chars: Optional[int] = None,
+    max_pages: Optional[int] = None
+) -> tuple[str, bool, float]:
+    """Worker entry point - returns extracted text, completeness and the time the job started"""
+    started_at = time.time()
+    text, complete = extract_text_prefix(file_path, filename, max_chars, max_pages)
+    return text, complete, started_at
+
+
+# ============ ENGINE (runs on the event loop) ============
+
+class CVExtractionEngine:
+    """
+    Process-pool backed CV extraction.
+
+    - Jobs are awaited from the event loop, the parsing itself happens in a
+      separate process so pdfplumber's CPU time never stalls the loop
+    - Each job has a hard timeout; a timed out job returns the filename fallback
+      and the pool is swapped for a fresh one so a stuck worker cannot starve
+      the next uploads
+    - Worker processes are recycled after `max_files_per_worker` files to cap
+      pdfplumber memory growth
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        job_timeout_seconds: float = 30.0,
+        max_files_per_worker: int = 50
+    ):
+        self.max_workers = max_workers
+        self.job_timeout_seconds = job_timeout_seconds
+        self.max_files_per_worker = max_files_per_worker
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # Metrics
+        self._in_flight = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+        self._pool_restarts = 0
+        self._total_duration_ms = 0.0
+        self._total_queue_wait_ms = 0.0
+
+    @classmethod
+    def from_env(cls) -> "CVExtractionEngine":
+        """Build an engine from CV_EXTRACTION_* environment variables"""
+        return cls(
+            max_workers=int(os.environ.get('CV_EXTRACTION_WORKERS', '2')),
+            job_timeout_seconds=float(os.environ.get('CV_EXTRACTION_TIMEOUT_SECONDS', '30')),
+            max_files_per_worker=int(os.environ.get('CV_EXTRACTION_MAX_FILES_PER_WORKER', '50'))
+        )
+
+    def start(self):
+        """Create the process pool (no-op if already running or disabled)"""
+        if self._executor is not None or self.max_workers <= 0:
+            return
+        # max_tasks_per_child is not supported with the fork start method
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=self.max_files_per_worker
+        )
+        logger.info(
+            f"CV extraction pool started: {self.max_workers} workers, "
+            f"timeout {self.job_timeout_seconds}s, recycle after {self.max_files_per_worker} files"
+        )
+
+    def shutdown(self):
+        """Stop the process pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _restart_pool(self, failed_executor: Optional[ProcessPoolExecutor] = None):
+        """
+        Replace the pool and terminate the old workers, so a hung extraction
+        does not keep its process (and the CV in memory) alive. Jobs still
+        running on the old pool fail with BrokenProcessPool and fall back.
+        """
+        old_executor = self._executor
+        if failed_executor is not None and failed_executor is not old_executor:
+            return  # Already replaced by another job's timeout
+        self._executor = None
+        if old_executor is not None:
+            # shutdown() drops the process table - take it first
+            processes = list((old_executor._processes or {}).values())
+            old_executor.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.kill()
+        self._pool_restarts += 1
+        self.start()
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs submitted but waiting for a free worker"""
+        return max(self._in_flight - max(self.max_workers, 1), 0)
+
+    async def extract(self, file_path, filename: str) -> str:
+        """Extract text from a saved CV without blocking the event loop (only the path crosses processes)"""
+        text, _ = await self.extract_prefix(file_path, filename)
+        return text
+
+    async def extract_prefix(
+        self,
+        file_path,
+        filename: str,
+        max_chars: Optional[int] = None,
+        max_pages: Optional[int] = None
+    ) -> tuple[str, bool]:
+        """Extract up to a character / page budget (PDF only); returns (text, complete)"""
+        fallback_text = f"CV Upload - {filename}"
+        loop = asyncio.get_running_loop()
+        submitted_at = time.time()
+
+        executor = None
+        self._in_flight += 1
+        self._max_queue_depth = max(self._max_queue_depth, self.queue_depth)
+        try:
+            if self.max_workers <= 0:
+                # Pool disabled - still keep the work off the event loop
+                job = asyncio.to_thread(_run_extraction_job, str(file_path), filename, max_chars, max_pages)
+            else:
+                self.start()
+                executor = self._executor
+                job = loop.run_in_executor(
+                    executor, _run_extraction_job, str(file_path), filename, max_chars, max_pages
+                )
+
+            text, complete, started_at = await asyncio.wait_for(job, timeout=self.job_timeout_seconds)
+
+            finished_at = time.time()
+            self._completed += 1
+            self._total_duration_ms += (finished_at - started_at) * 1000
+            self._total_queue_wait_ms += max(started_at - submitted_at, 0) * 1000
+            return text, complete
+
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            logger.error(f"CV extraction timed out after {self.job_timeout_seconds}s: {filename}")
+            if executor is not None:
+                self._restart_pool(executor)
+            return fallback_text, True
+
+        except BrokenProcessPool:
+            self._failed += 1
+            logger.error(f"CV extraction pool broken while processing {filename}, restarting pool")
+            self._restart_pool(executor)
+            return fallback_text, True
+
+        except Exception as e:
+            self._failed += 1
+            logger.error(f"CV extraction failed for {filename}: {e}")
+            return fallback_text, True
+
+        finally:
+            self._in_flight -= 1
+
+    def metrics(self) -> dict:
+        """Snapshot of pool metrics"""
+        finished = self._completed or 1
+        return {
+            "workers": self.max_workers,
+            "job_timeout_seconds": self.job_timeout_seconds,
+            "max_files_per_worker": self.max_files_per_worker,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self._max_queue_depth,
+            "completed": self._completed,
+            "failed": self._failed,
+            "timed_out": self._timed_out,
+            "pool_restarts": self._pool_restarts,
+            "avg_duration_ms": round(self._total_duration_ms / finished, 1),
+            "avg_queue_wait_ms": round(self._total_queue_wait_ms / finished, 1)
+        }
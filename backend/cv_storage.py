@@ -0,0 +1,275 @@
+"""
+CV Storage - streaming, size-bounded, content-addressed storage for CV files
+Uploads are copied to disk in fixed-size chunks off the event loop, the file
+type is sniffed from the first chunk, and oversized files are rejected
+before the rest of the body is written. Identical files are stored once.
+"""
+import asyncio
+import hashlib
+import os
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fastapi import UploadFile
+
+CV_UPLOAD_CHUNK_BYTES = 1024 * 1024
+MAX_CV_UPLOAD_BYTES = int(os.environ.get('CV_UPLOAD_MAX_MB', '20')) * 1024 * 1024
+
+ALLOWED_CV_EXTENSIONS = {".pdf", ".docx", ".doc", ".txt", ".rtf"}
+
+# Leading bytes expected for each binary CV format
+PDF_MAGIC = b"%PDF"
+ZIP_MAGIC = b"PK\x03\x04"
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+RTF_MAGIC = b"{\\rtf"
+
+
+class CVUploadRejected(Exception):
+    """Upload failed validation - carries the HTTP status to return"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _looks_like_text(head: bytes) -> bool:
+    return b"\x00" not in head
+
+
+def sniff_cv_content(head: bytes, filename: str):
+    """Validate the first chunk of a CV against its extension"""
+    extension = Path(filename).suffix.lower()
+    if extension not in ALLOWED_CV_EXTENSIONS:
+        raise CVUploadRejected(400, f"Unsupported file type '{extension}'. Allowed: {', '.join(sorted(ALLOWED_CV_EXTENSIONS))}")
+    if not head:
+        raise CVUploadRejected(400, "Uploaded file is empty")
+
+    if extension == ".pdf":
+        # Some generators prepend a few junk bytes before the header
+        valid = PDF_MAGIC in head[:1024]
+    elif extension == ".docx":
+        valid = head.startswith(ZIP_MAGIC)
+    elif extension == ".doc":
+        # Word 97-2003 binary, or RTF / plain text saved with a .doc name
+        valid = head.startswith(OLE_MAGIC) or head.startswith(RTF_MAGIC) or _looks_like_text(head)
+    else:
+        valid = _looks_like_text(head)
+
+    if not valid:
+        raise CVUploadRejected(400, f"File content does not match its '{extension}' extension")
+
+
+def _part_path(dest_path: Path) -> Path:
+    return dest_path.with_name(dest_path.name + ".part")
+
+
+async def save_upload_stream(upload: "UploadFile", dest_path: Path, max_bytes: int = MAX_CV_UPLOAD_BYTES) -> tuple[int, str]:
+    """Stream an UploadFile to dest_path in chunks; returns (bytes written, sha256 hex)"""
+    await upload.seek(0)
+    chunk = await upload.read(CV_UPLOAD_CHUNK_BYTES)
+    sniff_cv_content(chunk, upload.filename)
+
+    part_path = _part_path(dest_path)
+    out = await asyncio.to_thread(open, part_path, "wb")
+    digest = hashlib.sha256()
+    total = 0
+    try:
+        while chunk:
+            total += len(chunk)
+            if total > max_bytes:
+                raise CVUploadRejected(413, f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+            digest.update(chunk)
+            await asyncio.to_thread(out.write, chunk)
+            chunk = await upload.read(CV_UPLOAD_CHUNK_BYTES)
+    except BaseException:
+        await asyncio.to_thread(out.close)
+        part_path.unlink(missing_ok=True)
+        raise
+    await asyncio.to_thread(out.close)
+    os.replace(part_path, dest_path)
+    return total, digest.hexdigest()
+
+
+def copy_stream_bounded(src: BinaryIO, dest_path: Path, filename: str, max_bytes: int = MAX_CV_UPLOAD_BYTES) -> tuple[int, str]:
+    """Blocking variant for file-like sources such as zip members (run in a thread)"""
+    chunk = src.read(CV_UPLOAD_CHUNK_BYTES)
+    sniff_cv_content(chunk, filename)
+
+    part_path = _part_path(dest_path)
+    digest = hashlib.sha256()
+    total = 0
+    try:
+        with open(part_path, "wb") as out:
+            while chunk:
+                total += len(chunk)
+                if total > max_bytes:
+                    raise CVUploadRejected(413, f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+                digest.update(chunk)
+                out.write(chunk)
+                chunk = src.read(CV_UPLOAD_CHUNK_BYTES)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    os.replace(part_path, dest_path)
+    return total, digest.hexdigest()
+
+
+# ============ CONTENT-ADDRESSED BLOB STORE ============
+
+class CVBlobStore:
+    """
+    Content-addressed CV storage with SHA-256 deduplication.
+
+    Files live once under `blobs/<aa>/<bb>/<sha256>`. Every public upload name
+    (`cand_x.pdf`, `cand_x_v2.pdf` - the names behind `/api/uploads/...` URLs)
+    is an alias in `cv_file_aliases`, one per CV version, and `cv_blobs`
+    counts the aliases pointing at each blob. The blob file is removed when
+    its last alias is released.
+
+    A release can race a new upload of the same content (which re-creates the
+    blob document and file). The releasing side therefore moves the file to
+    `blobs/trash` first and only deletes it if no blob document exists by
+    then; otherwise it puts the file back.
+    """
+
+    def __init__(self, db, upload_dir: Path):
+        self.blobs = db.cv_blobs
+        self.aliases = db.cv_file_aliases
+        self.upload_dir = upload_dir
+        self.blob_dir = upload_dir / "blobs"
+        self.tmp_dir = self.blob_dir / "tmp"
+        self.trash_dir = self.blob_dir / "trash"
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        self.trash_dir.mkdir(parents=True, exist_ok=True)
+
+    async def ensure_indexes(self):
+        await self.blobs.create_index("sha256", unique=True)
+        await self.aliases.create_index("filename", unique=True)
+        await self.aliases.create_index("sha256")
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.blob_dir / sha256[:2] / sha256[2:4] / sha256
+
+    def _temp_path(self) -> Path:
+        return self.tmp_dir / f"{uuid.uuid4().hex}.upload"
+
+    async def store_upload(self, upload: "UploadFile", public_name: str) -> dict:
+        """Stream an UploadFile into the store under a public alias"""
+        temp_path = self._temp_path()
+        size, sha256 = await save_upload_stream(upload, temp_path)
+        return await self._commit(temp_path, sha256, size, public_name)
+
+    async def store_stream(self, src: BinaryIO, filename: str, public_name: str) -> dict:
+        """Copy a blocking file-like source (e.g. a zip member) into the store"""
+        temp_path = self._temp_path()
+        size, sha256 = await asyncio.to_thread(copy_stream_bounded, src, temp_path, filename)
+        return await self._commit(temp_path, sha256, size, public_name)
+
+    async def _commit(self, temp_path: Path, sha256: str, size: int, public_name: str) -> dict:
+        now = datetime.now(timezone.utc).isoformat()
+        # Take the reference before touching the file so a concurrent release cannot delete it
+        result = await self.blobs.update_one(
+            {"sha256": sha256},
+            {
+                "$inc": {"ref_count": 1},
+                "$set": {"last_referenced_at": now},
+                "$setOnInsert": {"sha256": sha256, "size": size, "created_at": now}
+            },
+            upsert=True
+        )
+        deduplicated = result.upserted_id is None
+
+        blob_path = self.blob_path(sha256)
+        if deduplicated and blob_path.exists():
+            temp_path.unlink(missing_ok=True)
+        else:
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_path, blob_path)
+
+        await self._point_alias(public_name, sha256, now)
+        return {
+            "url": f"/api/uploads/{public_name}",
+            "filename": public_name,
+            "sha256": sha256,
+            "size": size,
+            "deduplicated": deduplicated
+        }
+
+    async def add_alias(self, public_name: str, sha256: str) -> Optional[dict]:
+        """Point another public name at a stored blob, taking a reference; None if the blob is gone"""
+        now = datetime.now(timezone.utc).isoformat()
+        # A blob at ref_count 0 that is being released survives: delete_one needs ref_count <= 0
+        result = await self.blobs.update_one(
+            {"sha256": sha256},
+            {"$inc": {"ref_count": 1}, "$set": {"last_referenced_at": now}}
+        )
+        if not result.matched_count:
+            return None
+        await self._point_alias(public_name, sha256, now)
+        return {
+            "url": f"/api/uploads/{public_name}",
+            "filename": public_name,
+            "sha256": sha256,
+            "deduplicated": True
+        }
+
+    async def _point_alias(self, public_name: str, sha256: str, now: str):
+        """Upsert an alias (its blob reference is already taken); drop the reference of the blob it replaced"""
+        previous = await self.aliases.find_one_and_update(
+            {"filename": public_name},
+            {"$set": {"filename": public_name, "sha256": sha256, "created_at": now}},
+            upsert=True
+        )
+        if previous:
+            await self._drop_reference(previous["sha256"])
+
+    async def resolve(self, public_name: str) -> tuple[Optional[Path], Optional[str]]:
+        """Map a public upload name to (file on disk, sha256); legacy files have no hash"""
+        public_name = Path(public_name).name
+        alias = await self.aliases.find_one({"filename": public_name}, {"_id": 0})
+        if alias:
+            blob_path = self.blob_path(alias["sha256"])
+            if blob_path.exists():
+                return blob_path, alias["sha256"]
+        legacy_path = self.upload_dir / public_name
+        if legacy_path.is_file():
+            return legacy_path, None
+        return None, None
+
+    async def release(self, public_name: str):
+        """Drop one alias; delete the blob when nothing references it any more"""
+        public_name = Path(public_name).name
+        alias = await self.aliases.find_one_and_delete({"filename": public_name})
+        if not alias:
+            # Pre-dedup upload stored directly under its public name
+            legacy_path = self.upload_dir / public_name
+            if legacy_path.is_file():
+                legacy_path.unlink()
+            return
+
+        await self._drop_reference(alias["sha256"])
+
+    async def _drop_reference(self, sha256: str):
+        """Decrement a blob's alias count and delete the blob once it reaches zero"""
+        await self.blobs.update_one({"sha256": sha256}, {"$inc": {"ref_count": -1}})
+        deleted = await self.blobs.delete_one({"sha256": sha256, "ref_count": {"$lte": 0}})
+        if not deleted.deleted_count:
+            return
+
+        blob_path = self.blob_path(sha256)
+        trash_path = self.trash_dir / f"{sha256}.{uuid.uuid4().hex}"
+        try:
+            os.replace(blob_path, trash_path)
+        except FileNotFoundError:
+            return
+        # A concurrent _commit of the same content may have re-created the blob meanwhile
+        if await self.blobs.find_one({"sha256": sha256}, {"_id": 1}):
+            if not blob_path.exists():
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(trash_path, blob_path)
+                return
+        trash_path.unlink(missing_ok=True)
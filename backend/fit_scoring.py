@@ -0,0 +1,217 @@
+"""
+Fit Scoring - rule-based candidate/job fit score, single and batch
+The same 0-100 score the story pipeline falls back to when the LLM gives none:
+skills match (45), experience match (35) and role alignment (20), clamped to
+20-100. `JobFitScorer` scores a job's whole candidate pool at once: distinct
+skill strings are matched against the job once, candidates are encoded into
+NumPy skill-hit and experience arrays, and `top_k` ranks them with a heap.
+"""
+import heapq
+import re
+from typing import Optional
+
+import numpy as np
+
+from skill_matcher import SkillMatcher, skill_matcher
+from skill_taxonomy import canonical_skill_key
+
+SKILLS_WEIGHT = 45
+MIN_SCORE = 20
+MAX_SCORE = 100
+
+RELATED_ROLE_TERMS = {
+    'developer': ['engineer', 'programmer', 'coder'],
+    'engineer': ['developer', 'architect', 'designer'],
+    'manager': ['lead', 'head', 'director', 'supervisor'],
+    'analyst': ['consultant', 'specialist', 'advisor'],
+    'designer': ['ux', 'ui', 'creative', 'artist']
+}
+
+_YEAR = re.compile(r'20\d{2}|19\d{2}')
+
+
+def normalize_skills(skills) -> set[str]:
+    """Canonical keys, so synonyms ("JS", "Javascript ES6") match exactly"""
+    return {canonical_skill_key(s) for s in skills or []}
+
+
+def candidate_years(experience: list) -> int:
+    """Years of experience: 2 per position, or the span of the durations when longer"""
+    experience = experience or []
+    total_months = 0
+    for exp in experience:
+        duration = (exp.get('duration') or '').lower()
+        if 'present' in duration or 'current' in duration:
+            total_months += 24  # Assume 2 years if current
+        elif '-' in duration and len(duration.split('-')) == 2:
+            years = _YEAR.findall(duration)
+            if len(years) >= 2:
+                total_months += (int(years[1]) - int(years[0])) * 12
+            else:
+                total_months += 24
+        elif '-' in duration:
+            pass  # More than one dash - not counted
+        else:
+            total_months += 24
+    return max(len(experience) * 2, total_months // 12)
+
+
+def experience_range(job: dict) -> tuple:
+    exp_range = job.get('experience_range', {})
+    return exp_range.get('min_years', 0), exp_range.get('max_years', 15)
+
+
+def experience_match_score(years: int, min_years, max_years) -> float:
+    if min_years <= years <= max_years:
+        return 35
+    if years > max_years:
+        return 30  # Overqualified but still good
+    if years >= min_years * 0.7:
+        return 25  # Close enough
+    return max((years / min_years) * 35, 10) if min_years > 0 else 20
+
+
+def _keywords(text: str) -> set[str]:
+    return set(text.replace('-', ' ').replace('/', ' ').split())
+
+
+def role_match_score(candidate_role: Optional[str], job_title: Optional[str]) -> int:
+    candidate_role = (candidate_role or '').lower()
+    job_title = (job_title or '').lower()
+    common_keywords = _keywords(job_title) & _keywords(candidate_role)
+    if common_keywords:
+        return min(len(common_keywords) * 5 + 10, 20)
+    score = 8
+    for key, synonyms in RELATED_ROLE_TERMS.items():
+        if key in job_title:
+            for syn in synonyms:
+                if syn in candidate_role:
+                    score = 15
+                    break
+    return score
+
+
+def job_skill_matcher(job: dict) -> SkillMatcher:
+    """Cached matcher for the job's required skills (rebuilt when they change)"""
+    return skill_matcher(tuple(sorted(normalize_skills(job.get('required_skills')))))
+
+
+def skills_match_score(candidate_skills: set[str], matcher: SkillMatcher) -> float:
+    if not matcher.skills:
+        return 22  # Base score if no job skills specified
+    # Partial match: job skill is a substring of a candidate skill or vice versa
+    direct, partial = matcher.match_skills(candidate_skills)
+    return min(((len(direct) + 0.5 * len(partial)) / len(matcher.skills)) * SKILLS_WEIGHT, SKILLS_WEIGHT)
+
+
+def fit_score_components(candidate: dict, job: dict) -> tuple[float, float, int]:
+    """(skills, experience, role) parts of the fit score"""
+    min_years, max_years = experience_range(job)
+    return (
+        skills_match_score(normalize_skills(candidate.get('skills')), job_skill_matcher(job)),
+        experience_match_score(candidate_years(candidate.get('experience')), min_years, max_years),
+        role_match_score(candidate.get('current_role'), job.get('title'))
+    )
+
+
+def combine_fit_score(skills: float, experience: float, role: float) -> int:
+    return min(max(int(skills + experience + role), MIN_SCORE), MAX_SCORE)
+
+
+class JobFitScorer:
+    """
+    Scores many candidates against one job with the same rules as
+    `fit_score_components`.
+
+    - Each distinct candidate skill string is matched against the job's skills
+      once per batch (exact and substring hits), then gathered per candidate
+      into an (n candidates x job skills) hit matrix
+    - Role scores are computed once per distinct current role
+    - Experience bands are applied to the years array in one vectorized pass
+    """
+
+    def __init__(self, job: dict):
+        self.job = job
+        self.matcher = job_skill_matcher(job)
+        self.job_skills = self.matcher.skills
+        self.min_years, self.max_years = experience_range(job)
+        self.job_title = job.get('title')
+
+    def _skill_hits(self, vocabulary: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """(exact, substring) boolean matrices of shape (len(vocabulary), job skills)"""
+        exact = np.zeros((len(vocabulary), len(self.job_skills)), dtype=bool)
+        partial = np.zeros_like(exact)
+        for row, cs in enumerate(vocabulary):
+            index, hits = self.matcher.match(cs)
+            if index >= 0:
+                exact[row, index] = True
+            if hits:
+                partial[row, list(hits)] = True
+        return exact, partial
+
+    def _gather(self, rows: np.ndarray, hits: np.ndarray, n: int) -> np.ndarray:
+        """OR the per-skill hit rows into an (n candidates x job skills) matrix"""
+        width = len(self.job_skills)
+        hit_rows, hit_cols = np.nonzero(hits)
+        counts = np.bincount(rows[hit_rows] * width + hit_cols, minlength=n * width)
+        return counts.reshape(n, width) > 0
+
+    def skills_scores(self, candidates: list[dict]) -> np.ndarray:
+        n = len(candidates)
+        if not self.job_skills:
+            return np.full(n, 22.0)
+
+        vocabulary_ids: dict[str, int] = {}
+        rows, cols = [], []
+        for index, candidate in enumerate(candidates):
+            for skill in normalize_skills(candidate.get('skills')):
+                rows.append(index)
+                cols.append(vocabulary_ids.setdefault(skill, len(vocabulary_ids)))
+        exact, partial = self._skill_hits(list(vocabulary_ids))
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        direct = self._gather(rows, exact[cols], n)
+        # A job skill counts as a partial match only when it has no exact match
+        partial_only = self._gather(rows, partial[cols], n) & ~direct
+        total = direct.sum(axis=1) + 0.5 * partial_only.sum(axis=1)
+        return np.minimum((total / len(self.job_skills)) * SKILLS_WEIGHT, SKILLS_WEIGHT)
+
+    def experience_scores(self, years: np.ndarray) -> np.ndarray:
+        min_years, max_years = self.min_years, self.max_years
+        if min_years > 0:
+            below = np.maximum((years / min_years) * 35, 10)
+        else:
+            below = np.full(len(years), 20.0)
+        return np.select(
+            [(years >= min_years) & (years <= max_years), years > max_years, years >= min_years * 0.7],
+            [35.0, 30.0, 25.0],
+            default=below
+        )
+
+    def role_scores(self, candidates: list[dict]) -> np.ndarray:
+        by_role: dict[str, int] = {}
+        scores = np.empty(len(candidates))
+        for index, candidate in enumerate(candidates):
+            role = candidate.get('current_role') or ''
+            if role not in by_role:
+                by_role[role] = role_match_score(role, self.job_title)
+            scores[index] = by_role[role]
+        return scores
+
+    def score(self, candidates: list[dict]) -> np.ndarray:
+        """Fit scores (int array) in the order of `candidates`"""
+        if not candidates:
+            return np.zeros(0, dtype=np.int64)
+        years = np.fromiter(
+            (candidate_years(candidate.get('experience')) for candidate in candidates),
+            dtype=np.int64,
+            count=len(candidates)
+        )
+        total = self.skills_scores(candidates) + self.experience_scores(years) + self.role_scores(candidates)
+        return np.clip(np.floor(total).astype(np.int64), MIN_SCORE, MAX_SCORE)
+
+    def top_k(self, candidates: list[dict], k: int) -> list[tuple[int, int]]:
+        """[(score, index into candidates)] for the k best, highest first; ties keep input order"""
+        scores = self.score(candidates).tolist()
+        return [(scores[index], index) for index in heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)]
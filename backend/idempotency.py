@@ -0,0 +1,178 @@
+"""
+Idempotency Keys - replay the original response for retried POST requests
+A client sends an `Idempotency-Key` header with a request that creates data
+or spends LLM calls (CV upload, CV replacement, submission to a job). The
+first request with a key claims it; a retry of a finished request gets the
+stored response back, and a retry of an in-progress request waits for the
+first one to finish instead of redoing the work.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+MAX_KEY_LENGTH = 255
+
+# Record states
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+
+class IdempotencyConflict(Exception):
+    """Key cannot be used for this request - carries the HTTP status to return"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def request_fingerprint(**fields) -> str:
+    """Stable hash of the request parameters a key was first used with"""
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Keys in the `idempotency_keys` collection.
+
+    - A key is scoped to the endpoint and the user that sent it
+    - Records expire `ttl_hours` after the request started (Mongo TTL index)
+    - An in-progress claim older than `lease_seconds` is treated as abandoned
+      (worker restarted mid-request) and can be taken over by a retry
+    - Reusing a key with different request parameters is rejected (422); a
+      retry still waiting after `wait_seconds` gets a 409 to retry later
+    """
+
+    def __init__(
+        self,
+        db,
+        ttl_hours: float = 24,
+        lease_seconds: float = 300,
+        wait_seconds: float = 30,
+        poll_interval_seconds: float = 0.5
+    ):
+        self.collection = db.idempotency_keys
+        self.ttl_hours = ttl_hours
+        self.lease_seconds = lease_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._counters = {"claimed": 0, "replayed": 0, "waited": 0, "taken_over": 0, "conflicts": 0, "released": 0}
+
+    @classmethod
+    def from_env(cls, db) -> "IdempotencyStore":
+        return cls(
+            db,
+            ttl_hours=float(os.environ.get('IDEMPOTENCY_TTL_HOURS', '24')),
+            lease_seconds=float(os.environ.get('IDEMPOTENCY_LEASE_SECONDS', '300')),
+            wait_seconds=float(os.environ.get('IDEMPOTENCY_WAIT_SECONDS', '30'))
+        )
+
+    @staticmethod
+    def record_key(scope: str, owner: str, key: str) -> str:
+        return f"{scope}:{owner}:{key}"
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("record_key", unique=True)
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def begin(self, scope: str, owner: str, key: str, fingerprint: str) -> Optional[dict]:
+        """
+        Claim `key` for a new request. Returns None when the caller should run
+        the request (then `complete` or `release`), or the stored
+        {"status_code", "body"} of the original request to replay.
+        """
+        key = (key or "").strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise IdempotencyConflict(400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+
+        record_key = self.record_key(scope, owner, key)
+        deadline = asyncio.get_running_loop().time() + self.wait_seconds
+        waited = False
+        while True:
+            now = datetime.now(timezone.utc)
+            try:
+                await self.collection.insert_one({
+                    "record_key": record_key,
+                    "scope": scope,
+                    "owner": owner,
+                    "fingerprint": fingerprint,
+                    "status": IN_PROGRESS,
+                    "created_at": now,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "expires_at": now + timedelta(hours=self.ttl_hours)
+                })
+                self._counters["claimed"] += 1
+                return None
+            except DuplicateKeyError:
+                pass
+
+            record = await self.collection.find_one({"record_key": record_key}, {"_id": 0})
+            if record is None:
+                # Released (or expired) between the insert and the read - claim again
+                continue
+            if record["fingerprint"] != fingerprint:
+                self._counters["conflicts"] += 1
+                raise IdempotencyConflict(422, "Idempotency-Key was already used with a different request")
+            if record["status"] == COMPLETED:
+                self._counters["replayed"] += 1
+                if waited:
+                    self._counters["waited"] += 1
+                return {"status_code": record["status_code"], "body": record["body"]}
+
+            lease_expires_at = record["lease_expires_at"]
+            if lease_expires_at.tzinfo is None:
+                lease_expires_at = lease_expires_at.replace(tzinfo=timezone.utc)
+            if lease_expires_at <= now:
+                taken = await self.collection.find_one_and_update(
+                    {"record_key": record_key, "status": IN_PROGRESS, "lease_expires_at": record["lease_expires_at"]},
+                    {"$set": {"lease_expires_at": now + timedelta(seconds=self.lease_seconds)}},
+                    return_document=ReturnDocument.AFTER
+                )
+                if taken:
+                    self._counters["taken_over"] += 1
+                    logger.info(f"Idempotency key {record_key} taken over after an abandoned request")
+                    return None
+                continue
+
+            if asyncio.get_running_loop().time() >= deadline:
+                self._counters["conflicts"] += 1
+                raise IdempotencyConflict(409, "A request with this Idempotency-Key is still in progress")
+            waited = True
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    async def complete(self, scope: str, owner: str, key: str, status_code: int, body):
+        """Store the response so retries replay it"""
+        await self.collection.update_one(
+            {"record_key": self.record_key(scope, owner, key.strip())},
+            {"$set": {
+                "status": COMPLETED,
+                "status_code": status_code,
+                "body": body,
+                "completed_at": datetime.now(timezone.utc)
+            }}
+        )
+
+    async def release(self, scope: str, owner: str, key: str):
+        """Drop an in-progress claim after the request failed, so a retry runs it again"""
+        result = await self.collection.delete_one(
+            {"record_key": self.record_key(scope, owner, key.strip()), "status": IN_PROGRESS}
+        )
+        if result.deleted_count:
+            self._counters["released"] += 1
+
+    def metrics(self) -> dict:
+        return {
+            **self._counters,
+            "ttl_hours": self.ttl_hours,
+            "lease_seconds": self.lease_seconds,
+            "wait_seconds": self.wait_seconds
+        }
@@ -0,0 +1,243 @@
+"""
+CV Ingestion Jobs - Mongo-backed queue for asynchronous CV processing
+Uploads are persisted first, then extracted / parsed / story-generated by a
+pool of worker tasks. Jobs hold a renewable lease, so work claimed by a
+process that dies is picked up again after a restart.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Awaitable, Callable, Optional
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+# Stages reported on an ingestion job, in pipeline order
+INGESTION_STAGES = ["saved", "extracting", "parsing", "story", "saving"]
+
+# Handler signature: (job_doc, set_stage) -> result dict stored on the job
+IngestionHandler = Callable[[dict, Callable[[str], Awaitable[None]]], Awaitable[dict]]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class IngestionJobQueue:
+    """
+    Durable work queue stored in the `ingestion_jobs` collection.
+
+    Job lifecycle: queued -> running -> completed | failed
+    - A worker claims a job atomically and holds a lease that is renewed while
+      the handler runs
+    - If the owning process dies the lease expires and another worker (or the
+      same service after restart) reclaims the job
+    - Jobs are retried up to `max_attempts` times before being marked failed
+    """
+
+    def __init__(
+        self,
+        db,
+        handler: IngestionHandler,
+        concurrency: int = 2,
+        lease_seconds: int = 300,
+        poll_interval_seconds: float = 1.0,
+        max_attempts: int = 3
+    ):
+        self.collection = db.ingestion_jobs
+        self.handler = handler
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = f"worker_{uuid.uuid4().hex[:8]}"
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    # ============ PRODUCER API ============
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("ingestion_job_id", unique=True)
+        await self.collection.create_index([("status", 1), ("created_at", 1)])
+
+    async def enqueue(self, payload: dict, created_by: str, client_id: Optional[str] = None) -> dict:
+        """Persist a new job; the file must already be saved"""
+        now = _now().isoformat()
+        job_doc = {
+            "ingestion_job_id": f"ingest_{uuid.uuid4().hex[:12]}",
+            "status": "queued",
+            "current_stage": "saved",
+            "stages": {
+                stage: {"status": "completed" if stage == "saved" else "pending", "at": now if stage == "saved" else None}
+                for stage in INGESTION_STAGES
+            },
+            "payload": payload,
+            "result": None,
+            "error": None,
+            "attempts": 0,
+            "client_id": client_id,
+            "created_by": created_by,
+            "created_at": now,
+            "updated_at": now,
+            "started_at": None,
+            "completed_at": None,
+            "lease_owner": None,
+            "lease_expires_at": None
+        }
+        await self.collection.insert_one(job_doc)
+        job_doc.pop("_id", None)
+        self._wakeup.set()
+        return job_doc
+
+    async def get(self, ingestion_job_id: str) -> Optional[dict]:
+        return await self.collection.find_one({"ingestion_job_id": ingestion_job_id}, {"_id": 0})
+
+    # ============ WORKER LIFECYCLE ============
+
+    def start(self):
+        """Spawn worker tasks on the running event loop"""
+        if self._tasks:
+            return
+        self._stopping = False
+        for n in range(self.concurrency):
+            self._tasks.append(asyncio.create_task(self._worker_loop(n)))
+        logger.info(f"Ingestion queue started: {self.concurrency} workers ({self.worker_id})")
+
+    async def stop(self):
+        """Cancel workers; their leases expire and the jobs are reclaimed on restart"""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker_loop(self, n: int):
+        while not self._stopping:
+            try:
+                job = await self._claim_next()
+                if job is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ingestion worker {n} error: {e}")
+                await asyncio.sleep(self.poll_interval_seconds)
+
+    async def _claim_next(self) -> Optional[dict]:
+        """Atomically claim the oldest queued job or one with an expired lease"""
+        now = _now()
+        await self._fail_exhausted(now)
+        return await self.collection.find_one_and_update(
+            {
+                "attempts": {"$lt": self.max_attempts},
+                "$or": [
+                    {"status": "queued"},
+                    {"status": "running", "lease_expires_at": {"$lt": now.isoformat()}}
+                ]
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "lease_owner": self.worker_id,
+                    "lease_expires_at": (now + timedelta(seconds=self.lease_seconds)).isoformat(),
+                    "started_at": now.isoformat(),
+                    "updated_at": now.isoformat()
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", 1)],
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _fail_exhausted(self, now: datetime):
+        """Jobs whose lease expired on their last attempt will never be reclaimed"""
+        await self.collection.update_many(
+            {
+                "status": "running",
+                "attempts": {"$gte": self.max_attempts},
+                "lease_expires_at": {"$lt": now.isoformat()}
+            },
+            {"$set": {
+                "status": "failed",
+                "error": "Worker lost while processing (max attempts reached)",
+                "completed_at": now.isoformat(),
+                "updated_at": now.isoformat()
+            }}
+        )
+
+    async def _renew_lease(self, ingestion_job_id: str):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await self.collection.update_one(
+                {"ingestion_job_id": ingestion_job_id, "lease_owner": self.worker_id},
+                {"$set": {"lease_expires_at": (_now() + timedelta(seconds=self.lease_seconds)).isoformat()}}
+            )
+
+    async def _run(self, job: dict):
+        ingestion_job_id = job["ingestion_job_id"]
+        current_stage = {"name": job.get("current_stage", "saved")}
+
+        async def set_stage(stage: str):
+            now = _now().isoformat()
+            previous = current_stage["name"]
+            current_stage["name"] = stage
+            await self.collection.update_one(
+                {"ingestion_job_id": ingestion_job_id},
+                {"$set": {
+                    f"stages.{previous}.status": "completed",
+                    f"stages.{stage}.status": "running",
+                    f"stages.{stage}.at": now,
+                    "current_stage": stage,
+                    "updated_at": now
+                }}
+            )
+
+        lease_task = asyncio.create_task(self._renew_lease(ingestion_job_id))
+        try:
+            result = await self.handler(job, set_stage)
+            now = _now().isoformat()
+            await self.collection.update_one(
+                {"ingestion_job_id": ingestion_job_id},
+                {"$set": {
+                    "status": "completed",
+                    f"stages.{current_stage['name']}.status": "completed",
+                    "result": result,
+                    "error": None,
+                    "completed_at": now,
+                    "updated_at": now,
+                    "lease_owner": None,
+                    "lease_expires_at": None
+                }}
+            )
+            logger.info(f"Ingestion job {ingestion_job_id} completed")
+        except asyncio.CancelledError:
+            # Shutdown - leave the job running so the lease expires and it is reclaimed
+            raise
+        except Exception as e:
+            now = _now().isoformat()
+            retry = job.get("attempts", 1) < self.max_attempts
+            await self.collection.update_one(
+                {"ingestion_job_id": ingestion_job_id},
+                {"$set": {
+                    "status": "queued" if retry else "failed",
+                    f"stages.{current_stage['name']}.status": "failed",
+                    "error": str(e),
+                    "completed_at": None if retry else now,
+                    "updated_at": now,
+                    "lease_owner": None,
+                    "lease_expires_at": None
+                }}
+            )
+            logger.error(f"Ingestion job {ingestion_job_id} failed (attempt {job.get('attempts')}): {e}")
+        finally:
+            lease_task.cancel()
@@ -0,0 +1,172 @@
+"""
+Job Digest - compact, precomputed job context for story prompts
+Built once when a job is created or updated and stored on the job document,
+so every candidate story for that job reuses the same normalized skills,
+domain classification and summarized description instead of re-sending the
+full description with each prompt.
+"""
+import hashlib
+import json
+import re
+
+from skill_taxonomy import canonical_skill_key, listed_skill_name
+
+# Bump whenever the digest fields or summarization change (stored digests are rebuilt)
+JOB_DIGEST_VERSION = "2"
+
+# Job fields the digest is derived from
+JOB_DIGEST_SOURCE_FIELDS = ("title", "description", "required_skills", "experience_range")
+
+# Characters of description kept in the digest summary
+DESCRIPTION_SUMMARY_MAX_CHARS = 600
+
+# Domain -> (title markers, keywords the story prompt checks the candidate against)
+JOB_DOMAINS = {
+    "qa": (
+        ["qa", "test", "quality"],
+        ["testing", "qa", "test automation", "selenium", "manual testing", "bug", "defect"],
+    ),
+    "engineering": (
+        ["developer", "engineer", "programmer"],
+        ["development", "coding", "programming", "software", "api", "backend", "frontend"],
+    ),
+    "analytics": (
+        ["analyst", "data"],
+        ["analysis", "data", "analytics", "reporting", "sql", "excel"],
+    ),
+}
+
+# Description lines that say nothing about the role itself
+_BOILERPLATE_PATTERN = re.compile(
+    r"\b(?:about us|about the company|who we are|equal opportunity|benefits|perks|"
+    r"we offer|why join|apply now|how to apply|salary|compensation)\b",
+    re.IGNORECASE
+)
+# Sentences describing what the role needs or does
+_REQUIREMENT_PATTERN = re.compile(
+    r"\b(?:must|required|requirements?|responsib\w*|experience|skills?|knowledge|proficien\w*|"
+    r"ability|hands-on|years?|expert\w*|familiar\w*|understanding|degree|certif\w*)\b",
+    re.IGNORECASE
+)
+# Section headings whose whole content is kept ("Responsibilities:", "What you'll do")
+_REQUIREMENT_HEADING_PATTERN = re.compile(
+    r"\b(?:responsibilit\w*|requirements?|qualifications?|what you.ll do|what we.re looking for|"
+    r"must have|skills|duties|key result areas|role)\b",
+    re.IGNORECASE
+)
+_HEADING_PATTERN = re.compile(r"^([A-Za-z][\w '&/-]{1,40}):\s*(.*)$")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+
+def classify_domain(title: str) -> tuple[str, list[str]]:
+    """Domain name and keywords for a job title ("general" with no keywords if none match)"""
+    title = (title or "").lower()
+    for domain, (markers, keywords) in JOB_DOMAINS.items():
+        if any(marker in title for marker in markers):
+            return domain, keywords
+    return "general", []
+
+
+def normalize_skills(skills: list) -> list[str]:
+    """Taxonomy spellings (the names behind the stored `skill_ids`), de-duplicated, in the original order"""
+    normalized = []
+    seen = set()
+    for skill in skills or []:
+        if not isinstance(skill, str):
+            continue
+        key = canonical_skill_key(skill)
+        if key and key not in seen:
+            seen.add(key)
+            normalized.append(listed_skill_name(skill) or re.sub(r"\s+", " ", skill).strip())
+    return normalized
+
+
+def _description_sentences(description: str):
+    """Yield (sentence, in_requirement_section) skipping headings and boilerplate sections"""
+    section = None
+    for raw_line in description.splitlines():
+        line = re.sub(r"\s+", " ", raw_line).strip(" -•*●▪\t")
+        heading = _HEADING_PATTERN.match(line)
+        if heading:
+            name, line = heading.groups()
+            if _BOILERPLATE_PATTERN.search(name):
+                section = "boilerplate"
+            elif _REQUIREMENT_HEADING_PATTERN.search(name):
+                section = "requirements"
+            else:
+                section = None
+        if not line or section == "boilerplate":
+            continue
+        for sentence in _SENTENCE_SPLIT.split(line):
+            if len(sentence) > 3 and not _BOILERPLATE_PATTERN.search(sentence):
+                yield sentence, section == "requirements"
+
+
+def summarize_description(description: str, max_chars: int = DESCRIPTION_SUMMARY_MAX_CHARS) -> str:
+    """
+    Extractive summary: the responsibility / requirement sentences of the
+    description in their original order, without company boilerplate or
+    repeats, capped at `max_chars`. Falls back to the opening text.
+    """
+    description = (description or "").strip()
+    if len(description) <= max_chars:
+        return re.sub(r"\s+", " ", description)
+
+    sentences = []
+    seen = set()
+    for sentence, in_requirements in _description_sentences(description):
+        key = sentence.lower().rstrip(".")
+        if key in seen:
+            continue
+        seen.add(key)
+        sentences.append((sentence, in_requirements or bool(_REQUIREMENT_PATTERN.search(sentence))))
+    selected = [sentence for sentence, relevant in sentences if relevant] or [s for s, _ in sentences]
+
+    summary = ""
+    for sentence in selected:
+        if not sentence.endswith((".", "!", "?")):
+            sentence += "."
+        candidate = f"{summary} {sentence}" if summary else sentence
+        if len(candidate) > max_chars:
+            break
+        summary = candidate
+    if not summary:
+        # First sentence alone is too long - cut it at a word boundary
+        summary = (selected[0] if selected else description)[:max_chars].rsplit(" ", 1)[0]
+    return summary
+
+
+def _source_hash(job: dict) -> str:
+    source = {field: job.get(field) for field in JOB_DIGEST_SOURCE_FIELDS}
+    return hashlib.sha256(json.dumps(source, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def build_job_digest(job: dict) -> dict:
+    """Digest of a job document, stored as `job["digest"]`"""
+    domain, domain_keywords = classify_domain(job.get("title"))
+    experience_range = job.get("experience_range") or {}
+    return {
+        "version": JOB_DIGEST_VERSION,
+        "source_hash": _source_hash(job),
+        "title": job.get("title") or "Position",
+        "domain": domain,
+        "domain_keywords": domain_keywords,
+        "required_skills": normalize_skills(job.get("required_skills")),
+        "experience_range": {
+            "min_years": experience_range.get("min_years", 0),
+            "max_years": experience_range.get("max_years", 10),
+        },
+        "description_summary": summarize_description(job.get("description")),
+    }
+
+
+def job_digest_for(job: dict) -> dict:
+    """The stored digest if it is current for this job, otherwise a freshly built one"""
+    digest = (job or {}).get("digest")
+    if (
+        isinstance(digest, dict)
+        and digest.get("version") == JOB_DIGEST_VERSION
+        and digest.get("source_hash") == _source_hash(job)
+    ):
+        return digest
+    return build_job_digest(job or {})
@@ -0,0 +1,224 @@
+"""
+LLM Client - application-scoped OpenAI client with a pooled HTTP transport
+One AsyncOpenAI instance is created at startup and reused by every CV parse
+and story generation call, so connections (TLS sessions, HTTP/2 streams) are
+kept alive instead of being re-established per request. Every call goes
+through the process-wide AdaptiveRateLimiter (RPM/TPM budget, retries), and
+completions are hedged and bounded by a hard timeout (HedgingPolicy).
+"""
+import logging
+import os
+from typing import AsyncIterator, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from llm_hedging import HedgingPolicy
+from llm_rate_limiter import AdaptiveRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class LLMClient:
+    """
+    Shared chat-completions client.
+
+    Configured via LLM_* environment variables:
+    - LLM_MODEL (default gpt-4o-mini)
+    - LLM_BASE_URL (OpenAI-compatible endpoint, e.g. benchmarks/mock_llm_server.py)
+    - LLM_MAX_CONNECTIONS / LLM_MAX_KEEPALIVE_CONNECTIONS / LLM_KEEPALIVE_EXPIRY_SECONDS
+    - LLM_CONNECT_TIMEOUT_SECONDS / LLM_READ_TIMEOUT_SECONDS
+    - LLM_HTTP2 (default true, needs the `h2` package)
+    - LLM_RPM / LLM_TPM / LLM_MAX_CONCURRENCY / LLM_MAX_RETRIES (rate limiter)
+    - LLM_HEDGE / LLM_HEDGE_PERCENTILE / LLM_HEDGE_BUDGET_PERCENT /
+      LLM_HEDGE_INITIAL_DELAY_SECONDS / LLM_CALL_TIMEOUT_SECONDS (hedging)
+    """
+
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        base_url: Optional[str] = None,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_seconds: float = 60.0,
+        connect_timeout_seconds: float = 10.0,
+        read_timeout_seconds: float = 60.0,
+        http2: bool = True,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        hedging: Optional[HedgingPolicy] = None
+    ):
+        self.model = model
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry_seconds = keepalive_expiry_seconds
+        self.connect_timeout_seconds = connect_timeout_seconds
+        self.read_timeout_seconds = read_timeout_seconds
+        self.http2 = http2
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.hedging = hedging or HedgingPolicy()
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._client: Optional[AsyncOpenAI] = None
+
+    @classmethod
+    def from_env(cls) -> "LLMClient":
+        return cls(
+            model=os.environ.get('LLM_MODEL', 'gpt-4o-mini'),
+            base_url=os.environ.get('LLM_BASE_URL') or None,
+            max_connections=int(os.environ.get('LLM_MAX_CONNECTIONS', '50')),
+            max_keepalive_connections=int(os.environ.get('LLM_MAX_KEEPALIVE_CONNECTIONS', '20')),
+            keepalive_expiry_seconds=float(os.environ.get('LLM_KEEPALIVE_EXPIRY_SECONDS', '60')),
+            connect_timeout_seconds=float(os.environ.get('LLM_CONNECT_TIMEOUT_SECONDS', '10')),
+            read_timeout_seconds=float(os.environ.get('LLM_READ_TIMEOUT_SECONDS', '60')),
+            http2=os.environ.get('LLM_HTTP2', 'true').lower() == 'true',
+            rate_limiter=AdaptiveRateLimiter(
+                requests_per_minute=int(os.environ.get('LLM_RPM', '500')),
+                tokens_per_minute=int(os.environ.get('LLM_TPM', '200000')),
+                max_concurrency=int(os.environ.get('LLM_MAX_CONCURRENCY', '16')),
+                max_retries=int(os.environ.get('LLM_MAX_RETRIES', '4'))
+            ),
+            hedging=HedgingPolicy(
+                enabled=os.environ.get('LLM_HEDGE', 'true').lower() == 'true',
+                percentile=float(os.environ.get('LLM_HEDGE_PERCENTILE', '95')),
+                budget_percent=float(os.environ.get('LLM_HEDGE_BUDGET_PERCENT', '10')),
+                initial_delay_seconds=float(os.environ.get('LLM_HEDGE_INITIAL_DELAY_SECONDS', '10')),
+                timeout_seconds=float(os.environ.get('LLM_CALL_TIMEOUT_SECONDS', '45'))
+            )
+        )
+
+    def start(self, api_key: Optional[str]):
+        """Create the pooled client (no-op without an API key or if already started)"""
+        if not api_key or self._client is not None:
+            return
+
+        http2 = self.http2 and _http2_available()
+        if self.http2 and not http2:
+            logger.warning("LLM_HTTP2 requested but the 'h2' package is not installed - using HTTP/1.1")
+
+        self._http_client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry_seconds
+            ),
+            timeout=httpx.Timeout(
+                self.read_timeout_seconds,
+                connect=self.connect_timeout_seconds
+            )
+        )
+        # Retries are owned by the rate limiter so backoff is shared process-wide
+        self._client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=self.base_url,
+            http_client=self._http_client,
+            max_retries=0
+        )
+        logger.info(
+            f"LLM client started: model={self.model}, base_url={self.base_url or 'default'}, "
+            f"http2={http2}, max_connections={self.max_connections}"
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+        self._client = None
+        self._http_client = None
+
+    async def chat(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        api_key: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        """
+        Run a single chat completion (rate limited, retried, hedged) and return
+        the message content. Raises asyncio.TimeoutError past the hard timeout.
+        """
+        if self._client is None:
+            self.start(api_key)
+        if self._client is None:
+            raise RuntimeError("LLM client not configured - missing API key")
+
+        client = self._client
+
+        async def send():
+            return await client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+
+        def attempt():
+            # Each attempt (hedge included) is charged against the rate limits
+            return self.rate_limiter.run(
+                send,
+                prompt_text=system_prompt + user_prompt,
+                max_completion_tokens=max_tokens,
+                usage_tokens=lambda r: getattr(getattr(r, "usage", None), "total_tokens", None)
+            )
+
+        # No hedging while the provider is throttling us - it would only add load
+        response = await self.hedging.run(
+            attempt,
+            allow_hedge=lambda: self.rate_limiter.concurrency_limit >= self.rate_limiter.max_concurrency
+        )
+        return response.choices[0].message.content
+
+    async def chat_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        api_key: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion, yielding content deltas as they arrive.
+        Opening the stream goes through the rate limiter (budget + retries);
+        once tokens are flowing a failure is raised to the caller. The whole
+        stream is bounded by the hedging timeout (asyncio.TimeoutError).
+        """
+        if self._client is None:
+            self.start(api_key)
+        if self._client is None:
+            raise RuntimeError("LLM client not configured - missing API key")
+        client = self._client
+
+        async def open_stream():
+            return await client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+
+        # Opening and reading the stream share one deadline, so a slow-dripping upstream times out too
+        async for chunk in self.hedging.stream(lambda: self.rate_limiter.run(
+            open_stream,
+            prompt_text=system_prompt + user_prompt,
+            max_completion_tokens=max_tokens
+        )):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def metrics(self) -> dict:
+        return {"model": self.model, **self.rate_limiter.metrics(), "hedging": self.hedging.metrics()}
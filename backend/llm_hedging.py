@@ -0,0 +1,175 @@
+"""
+LLM Hedging - hedged requests and hard timeouts for chat completions
+If an attempt has not returned by the observed latency percentile, one
+identical backup request is sent; whichever finishes first wins and the
+other is cancelled. Hedges draw on a credit pool refilled by a fixed fraction
+of every call, so they never exceed that percentage of extra requests. Every
+call has a hard timeout, so a hung request surfaces as an error (and the
+caller's fallback) instead of blocking the upload.
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HedgingPolicy:
+    """
+    Hedge deadline, hedge budget and per-call timeout.
+
+    - `percentile` of the last `window` successful call latencies is the
+      hedge deadline (`initial_delay_seconds` until `min_samples` are seen)
+    - each call adds `budget_percent` / 100 of a credit (up to `max_burst`);
+      a hedge spends one credit, and is skipped when none is available
+    - `timeout_seconds` bounds the whole call, hedge included
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        percentile: float = 95.0,
+        budget_percent: float = 10.0,
+        initial_delay_seconds: float = 10.0,
+        min_delay_seconds: float = 1.0,
+        timeout_seconds: float = 45.0,
+        window: int = 200,
+        min_samples: int = 20,
+        max_burst: float = 5.0
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.budget_ratio = budget_percent / 100.0
+        self.initial_delay_seconds = initial_delay_seconds
+        self.min_delay_seconds = min_delay_seconds
+        self.timeout_seconds = timeout_seconds
+        self.min_samples = min_samples
+        self.max_burst = max_burst
+
+        self._latencies = deque(maxlen=window)
+        self._credits = 0.0
+
+        # Metrics
+        self._calls = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._hedges_skipped = 0
+        self._timeouts = 0
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait on the first attempt before sending a hedge"""
+        if len(self._latencies) < self.min_samples:
+            return self.initial_delay_seconds
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(self.percentile / 100.0 * len(ordered)) - 1)
+        return max(self.min_delay_seconds, ordered[index])
+
+    def _take_credit(self) -> bool:
+        if self._credits >= 1.0:
+            self._credits -= 1.0
+            return True
+        return False
+
+    async def run(
+        self,
+        attempt: Callable[[], Awaitable[T]],
+        allow_hedge: Optional[Callable[[], bool]] = None
+    ) -> T:
+        """
+        Run `attempt`, hedging it once if it is slow. `allow_hedge` can veto
+        the hedge at deadline time (e.g. while the provider is throttling).
+        Raises asyncio.TimeoutError after `timeout_seconds`.
+        """
+        self._calls += 1
+        self._credits = min(self.max_burst, self._credits + self.budget_ratio)
+        started = time.monotonic()
+        hedge_at = self.hedge_delay() if self.enabled else None
+
+        primary = asyncio.ensure_future(attempt())
+        started_at = {primary: started}
+        pending = {primary}
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                elapsed = time.monotonic() - started
+                wait = self.timeout_seconds - elapsed
+                if wait <= 0:
+                    break
+                if hedge_at is not None:
+                    wait = min(wait, max(0.0, hedge_at - elapsed))
+
+                done, pending = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._latencies.append(time.monotonic() - started_at[task])
+                        if task is not primary:
+                            self._hedge_wins += 1
+                        return task.result()
+                    last_error = task.exception()
+
+                if hedge_at is not None and pending and time.monotonic() - started >= hedge_at:
+                    # Only one hedge per call
+                    deadline, hedge_at = hedge_at, None
+                    if (allow_hedge is None or allow_hedge()) and self._take_credit():
+                        self._hedges += 1
+                        logger.info(f"LLM call slower than {deadline:.1f}s - sending hedged request")
+                        hedge = asyncio.ensure_future(attempt())
+                        started_at[hedge] = time.monotonic()
+                        pending.add(hedge)
+                    else:
+                        self._hedges_skipped += 1
+
+            if not pending and last_error is not None:
+                raise last_error
+            self._timeouts += 1
+            raise asyncio.TimeoutError(f"LLM call exceeded {self.timeout_seconds:.0f}s")
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream(self, open_stream: Callable[[], Awaitable[AsyncIterator[T]]]) -> AsyncIterator[T]:
+        """
+        Open a stream and yield its items, the whole stream bounded by
+        `timeout_seconds` (streams are not hedged - deltas are already on
+        screen). Raises asyncio.TimeoutError at the deadline, including when
+        the upstream keeps dripping chunks past it.
+        """
+        deadline = time.monotonic() + self.timeout_seconds
+        stream = None
+        try:
+            stream = await asyncio.wait_for(open_stream(), timeout=self.timeout_seconds)
+            chunks = stream.__aiter__()
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining)
+                except StopAsyncIteration:
+                    return
+                yield chunk
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise asyncio.TimeoutError(f"LLM stream exceeded {self.timeout_seconds:.0f}s")
+        finally:
+            close = getattr(stream, "close", None) or getattr(stream, "aclose", None)
+            if close is not None:
+                await close()
+
+    def metrics(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "hedge_delay_ms": round(self.hedge_delay() * 1000, 1),
+            "timeout_seconds": self.timeout_seconds,
+            "calls": self._calls,
+            "hedges": self._hedges,
+            "hedge_wins": self._hedge_wins,
+            "hedges_skipped": self._hedges_skipped,
+            "timeouts": self._timeouts,
+            "hedge_rate": round(self._hedges / self._calls, 4) if self._calls else 0.0
+        }
@@ -0,0 +1,244 @@
+"""
+LLM Rate Limiter - process-wide RPM/TPM token buckets with adaptive concurrency
+Keeps bulk CV ingestion at the provider's limits instead of tripping 429s:
+requests wait for request and token budget before they are sent, throttling
+responses are retried with jittered exponential backoff, and the number of
+concurrent calls shrinks (AIMD) while the provider is pushing back.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Status codes worth retrying
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt token estimate (~4 characters per token for English text)"""
+    return max(1, len(text) // 4)
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Best-effort HTTP status extraction from SDK / httpx exceptions"""
+    code = getattr(error, "status_code", None)
+    if code is None:
+        response = getattr(error, "response", None)
+        code = getattr(response, "status_code", None)
+    return code
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """Continuous-refill bucket: `capacity` units per minute"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.refill_per_second = per_minute / 60.0
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if available now)"""
+        self._refill()
+        # A single request larger than the bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AdaptiveRateLimiter:
+    """
+    Gatekeeper for every outbound LLM call.
+
+    - `requests_per_minute` / `tokens_per_minute` buckets are charged before a
+      call is sent (prompt tokens are estimated, completion tokens reserved
+      from max_tokens and refunded once real usage is known)
+    - Concurrency starts at `max_concurrency`, halves on every throttling
+      signal and grows back by one after `recovery_successes` clean calls
+    - 429 / 5xx / timeouts are retried up to `max_retries` times with
+      exponential backoff and full jitter (Retry-After is honoured)
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 200000,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        max_retries: int = 4,
+        base_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 30.0,
+        recovery_successes: int = 20
+    ):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency_limit = max_concurrency
+        self.max_retries = max_retries
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.recovery_successes = recovery_successes
+
+        self._active = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._successes_since_throttle = 0
+
+        # Metrics
+        self._calls = 0
+        self._retries = 0
+        self._throttled = 0
+        self._failures = 0
+        self._wait_seconds_total = 0.0
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        # Created lazily so it binds to the running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def _acquire(self, estimated_tokens: int):
+        started = time.monotonic()
+        async with self.condition:
+            while True:
+                if self._active < self.concurrency_limit:
+                    wait = max(
+                        self.request_bucket.wait_time(1),
+                        self.token_bucket.wait_time(estimated_tokens)
+                    )
+                    if wait <= 0:
+                        self.request_bucket.consume(1)
+                        self.token_bucket.consume(estimated_tokens)
+                        self._active += 1
+                        break
+                else:
+                    wait = None
+                try:
+                    await asyncio.wait_for(self.condition.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+        self._wait_seconds_total += time.monotonic() - started
+
+    async def _release(self):
+        async with self.condition:
+            self._active -= 1
+            self.condition.notify_all()
+
+    def _on_throttled(self):
+        self._throttled += 1
+        self._successes_since_throttle = 0
+        new_limit = max(self.min_concurrency, self.concurrency_limit // 2)
+        if new_limit != self.concurrency_limit:
+            logger.warning(f"LLM throttled - concurrency {self.concurrency_limit} -> {new_limit}")
+        self.concurrency_limit = new_limit
+
+    def _on_success(self):
+        self._successes_since_throttle += 1
+        if self.concurrency_limit < self.max_concurrency and self._successes_since_throttle >= self.recovery_successes:
+            self.concurrency_limit += 1
+            self._successes_since_throttle = 0
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff_seconds)
+        ceiling = min(self.max_backoff_seconds, self.base_backoff_seconds * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        if isinstance(error, asyncio.TimeoutError):
+            return True
+        code = _status_code(error)
+        if code is not None:
+            return code in RETRYABLE_STATUS_CODES
+        # Connection resets / SDK timeout classes carry no status code
+        return type(error).__name__ in {"APIConnectionError", "APITimeoutError", "ConnectError", "ReadTimeout"}
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        prompt_text: str,
+        max_completion_tokens: int = 0,
+        usage_tokens: Optional[Callable[[T], Optional[int]]] = None
+    ) -> T:
+        """Run `call` under the rate limits, retrying throttled / transient failures"""
+        estimated = estimate_tokens(prompt_text) + max_completion_tokens
+        attempt = 0
+        while True:
+            await self._acquire(estimated)
+            self._calls += 1
+            try:
+                result = await call()
+            except asyncio.CancelledError:
+                # Hedged / timed-out attempts are cancelled mid-call - free the slot
+                await self._release()
+                raise
+            except Exception as e:
+                await self._release()
+                code = _status_code(e)
+                if code == 429 or (code is not None and code >= 500):
+                    self._on_throttled()
+                if attempt >= self.max_retries or not self.is_retryable(e):
+                    self._failures += 1
+                    raise
+                delay = self._backoff(attempt, e)
+                self._retries += 1
+                attempt += 1
+                logger.warning(f"LLM call failed ({code or type(e).__name__}), retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            await self._release()
+            self._on_success()
+            if usage_tokens is not None:
+                actual = usage_tokens(result)
+                if actual is not None and actual < estimated:
+                    self.token_bucket.refund(estimated - actual)
+            return result
+
+    def metrics(self) -> dict:
+        return {
+            "requests_per_minute": self.request_bucket.capacity,
+            "tokens_per_minute": self.token_bucket.capacity,
+            "concurrency_limit": self.concurrency_limit,
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "calls": self._calls,
+            "retries": self._retries,
+            "throttled": self._throttled,
+            "failures": self._failures,
+            "avg_wait_ms": round(self._wait_seconds_total / self._calls * 1000, 1) if self._calls else 0.0
+        }
@@ -0,0 +1,440 @@
+"""
+Local CV Parser - deterministic fast path for well-structured resumes
+Splits the CV text into sections (Summary, Experience, Education, Skills),
+parses date ranges and matches the skill taxonomy to build the same fields
+the LLM parser returns, plus a confidence score. Templated CVs with clear
+headings parse with high confidence and skip the LLM call entirely.
+"""
+import re
+from typing import Optional
+
+from skill_taxonomy import listed_skill_name, normalize_skill, skill_aliases
+
+# ============ CONTACT DETAILS ============
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+PHONE_PATTERN = re.compile(r'(?:\+91[-\s]?)?(?:\d{10}|\d{5}[-\s]?\d{5}|\(\d{3}\)\s?\d{3}[-\s]?\d{4})')
+LINKEDIN_PATTERN = re.compile(r'linkedin\.com/in/[a-zA-Z0-9-]+')
+
+
+def extract_contact_details(text: str) -> dict:
+    """Regex-detected email, phone and LinkedIn URL ("" when not found)"""
+    email_match = EMAIL_PATTERN.search(text)
+    phone_match = PHONE_PATTERN.search(text)
+    linkedin_match = LINKEDIN_PATTERN.search(text)
+    return {
+        "email": email_match.group() if email_match else "",
+        "phone": phone_match.group() if phone_match else "",
+        "linkedin": f"https://{linkedin_match.group()}" if linkedin_match else "",
+    }
+
+
+# ============ SECTIONS ============
+
+SECTION_HEADINGS = {
+    "summary": [
+        "summary", "professional summary", "profile", "profile summary", "career summary",
+        "career objective", "objective", "about me", "professional profile", "brief summary",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "employment history",
+        "work history", "career history", "employment", "relevant experience",
+    ],
+    "education": [
+        "education", "academic qualifications", "educational qualifications", "academics",
+        "academic background", "education and training", "qualifications",
+    ],
+    "skills": [
+        "skills", "technical skills", "key skills", "core skills", "core competencies",
+        "competencies", "skill set", "skills and tools", "tools and technologies",
+        "technologies", "areas of expertise", "expertise", "technical proficiency",
+    ],
+    # Headings that only end the previous section
+    "other": [
+        "projects", "key projects", "academic projects", "certifications", "certificates",
+        "achievements", "awards", "accomplishments", "languages", "hobbies", "interests",
+        "personal details", "personal information", "references", "contact", "declaration",
+        "publications", "volunteering", "training", "courses", "strengths",
+    ],
+}
+_HEADING_LOOKUP = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+_BULLET_CHARS = "•●▪■◦‣∙·*-–—>"
+# Bullets, plus symbol-font glyphs (private use area) that PDF extraction leaves behind
+_BULLET_PREFIX = re.compile(r"^[\s•●▪■◦‣∙·*\-–—>\uf000-\uf8ff]+")
+
+
+def _heading_section(line: str) -> Optional[str]:
+    """Section name if the line is a heading such as "WORK EXPERIENCE:" """
+    if len(line) > 40:
+        return None
+    key = line.strip(" :" + _BULLET_CHARS).lower().replace("&", "and")
+    key = re.sub(r"\s+", " ", key)
+    return _HEADING_LOOKUP.get(key)
+
+
+def split_section_blocks(text: str) -> list[tuple[str, Optional[str], list[str]]]:
+    """
+    (section name, heading line, lines) for each heading in document order.
+    Lines before the first heading form a "header" block without a heading.
+    """
+    blocks = [("header", None, [])]
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or not _BULLET_PREFIX.sub("", line):
+            continue
+        section = _heading_section(line)
+        if section:
+            blocks.append((section, line, []))
+            continue
+        blocks[-1][2].append(line)
+    return blocks
+
+
+def split_sections(text: str) -> dict:
+    """
+    Map section name -> list of lines. Lines before the first heading are
+    the "header"; a repeated heading appends to the same section.
+    """
+    sections = {}
+    for section, _, lines in split_section_blocks(text):
+        sections.setdefault(section, []).extend(lines)
+    return sections
+
+
+# ============ DATES ============
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s*[',]?\s*\d{{4}}|\d{{1,2}}\s*/\s*\d{{4}}|\d{{4}})"
+_PRESENT = r"(?:present|current|now|till date|to date|date)"
+DATE_RANGE_PATTERN = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:-|–|—|to|till|until)\s*(?P<end>{_DATE}|{_PRESENT})",
+    re.IGNORECASE
+)
+_YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+
+
+def _year_of(date_text: str) -> Optional[int]:
+    if re.fullmatch(_PRESENT, date_text.strip(), re.IGNORECASE):
+        return 9999
+    match = _YEAR_PATTERN.search(date_text)
+    return int(match.group()) if match else None
+
+
+def find_date_range(line: str) -> Optional[re.Match]:
+    """First plausible "start - end" range in a line (start year not after end year)"""
+    for match in DATE_RANGE_PATTERN.finditer(line):
+        start, end = _year_of(match.group("start")), _year_of(match.group("end"))
+        if start and end and 1950 <= start <= end:
+            return match
+    return None
+
+
+def _format_range(match: re.Match) -> str:
+    end = match.group("end")
+    if re.fullmatch(_PRESENT, end, re.IGNORECASE):
+        end = "Present"
+    return f"{match.group('start')} - {end}"
+
+
+# ============ EXPERIENCE ============
+
+_ROLE_WORDS = re.compile(
+    r"\b(?:engineer|developer|manager|analyst|consultant|lead|architect|designer|intern|"
+    r"specialist|officer|director|executive|administrator|associate|scientist|tester|head|"
+    r"coordinator|programmer|advisor|president|trainee|owner|recruiter|accountant|"
+    r"technician|supervisor|representative|qa|sde)\b",
+    re.IGNORECASE
+)
+_ORG_WORDS = re.compile(
+    r"\b(?:ltd|limited|inc|llc|llp|pvt|private|corp|corporation|technologies|technology|"
+    r"solutions|systems|services|software|bank|group|labs|gmbh|co|company|consulting|"
+    r"university|college|institute|school|academy)\b\.?",
+    re.IGNORECASE
+)
+_FIELD_SEPARATORS = re.compile(r"\s*(?:\||,|\s@\s|\sat\s|\s[-–—]\s|\t)\s*")
+_LOCATION_SUFFIX = re.compile(r"\s*\|\s*[A-Z][A-Za-z .]+,\s*[A-Z][A-Za-z .]+$")
+
+
+def _is_bullet(line: str) -> bool:
+    return bool(_BULLET_PREFIX.match(line))
+
+
+def _clean_bullet(line: str) -> str:
+    return _BULLET_PREFIX.sub("", line).strip()
+
+
+def _tidy_field(part: str) -> str:
+    """Trim a field, dropping brackets left unbalanced by the split ("(Oct 2022" -> "Oct 2022")"""
+    part = part.strip(" .")
+    if part.count("(") != part.count(")") or (part.startswith("(") and part.endswith(")")):
+        part = part.strip("() .")
+    return part
+
+
+def _split_fields(text: str) -> list[str]:
+    text = _clean_bullet(text).strip(" |,–—-\t")
+    return [part for part in (_tidy_field(p) for p in _FIELD_SEPARATORS.split(text)) if part]
+
+
+def _role_and_company(fields: list[str]) -> tuple[str, str]:
+    """Pick the job title and employer out of the text around a date range"""
+    # "Software" and "Technology" appear in both titles and company names
+    role = next((f for f in fields if _ROLE_WORDS.search(f) and not _ORG_WORDS.search(f)), "")
+    role = role or next((f for f in fields if _ROLE_WORDS.search(f)), "")
+    company = next((f for f in fields if f != role and _ORG_WORDS.search(f)), "")
+    company = company or next((f for f in fields if f != role), "")
+    return role, company
+
+
+def parse_experience(lines: list[str]) -> list[dict]:
+    """
+    One entry per line holding a date range. The title is the text around the
+    range plus up to two short non-bullet lines right above it; the lines up to
+    the next entry's title are its achievements.
+    """
+    anchors = [(i, m) for i, m in ((i, find_date_range(line)) for i, line in enumerate(lines)) if m]
+    entries = []
+    title_starts = []
+    for position, (index, match) in enumerate(anchors):
+        previous_anchor = anchors[position - 1][0] if position else -1
+        start = index
+        while (
+            start - 1 > previous_anchor
+            and index - (start - 1) <= 2
+            and not _is_bullet(lines[start - 1])
+            and len(lines[start - 1].split()) <= 8
+            and not lines[start - 1].endswith(".")
+        ):
+            start -= 1
+        title_starts.append(start)
+
+        line = _LOCATION_SUFFIX.sub("", lines[index])
+        around = line[:match.start()] + " | " + line[match.end():]
+        fields = [field for text in lines[start:index] for field in _split_fields(text)]
+        fields += _split_fields(around)
+        role, company = _role_and_company(fields)
+        entries.append({"role": role, "company": company, "duration": _format_range(match), "achievements": []})
+
+    for position, (index, _) in enumerate(anchors):
+        end = title_starts[position + 1] if position + 1 < len(anchors) else len(lines)
+        achievements = []
+        for line in lines[index + 1:end]:
+            text = _clean_bullet(line)
+            if not text:
+                continue
+            if achievements and not _is_bullet(line) and achievements[-1][-1:] not in ".!?":
+                # Wrapped continuation of the previous bullet
+                achievements[-1] += " " + text
+            else:
+                achievements.append(text)
+        entries[position]["achievements"] = achievements
+    return entries
+
+
+# ============ EDUCATION ============
+
+_DEGREE_WORDS = re.compile(
+    r"\b(?:b\.?\s?tech|m\.?\s?tech|b\.?e|m\.?e|b\.?sc|m\.?sc|b\.?com|m\.?com|b\.?a|m\.?a|bca|mca|"
+    r"bba|mba|ph\.?d|bachelors?|masters?|diploma|doctorate|associate degree|ssc|hsc|"
+    r"high school|higher secondary|intermediate|10th|12th)\b",
+    re.IGNORECASE
+)
+_INSTITUTION_WORDS = re.compile(r"\b(?:university|college|institute|school|academy|iit|nit|iiit|iim)\b", re.IGNORECASE)
+_GRADE_PATTERN = re.compile(r"\b(?:cgpa|gpa|dgpa|percentage|grade|score)\b|\d%|^\d+(?:\.\d+)?$", re.IGNORECASE)
+
+
+def _education_year(text: str) -> str:
+    match = find_date_range(text)
+    if match:
+        return _format_range(match)
+    years = _YEAR_PATTERN.findall(text)
+    return years[-1] if years else ""
+
+
+def parse_education(lines: list[str]) -> list[dict]:
+    """One entry per line naming a degree; institution and year may sit on the next line"""
+    entries = []
+    for index, line in enumerate(lines):
+        degree_match = _DEGREE_WORDS.search(line)
+        if not degree_match:
+            continue
+        fields = [
+            f for f in _split_fields(line)
+            if not _YEAR_PATTERN.fullmatch(f) and not _GRADE_PATTERN.search(f)
+        ]
+        degree = next((f for f in fields if _DEGREE_WORDS.search(f)), _clean_bullet(line))
+        others = [f for f in fields if f != degree]
+        next_line = lines[index + 1] if index + 1 < len(lines) else ""
+        if next_line and _DEGREE_WORDS.search(next_line):
+            next_line = ""
+        institution = (
+            next((f for f in others if _INSTITUTION_WORDS.search(f)), "")
+            or next((f for f in _split_fields(next_line) if _INSTITUTION_WORDS.search(f)), "")
+            or (others[0] if others else "")
+        )
+        year = _education_year(line) or _education_year(next_line)
+        entries.append({"degree": degree, "institution": institution, "year": year})
+    return entries
+
+
+# ============ SKILLS ============
+
+# Skill names and synonyms come from the shared taxonomy. They are matched as
+# whole words anywhere in the CV, except aliases that are also everyday words
+# ("Go", "R", "Rest", "excel at") or soft skills - those only count when listed
+# in the Skills section
+SCAN_EXCLUDED_ALIASES = {
+    "go", "r", "c", "rest", "spring", "express", "node", "shell", "excel", "swift", "rust",
+    "ui", "ux", "ai", "ml", "ts", "py", "communication", "communication skills",
+    "leadership", "team leadership",
+}
+_SKILL_LOOKUP = {alias: name for alias, name in skill_aliases().items() if alias not in SCAN_EXCLUDED_ALIASES}
+# Longest aliases first so "Spring Boot" wins over "Spring"
+_SKILL_PATTERN = re.compile(
+    r"(?<![\w.+#])(?:"
+    + "|".join(re.escape(alias).replace(r"\ ", r"\s+") for alias in sorted(_SKILL_LOOKUP, key=len, reverse=True))
+    + r")(?![\w+#]|\.\w)",
+    re.IGNORECASE
+)
+_SKILL_ITEM_SEPARATORS = re.compile(r"\s*(?:,|;|\||•|●|▪|/(?!\w{1,3}\b))\s*")
+
+
+def canonical_skill(skill: str) -> str:
+    """Taxonomy spelling of a skill ("reactjs" -> "React"); unknown skills are returned trimmed"""
+    skill = re.sub(r"\s+", " ", skill).strip()
+    return listed_skill_name(skill) or skill
+
+
+def dictionary_skills(text: str) -> list[str]:
+    """Canonical names of taxonomy skills mentioned in the text, in order of appearance"""
+    found = []
+    for match in _SKILL_PATTERN.finditer(text):
+        canonical = _SKILL_LOOKUP[normalize_skill(match.group())]
+        if canonical not in found:
+            found.append(canonical)
+    return found
+
+
+def parse_skills(lines: list[str], full_text: str) -> list[str]:
+    """Items listed in the Skills section, then dictionary skills found anywhere else"""
+    skills = []
+    seen = set()
+
+    def add(skill: str):
+        key = skill.lower()
+        if key not in seen:
+            seen.add(key)
+            skills.append(skill)
+
+    # Re-join items wrapped onto the next line ("End-to-End" / "Testing, UAT")
+    entries = []
+    for line in lines:
+        if entries and not _is_bullet(line) and ":" not in line[:40] and entries[-1][-1] not in ",;.|":
+            entries[-1] += " " + line
+        else:
+            entries.append(_clean_bullet(line))
+
+    for entry in entries:
+        # "Backend Development: Node.js, Express.js" -> drop the category label
+        items = entry.split(":", 1)[1] if ":" in entry[:40] else entry
+        for item in _SKILL_ITEM_SEPARATORS.split(items):
+            item = _tidy_field(item)
+            if item and len(item.split()) <= 4 and len(item) <= 40:
+                add(canonical_skill(item))
+    for skill in dictionary_skills(full_text):
+        add(skill)
+    return skills
+
+
+# ============ HEADER ============
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z][A-Za-z.'-]*(?:\s+[A-Za-z][A-Za-z.'-]*){1,3}$")
+
+
+def parse_name(header_lines: list[str]) -> str:
+    """First header line that looks like a person's name (2-4 words, letters only)"""
+    for line in header_lines[:5]:
+        candidate = EMAIL_PATTERN.sub("", line).split("|")[0].strip()
+        if _NAME_PATTERN.match(candidate) and not _ROLE_WORDS.search(candidate):
+            return candidate.title() if candidate.isupper() else candidate
+    return ""
+
+
+def _header_role(header_lines: list[str], name: str) -> str:
+    for line in header_lines[:4]:
+        if line != name and line.lower() != name.lower() and _ROLE_WORDS.search(line) and len(line.split()) <= 6:
+            return line.strip()
+    return ""
+
+
+# ============ PARSER ============
+
+# Confidence weights - all present gives 1.0
+_WEIGHTS = {
+    "name": 0.15,
+    "contact": 0.15,
+    "experience": 0.30,
+    "education": 0.15,
+    "skills": 0.15,
+    "summary": 0.10,
+}
+
+
+def _confidence(parsed: dict, sections: dict) -> float:
+    score = 0.0
+    if parsed["name"]:
+        score += _WEIGHTS["name"]
+    if parsed["email"] and parsed["phone"]:
+        score += _WEIGHTS["contact"]
+    elif parsed["email"] or parsed["phone"]:
+        score += _WEIGHTS["contact"] * 2 / 3
+
+    experience = parsed["experience"]
+    if experience:
+        complete = sum(1 for e in experience if e["role"] and e["company"] and e["duration"])
+        score += _WEIGHTS["experience"] * complete / len(experience)
+
+    education = parsed["education"]
+    if education:
+        complete = sum(1 for e in education if e["degree"] and e["institution"])
+        score += _WEIGHTS["education"] * complete / len(education)
+
+    if "skills" in sections and len(parsed["skills"]) >= 3:
+        score += _WEIGHTS["skills"]
+    if parsed["summary"]:
+        score += _WEIGHTS["summary"]
+    return round(score, 2)
+
+
+def parse_cv_locally(cv_text: str) -> tuple[dict, float]:
+    """
+    Parse CV text without the LLM.
+    Returns ParsedResume fields as a dict plus a 0-1 confidence score.
+    """
+    sections = split_sections(cv_text)
+    header = sections.get("header", [])
+    contact = extract_contact_details(cv_text)
+    experience = parse_experience(sections.get("experience", []))
+
+    name = parse_name(header)
+    current_role = ""
+    if experience:
+        # Most recent entry by end year (Present counts as latest)
+        latest = max(experience, key=lambda e: _year_of(e["duration"].split(" - ")[-1]) or 0)
+        current_role = latest["role"]
+    current_role = current_role or _header_role(header, name)
+
+    # First three sentences of the summary section, like the LLM's 2-3 sentence summary
+    summary_text = " ".join(_clean_bullet(line) for line in sections.get("summary", []))
+    summary = " ".join(re.split(r"(?<=[.!?])\s+", summary_text)[:3])[:800].strip()
+
+    parsed = {
+        "name": name,
+        "current_role": current_role,
+        **contact,
+        "skills": parse_skills(sections.get("skills", []), cv_text),
+        "experience": experience,
+        "education": parse_education(sections.get("education", [])),
+        "summary": summary,
+    }
+    return parsed, _confidence(parsed, sections)
@@ -0,0 +1,152 @@
+"""
+Person Profiles - who a candidate record is, across a client's jobs
+A candidate document belongs to exactly one job. When a candidate is
+submitted to another job, `person_profiles` records that both records are
+the same person (`person_id` on each), so the person is never added to a job
+twice and the new record is built from the existing one with a single story
+call - no extraction or parse.
+
+Profiles hold identity only (name, email, phone); the parsed resume stays on
+the candidate records. Profiles never cross clients. An exact email links two
+records; a phone number links them only when the names agree as well, so a
+shared office or agency line cannot merge two people.
+"""
+import logging
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Parsed resume fields a submitted record copies from its source candidate
+PROFILE_FIELDS = (
+    "name", "current_role", "email", "phone", "linkedin",
+    "skills", "experience", "education", "summary",
+)
+
+# CV fields a submitted record copies from the candidate it was submitted from
+SUBMITTED_CV_FIELDS = ("cv_text_original", "cv_redaction_spans", "cv_redaction_version")
+
+
+def normalize_email(email: Optional[str]) -> str:
+    email = (email or "").strip().lower()
+    return email if "@" in email else ""
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """Last 10 digits, so "+91 98765-43210" and "098765 43210" compare equal"""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-10:] if len(digits) >= 10 else ""
+
+
+def normalize_name(name: Optional[str]) -> str:
+    return " ".join((name or "").lower().split())
+
+
+def person_keys(email: Optional[str], phone: Optional[str]) -> list[str]:
+    """Lookup keys for a person ("email:..." / "phone:..."); empty when neither is usable"""
+    keys = []
+    if normalize_email(email):
+        keys.append(f"email:{normalize_email(email)}")
+    if normalize_phone(phone):
+        keys.append(f"phone:{normalize_phone(phone)}")
+    return keys
+
+
+def submitted_candidate_fields(source: dict) -> dict:
+    """
+    Parse and CV fields for a record submitted from `source` to another job -
+    always the source candidate's own
+    """
+    fields = {field: source.get(field) for field in PROFILE_FIELDS}
+    fields.update({field: source.get(field) for field in SUBMITTED_CV_FIELDS})
+    fields["cv_text_complete"] = source.get("cv_text_complete", True)
+    return fields
+
+
+class PersonProfileStore:
+    """
+    Profiles in the `person_profiles` collection, scoped by `client_id`.
+
+    - `keys` accumulates every normalized email / phone seen for the person
+    - `name_key` (normalized name) must agree for a phone-only match
+    """
+
+    def __init__(self, db):
+        self.collection = db.person_profiles
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("person_id", unique=True)
+        await self.collection.create_index([("client_id", 1), ("keys", 1)])
+
+    async def get(self, person_id: Optional[str], client_id: Optional[str]) -> Optional[dict]:
+        """The profile, if it belongs to `client_id`"""
+        if not person_id or not client_id:
+            return None
+        return await self.collection.find_one({"person_id": person_id, "client_id": client_id}, {"_id": 0})
+
+    async def find(
+        self,
+        client_id: Optional[str],
+        email: Optional[str],
+        phone: Optional[str] = None,
+        name: Optional[str] = None
+    ) -> Optional[dict]:
+        """The client's profile with this exact email, else with this phone and the same name"""
+        if not client_id:
+            return None
+        email = normalize_email(email)
+        if email:
+            profile = await self.collection.find_one(
+                {"client_id": client_id, "keys": f"email:{email}"},
+                {"_id": 0},
+                sort=[("updated_at", -1)]
+            )
+            if profile:
+                return profile
+        phone, name_key = normalize_phone(phone), normalize_name(name)
+        if phone and name_key:
+            return await self.collection.find_one(
+                {"client_id": client_id, "keys": f"phone:{phone}", "name_key": name_key},
+                {"_id": 0},
+                sort=[("updated_at", -1)]
+            )
+        return None
+
+    async def save(self, person: dict, client_id: Optional[str], person_id: Optional[str] = None) -> dict:
+        """
+        Record a candidate's identity (name, email, phone) within `client_id`
+        and return the profile. `person_id` pins the profile (the candidate
+        already has one); otherwise it is matched by `find` or created.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        identity = {
+            "name": person.get("name"),
+            "email": person.get("email"),
+            "phone": person.get("phone"),
+            "name_key": normalize_name(person.get("name"))
+        }
+        keys = person_keys(person.get("email"), person.get("phone"))
+
+        existing = await self.get(person_id, client_id) if person_id else None
+        if existing is None:
+            existing = await self.find(client_id, person.get("email"), person.get("phone"), person.get("name"))
+        if existing:
+            update = {"$set": {"updated_at": now}}
+            if keys:
+                update["$addToSet"] = {"keys": {"$each": keys}}
+            await self.collection.update_one({"person_id": existing["person_id"]}, update)
+            return {**existing, "keys": sorted(set(existing.get("keys", [])) | set(keys)), "updated_at": now}
+
+        profile = {
+            "person_id": f"person_{uuid.uuid4().hex[:12]}",
+            "client_id": client_id,
+            "keys": keys,
+            **identity,
+            "created_at": now,
+            "updated_at": now
+        }
+        await self.collection.insert_one(dict(profile))
+        logger.info(f"Person profile {profile['person_id']} created ({', '.join(keys) or 'no contact keys'})")
+        return profile
@@ -0,0 +1,68 @@
+"""
+PII Redaction - single-pass scanner producing typed redaction spans
+One precompiled alternation finds emails, phone numbers, LinkedIn and other
+URLs in a single scan of the CV text. Candidates store the original text
+plus the compact span list; the redacted view is rendered when requested.
+"""
+import re
+
+# Bump whenever the patterns change so stored spans are recomputed on read
+REDACTION_VERSION = "1"
+
+REDACTION_LABELS = {
+    "email": "[EMAIL REDACTED]",
+    "phone": "[PHONE REDACTED]",
+    "linkedin": "[LINKEDIN REDACTED]",
+    "url": "[URL REDACTED]",
+}
+
+# Every branch starts with a literal or character class so the regex engine
+# can skip ahead on its first character. The leading word boundary of the
+# original per-type patterns is checked by a lookbehind after that first
+# character instead of a `\b` in front of it. Branch order gives URLs
+# priority over emails, and emails over phone numbers.
+_PII_PATTERN = re.compile(
+    # URLs (LinkedIn is told apart after matching)
+    r"https?://[^\s]+"
+    # Email starting with a word character / with . % + -
+    r"|[A-Za-z0-9_](?<!\w.)[A-Za-z0-9._%+-]*@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
+    r"|[.%+-](?<=\w.)[A-Za-z0-9._%+-]*@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
+    # Phone with country code, e.g. +91 98765 43210
+    r"|\+(?<=\w\+)\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3,4}[-.\s]?\d{4}\b"
+    # Phone with area code in brackets, e.g. (555) 123-4567
+    r"|\((?<=\w\()\d{3}\)?[-.\s]?\d{3,4}[-.\s]?\d{4}\b"
+    # Phone starting with a digit - long forms, then short forms like 555-1234
+    r"|\d(?<!\w\d)(?:"
+    r"\d{0,2}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3,4}[-.\s]?\d{4}\b"
+    r"|\d{2}\)?[-.\s]?\d{3,4}[-.\s]?\d{4}\b"
+    r"|\d{2}-\d{4}\b)"
+)
+_LINKEDIN_PREFIX = re.compile(r"https?://(?:www\.)?linkedin\.com/")
+
+
+def _span_type(token: str) -> str:
+    if token.startswith(("http://", "https://")):
+        return "linkedin" if _LINKEDIN_PREFIX.match(token) else "url"
+    return "email" if "@" in token else "phone"
+
+
+def find_pii_spans(text: str) -> list[list]:
+    """Return `[start, end, type]` for every PII match, in text order"""
+    return [[m.start(), m.end(), _span_type(m.group())] for m in _PII_PATTERN.finditer(text)]
+
+
+def render_redacted(text: str, spans: list) -> str:
+    """Replace each span with its redaction label"""
+    parts = []
+    position = 0
+    for start, end, kind in spans:
+        parts.append(text[position:start])
+        parts.append(REDACTION_LABELS.get(kind, "[REDACTED]"))
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def redact_text(text: str) -> str:
+    """Redact personal information from text"""
+    return render_redacted(text, find_pii_spans(text))
@@ -0,0 +1,285 @@
+"""
+Prompt Builder - token-budgeted prompts for CV parsing and story generation
+Counts tokens locally (tiktoken when installed, otherwise the ~4 characters
+per token estimate) and fills a configurable budget with the most relevant
+content instead of slicing at fixed character / item counts:
+- CV text: sections are ranked (header and contact details, experience,
+  skills, education, summary, everything else) and kept in document order
+- Story candidate data: the most recent roles first, then education, then
+  achievements - those mentioning the job's skills before the rest
+"""
+import json
+import logging
+import os
+import textwrap
+from typing import Optional
+
+from llm_rate_limiter import estimate_tokens
+from local_cv_parser import split_section_blocks
+
+logger = logging.getLogger(__name__)
+
+# CV sections in the order they are kept when the CV does not fit the budget
+CV_SECTION_PRIORITY = ("header", "experience", "skills", "education", "summary", "other")
+
+# Remaining budget below which further sections are dropped rather than cut to a stub
+MIN_SECTION_TOKENS = 24
+
+
+def _load_encoding(model: str):
+    """tiktoken encoding for the model, or None when it cannot be loaded"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encoding files are downloaded on first use - offline hosts fall back to the estimate
+        logger.warning(f"tiktoken encoding for {model} unavailable ({e}) - using character estimate")
+        return None
+
+
+class TokenCounter:
+    """Local token counting for a model's tokenizer"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self._encoding = _load_encoding(model)
+
+    @property
+    def exact(self) -> bool:
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return estimate_tokens(text)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Longest prefix of `text` within `max_tokens`, cut at a word boundary"""
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        if self._encoding is not None:
+            prefix = self._encoding.decode(self._encoding.encode(text, disallowed_special=())[:max_tokens])
+        else:
+            prefix = text[:max_tokens * 4]
+        return prefix.rsplit(" ", 1)[0] if " " in prefix else prefix
+
+
+def _relevance(text: str, terms: list[str]) -> int:
+    text = text.lower()
+    return sum(1 for term in terms if term in text)
+
+
+class PromptBuilder:
+    """
+    Budgeted prompt content plus token usage metrics.
+
+    Configured via LLM_* environment variables:
+    - LLM_CV_PARSE_PROMPT_TOKENS: user prompt budget for CV parsing (default 2000)
+    - LLM_STORY_PROMPT_TOKENS: user prompt budget for story generation (default 2500)
+    """
+
+    def __init__(self, model: str, cv_parse_budget: int = 2000, story_budget: int = 2500):
+        self.counter = TokenCounter(model)
+        self.cv_parse_budget = cv_parse_budget
+        self.story_budget = story_budget
+        self._usage = {}
+
+    @classmethod
+    def from_env(cls, model: str) -> "PromptBuilder":
+        return cls(
+            model=model,
+            cv_parse_budget=int(os.environ.get('LLM_CV_PARSE_PROMPT_TOKENS', '2000')),
+            story_budget=int(os.environ.get('LLM_STORY_PROMPT_TOKENS', '2500')),
+        )
+
+    def count(self, text: str) -> int:
+        return self.counter.count(text)
+
+    def _fit_lines(self, lines: list[str], budget: int) -> tuple[list[str], int]:
+        """Leading lines within `budget`; a line that does not fit is cut at a word boundary"""
+        kept = []
+        used = 0
+        for line in lines:
+            cost = self.count(line + "\n")
+            if used + cost > budget:
+                partial = self.counter.truncate(line, budget - used - 1)
+                if partial:
+                    kept.append(partial)
+                    used += self.count(partial + "\n")
+                break
+            kept.append(line)
+            used += cost
+        return kept, used
+
+    def fit_cv_text(self, cv_text: str, reserved_tokens: int = 0) -> str:
+        """
+        CV text within the parse budget minus `reserved_tokens` (the rest of
+        the prompt). Whole sections are kept by priority, the last one that
+        fits partially is cut at a line boundary, and the result keeps the
+        original section order.
+        """
+        budget = self.cv_parse_budget - reserved_tokens
+        blocks = [
+            (section, ([heading] if heading else []) + lines)
+            for section, heading, lines in split_section_blocks(cv_text)
+        ]
+        full_text = "\n".join(line for _, lines in blocks for line in lines)
+        if self.count(full_text) <= budget:
+            return full_text
+
+        kept = {}
+        remaining = budget
+        for section in CV_SECTION_PRIORITY:
+            for index, (block_section, lines) in enumerate(blocks):
+                if block_section != section or not lines or remaining < MIN_SECTION_TOKENS:
+                    continue
+                fitted, used = self._fit_lines(lines, remaining)
+                if fitted:
+                    kept[index] = fitted
+                    remaining -= used
+        # Per-line counts can add up to slightly more than the joined text - trim the last lines added
+        added = list(kept)
+        while added and self.count(self._join(kept)) > budget:
+            kept[added[-1]].pop()
+            if not kept[added[-1]]:
+                del kept[added.pop()]
+        return self._join(kept)
+
+    @staticmethod
+    def _join(kept: dict) -> str:
+        return "\n".join(line for index in sorted(kept) for line in kept[index])
+
+    def fit_story_candidate_data(
+        self,
+        candidate_data: dict,
+        relevant_terms: Optional[list[str]] = None,
+        reserved_tokens: int = 0
+    ) -> dict:
+        """
+        Candidate data (name, current_role, skills, summary, experience,
+        education) within the story budget minus `reserved_tokens`. Roles are
+        added in order (most recent first) with their most relevant
+        achievement, then education, then the remaining achievements
+        round-robin across roles - those mentioning `relevant_terms` first.
+        """
+        budget = self.story_budget - reserved_tokens
+        terms = [term.lower() for term in relevant_terms or [] if term]
+
+        def cost(value, depth: int = 0) -> int:
+            # Items are counted at the indentation they have inside the candidate JSON
+            return self.count(textwrap.indent(json.dumps(value, indent=2), " " * depth) + ",\n")
+
+        if cost(candidate_data) <= budget:
+            return candidate_data
+
+        skills = list(candidate_data.get("skills") or [])
+        data = {
+            "name": candidate_data.get("name", ""),
+            "current_role": candidate_data.get("current_role", ""),
+            "skills": skills,
+            "summary": candidate_data.get("summary", ""),
+            "experience": [],
+            "education": [],
+        }
+        remaining = budget - cost(data)
+        if remaining < 0:
+            # Oversized skill list - keep the job-relevant skills first
+            ranked = sorted(skills, key=lambda skill: -_relevance(skill, terms))
+            data["skills"] = []
+            remaining = budget - cost(data)
+            for skill in ranked:
+                skill_cost = cost(skill, 4)
+                if skill_cost > remaining:
+                    break
+                data["skills"].append(skill)
+                remaining -= skill_cost
+
+        # Each role's achievements, most relevant first
+        experience = []
+        for exp in candidate_data.get("experience") or []:
+            achievements = exp.get("achievements") or []
+            order = sorted(range(len(achievements)), key=lambda i: (-_relevance(achievements[i], terms), i))
+            entry = {key: exp.get(key, "") for key in ("role", "company", "duration")}
+            entry["achievements"] = [achievements[order[0]]] if order else []
+            entry_cost = cost(entry, 4)
+            if entry_cost > remaining:
+                break
+            data["experience"].append(entry)
+            experience.append((achievements, order))
+            remaining -= entry_cost
+
+        for education in candidate_data.get("education") or []:
+            education_cost = cost(education, 4)
+            if education_cost > remaining:
+                break
+            data["education"].append(education)
+            remaining -= education_cost
+
+        # Remaining achievements round-robin: every role's second before any third, relevant ones first
+        ranked = sorted(
+            (rank, -_relevance(achievements[position], terms), role_index, position)
+            for role_index, (achievements, order) in enumerate(experience)
+            for rank, position in enumerate(order[1:], start=1)
+        )
+        chosen = []
+        for _, _, role_index, position in ranked:
+            achievement_cost = cost(experience[role_index][0][position], 8)
+            if achievement_cost <= remaining:
+                chosen.append((role_index, position))
+                remaining -= achievement_cost
+
+        def apply(selection):
+            for role_index, entry in enumerate(data["experience"]):
+                achievements, order = experience[role_index]
+                positions = order[:1] + [position for chosen_role, position in selection if chosen_role == role_index]
+                entry["achievements"] = [achievements[position] for position in sorted(positions)]
+
+        apply(chosen)
+        # Per-item counts can add up to slightly more than the whole -
+        # trim the last achievements added, then the oldest roles, then education
+        while cost(data) > budget:
+            if chosen:
+                chosen.pop()
+                apply(chosen)
+            elif len(data["experience"]) > 1:
+                data["experience"].pop()
+            elif data["education"]:
+                data["education"].pop()
+            elif data["experience"]:
+                data["experience"].pop()
+            else:
+                break
+        return data
+
+    def record(self, kind: str, prompt: str) -> int:
+        """Count the final prompt's tokens and add them to the usage metrics"""
+        tokens = self.count(prompt)
+        budget = self.cv_parse_budget if kind == "cv_parse" else self.story_budget
+        usage = self._usage.setdefault(kind, {"prompts": 0, "tokens": 0, "max_tokens": 0, "over_budget": 0})
+        usage["prompts"] += 1
+        usage["tokens"] += tokens
+        usage["max_tokens"] = max(usage["max_tokens"], tokens)
+        if tokens > budget:
+            usage["over_budget"] += 1
+        return tokens
+
+    def metrics(self) -> dict:
+        return {
+            "tokenizer": "tiktoken" if self.counter.exact else "estimate",
+            "cv_parse_budget": self.cv_parse_budget,
+            "story_budget": self.story_budget,
+            "usage": {
+                kind: {**usage, "avg_tokens": round(usage["tokens"] / usage["prompts"], 1)}
+                for kind, usage in self._usage.items()
+            },
+        }
@@ -1,10 +1,12 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Form, BackgroundTasks
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Form, BackgroundTasks, Header
+from fastapi.encoders import jsonable_encoder
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
 import logging
 import io
 from pathlib import Path
@@ -17,12 +19,48 @@ import uuid
 import re
 import json
 import secrets
+import zipfile
+import mimetypes
+import time
 from emergentintegrations.llm.chat import LlmChat, UserMessage
-from openai import AsyncOpenAI
 
-# PDF and DOCX parsing
-import pdfplumber
-from docx import Document as DocxDocument
+# Shared LLM client
+from llm_client import LLMClient
+from story_stream import StoryFieldScanner, sse_event
+from pii_redaction import REDACTION_VERSION, find_pii_spans, redact_text, render_redacted
+from local_cv_parser import extract_contact_details, parse_cv_locally
+from job_digest import build_job_digest, job_digest_for
+from prompt_builder import PromptBuilder
+from person_profiles import PROFILE_FIELDS, PersonProfileStore, submitted_candidate_fields
+from idempotency import IdempotencyConflict, IdempotencyStore, request_fingerprint
+from singleflight import SingleFlight
+from fit_scoring import JobFitScorer, combine_fit_score, fit_score_components
+from skill_matcher import MAX_JOB_SKILL_CHARS
+from skill_taxonomy import (
+    TAXONOMY_VERSION,
+    UNLISTED_ID_BASE,
+    canonical_skill_id,
+    canonical_skill_ids,
+    canonical_skill_name,
+    is_listed,
+)
+
+# CV text extraction (process pool)
+from cv_extraction import CVExtractionEngine, CV_EXTRACTOR_VERSION
+
+# Cache of extracted text / parsed resumes keyed by content hash
+from artifact_cache import ArtifactCache, EXTRACTED_TEXT, PARSED_RESUME, text_sha256
+
+# Asynchronous CV ingestion jobs
+from ingestion_jobs import IngestionJobQueue
+
+# Streaming, content-addressed CV storage
+from cv_storage import (
+    CVBlobStore,
+    CVUploadRejected,
+    ALLOWED_CV_EXTENSIONS,
+    MAX_CV_UPLOAD_BYTES
+)
 
 # Import notification service
 from notification_service import (
@@ -357,6 +395,12 @@ class SalaryRange(BaseModel):
             raise ValueError('max_amount must be >= min_amount')
         return max_amount
 
+def validate_skill_lengths(skills: Optional[list[str]]) -> Optional[list[str]]:
+    for skill in skills or []:
+        if len(skill) > MAX_JOB_SKILL_CHARS:
+            raise ValueError(f'Each required skill must be at most {MAX_JOB_SKILL_CHARS} characters')
+    return skills
+
 class JobCreate(BaseModel):
     title: str
     location: str
@@ -371,6 +415,11 @@ class JobCreate(BaseModel):
     city: Optional[str] = None  # Mandatory for Onsite/Hybrid
     notice_period_days: Optional[int] = Field(None, ge=0)  # Notice period in days
     
+    @field_validator('required_skills')
+    @classmethod
+    def validate_required_skills(cls, required_skills):
+        return validate_skill_lengths(required_skills)
+    
     @field_validator('city')
     @classmethod
     def validate_city(cls, city, info):
@@ -400,6 +449,11 @@ class JobUpdate(BaseModel):
     status: Optional[Literal["Draft", "Active", "Closed"]] = None
     city: Optional[str] = None
     notice_period_days: Optional[int] = None
+    
+    @field_validator('required_skills')
+    @classmethod
+    def validate_required_skills(cls, required_skills):
+        return validate_skill_lengths(required_skills)
 
 class JobResponse(BaseModel):
     job_id: str
@@ -428,6 +482,8 @@ class ParsedResume(BaseModel):
     experience: list[dict] = []
     education: list[dict] = []
     summary: Optional[str] = None
+    parse_source: Optional[str] = None  # "local" (rule-based fast path) or "ai"
+    parse_confidence: Optional[float] = None
 
 class CandidateStory(BaseModel):
     headline: str = "Candidate Profile"
@@ -448,6 +504,9 @@ class CandidateCreate(BaseModel):
     education: list[dict] = []
     summary: Optional[str] = None
 
+class CandidateSubmit(BaseModel):
+    job_id: str
+
 class CandidateUpdate(BaseModel):
     name: Optional[str] = None
     current_role: Optional[str] = None
@@ -476,6 +535,7 @@ class CandidateResponse(BaseModel):
     status: str
     created_at: str
     created_by: str
+    person_id: Optional[str] = None
 
 # Phase 5: Review Workflow Models
 class ReviewAction(str):
@@ -763,130 +823,223 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 UPLOAD_DIR = Path("/app/backend/uploads")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# Content-addressed CV blobs; /api/uploads/<name> URLs resolve through aliases
+cv_blob_store = CVBlobStore(db, UPLOAD_DIR)
+
+# Derived CV artifacts (extracted text, parsed resume) reused across identical uploads
+artifact_cache = ArtifactCache(
+    db,
+    ttl_days=int(os.environ.get('CV_ARTIFACT_CACHE_TTL_DAYS', '30')),
+    max_entries=int(os.environ.get('CV_ARTIFACT_CACHE_MAX_ENTRIES', '50000'))
+)
+
+# Which candidate records (across a client's jobs) are the same person - used by /submit
+person_profiles = PersonProfileStore(db)
+
+def parsed_resume_from_candidate(candidate: dict, cv_version: Optional[dict]) -> ParsedResume:
+    parsed = {field: candidate[field] for field in PROFILE_FIELDS if candidate.get(field) is not None}
+    return ParsedResume(
+        **parsed,
+        parse_source=(cv_version or {}).get("parse_source"),
+        parse_confidence=(cv_version or {}).get("parse_confidence")
+    )
+
+async def alias_cv_for_candidate(file_url: str, content_hash: Optional[str], candidate_id: str) -> Optional[str]:
+    """Give a candidate its own upload name for an existing CV file; returns its URL"""
+    public_name = f"{candidate_id}{Path(file_url).suffix}"
+    if content_hash and await cv_blob_store.add_alias(public_name, content_hash):
+        return f"/api/uploads/{public_name}"
+    # Pre-dedup file (no blob yet) - copy it into the store under the new name
+    cv_path, _ = await cv_blob_store.resolve(file_url)
+    if cv_path is None:
+        return None
+    src = await asyncio.to_thread(open, cv_path, "rb")
+    try:
+        stored = await cv_blob_store.store_stream(src, public_name, public_name)
+    except CVUploadRejected as e:
+        print(f"[DEBUG] Could not copy CV {file_url} for {candidate_id}: {e.detail}")
+        return None
+    finally:
+        await asyncio.to_thread(src.close)
+    return stored["url"]
+
+# Retried uploads / submissions carrying the same Idempotency-Key replay the first response
+idempotency_store = IdempotencyStore.from_env(db)
+
+async def run_idempotent(idempotency_key: Optional[str], scope: str, fingerprint: str, current_user: dict, handler):
+    """
+    Run `handler()` once per Idempotency-Key. Without a key the request runs as
+    before; with one, a retry returns the stored response (marked with an
+    `Idempotent-Replayed: true` header). Failed requests release the key.
+    """
+    if idempotency_key is None:
+        return await handler()
+
+    owner = current_user.get("user_id", current_user["email"])
+    try:
+        replay = await idempotency_store.begin(scope, owner, idempotency_key, fingerprint)
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    if replay is not None:
+        print(f"[DEBUG] Idempotent replay of {scope} for key {idempotency_key[:40]}")
+        return JSONResponse(
+            status_code=replay["status_code"],
+            content=replay["body"],
+            headers={"Idempotent-Replayed": "true"}
+        )
+
+    try:
+        result = await handler()
+    except BaseException:
+        await idempotency_store.release(scope, owner, idempotency_key)
+        raise
+
+    if isinstance(result, JSONResponse):
+        await idempotency_store.complete(scope, owner, idempotency_key, result.status_code, json.loads(result.body))
+    else:
+        await idempotency_store.complete(scope, owner, idempotency_key, status.HTTP_200_OK, jsonable_encoder(result))
+    return result
+
 async def save_cv_file(file: UploadFile, candidate_id: str) -> str:
-    """Save uploaded CV file and return URL"""
+    """Stream uploaded CV file into the deduplicating blob store and return URL"""
     file_extension = Path(file.filename).suffix
     filename = f"{candidate_id}{file_extension}"
-    file_path = UPLOAD_DIR / filename
     
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+    try:
+        stored = await cv_blob_store.store_upload(file, filename)
+    except CVUploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     
-    return f"/api/uploads/{filename}"
+    if stored["deduplicated"]:
+        print(f"[DEBUG] CV {filename} deduplicated against blob {stored['sha256'][:12]}")
+    return stored["url"]
 
 
-async def extract_text_from_cv(file: UploadFile) -> str:
-    """Extract text from CV file (PDF, DOCX, or plain text)"""
-    await file.seek(0)
-    file_content = await file.read()
-    filename = file.filename.lower()
-    
-    extracted_text = ""
-    
-    try:
-        if filename.endswith('.pdf'):
-            # Extract text from PDF using pdfplumber
-            with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        extracted_text += page_text + "\n"
-            print(f"[DEBUG] Extracted {len(extracted_text)} chars from PDF")
-            
-        elif filename.endswith('.docx'):
-            # Extract text from DOCX
-            doc = DocxDocument(io.BytesIO(file_content))
-            for paragraph in doc.paragraphs:
-                extracted_text += paragraph.text + "\n"
-            # Also extract from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        extracted_text += cell.text + " "
-                    extracted_text += "\n"
-            print(f"[DEBUG] Extracted {len(extracted_text)} chars from DOCX")
-            
-        elif filename.endswith('.doc'):
-            # For .doc files, try basic decoding
-            try:
-                extracted_text = file_content.decode('utf-8', errors='ignore')
-            except:
-                extracted_text = file_content.decode('latin-1', errors='ignore')
-            print(f"[DEBUG] Extracted {len(extracted_text)} chars from DOC (basic)")
-            
-        elif filename.endswith(('.txt', '.rtf')):
-            # Plain text files
-            extracted_text = file_content.decode('utf-8', errors='ignore')
-            print(f"[DEBUG] Extracted {len(extracted_text)} chars from text file")
-            
-        else:
-            # Try UTF-8 decoding as fallback
-            extracted_text = file_content.decode('utf-8', errors='ignore')
-            print(f"[DEBUG] Fallback text extraction: {len(extracted_text)} chars")
-    
-    except Exception as e:
-        print(f"[ERROR] Text extraction failed: {e}")
-        extracted_text = f"CV Upload - {file.filename}"
-    
-    # Clean up extracted text
-    if extracted_text:
-        # Remove excessive whitespace but preserve structure
-        extracted_text = re.sub(r'\n{3,}', '\n\n', extracted_text)
-        extracted_text = re.sub(r' {2,}', ' ', extracted_text)
-        extracted_text = extracted_text.strip()
-    
-    return extracted_text if extracted_text else f"CV Upload - {file.filename}"
+# CV text extraction runs in a process pool (configured via CV_EXTRACTION_* env vars)
+cv_extraction_engine = CVExtractionEngine.from_env()
 
-def redact_text(text: str) -> str:
-    """Redact personal information from text"""
-    # Email redaction
-    text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '[EMAIL REDACTED]', text)
-    
-    # Phone redaction (various formats including short forms)
-    text = re.sub(r'\b(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3,4}[-.\s]?\d{4}\b', '[PHONE REDACTED]', text)
-    text = re.sub(r'\b\d{3}-\d{4}\b', '[PHONE REDACTED]', text)  # Short format like 555-1234
-    
-    # LinkedIn URLs
-    text = re.sub(r'https?://(www\.)?linkedin\.com/[^\s]+', '[LINKEDIN REDACTED]', text)
+# The parser only reads the first LLM_CV_PARSE_PROMPT_TOKENS worth of CV text, so PDFs are
+# extracted up to this budget (or page count) before parsing; 0 disables it
+CV_EXTRACTION_PREFIX_CHARS = int(os.environ.get('CV_EXTRACTION_PREFIX_CHARS', '8000'))
+CV_EXTRACTION_PREFIX_PAGES = int(os.environ.get('CV_EXTRACTION_PREFIX_PAGES', '0'))
+
+async def extract_text_from_cv_file(file_path: Path, filename: str, content_hash: Optional[str] = None) -> str:
+    """Extract text from a saved CV file without blocking the event loop (cached by content hash)"""
+    if content_hash:
+        cached = await artifact_cache.get(EXTRACTED_TEXT, content_hash, CV_EXTRACTOR_VERSION)
+        if cached:
+            print(f"[DEBUG] Extracted text cache hit for {filename}")
+            return cached["text"]
     
-    # Generic URLs (potential personal sites)
-    text = re.sub(r'https?://[^\s]+', '[URL REDACTED]', text)
+    extracted_text = await cv_extraction_engine.extract(file_path, filename)
+    print(f"[DEBUG] Extracted {len(extracted_text)} chars from {filename}")
     
-    return text
+    # Don't cache the filename placeholder returned when extraction fails
+    if content_hash and extracted_text != f"CV Upload - {filename}":
+        await artifact_cache.put(EXTRACTED_TEXT, content_hash, CV_EXTRACTOR_VERSION, {"text": extracted_text})
+    return extracted_text
+
+async def extract_cv_text_for_parsing(file_path: Path, filename: str, content_hash: Optional[str] = None) -> tuple[str, bool]:
+    """
+    Text for the parse stage; returns (text, complete).
+    PDFs stop at the prefix budget - when the text is incomplete the caller
+    finishes full extraction in the background with schedule_cv_text_completion.
+    """
+    prefix_enabled = CV_EXTRACTION_PREFIX_CHARS > 0 or CV_EXTRACTION_PREFIX_PAGES > 0
+    if not prefix_enabled or not filename.lower().endswith('.pdf'):
+        return await extract_text_from_cv_file(file_path, filename, content_hash), True
+    
+    if content_hash:
+        cached = await artifact_cache.get(EXTRACTED_TEXT, content_hash, CV_EXTRACTOR_VERSION)
+        if cached:
+            print(f"[DEBUG] Extracted text cache hit for {filename}")
+            return cached["text"], True
+    
+    extracted_text, complete = await cv_extraction_engine.extract_prefix(
+        file_path,
+        filename,
+        max_chars=CV_EXTRACTION_PREFIX_CHARS or None,
+        max_pages=CV_EXTRACTION_PREFIX_PAGES or None
+    )
+    print(f"[DEBUG] Extracted {len(extracted_text)} chars from {filename} (complete={complete})")
+    if complete and content_hash and extracted_text != f"CV Upload - {filename}":
+        await artifact_cache.put(EXTRACTED_TEXT, content_hash, CV_EXTRACTOR_VERSION, {"text": extracted_text})
+    return extracted_text, complete
+
+# Background full-text extractions keyed by candidate_id (keeps task references alive)
+cv_text_completion_tasks: dict = {}
+
+async def _complete_cv_text(candidate_id: str, cv_url: str, filename: str):
+    cv_path, content_hash = await cv_blob_store.resolve(cv_url)
+    if cv_path is None:
+        return
+    full_text = await extract_text_from_cv_file(cv_path, filename, content_hash)
+    # Only update if the candidate still points at this CV (it may have been replaced meanwhile)
+    await db.candidates.update_one(
+        {"candidate_id": candidate_id, "cv_file_url": cv_url},
+        {"$set": {
+            "cv_text_original": full_text,
+            "cv_redaction_spans": find_pii_spans(full_text),
+            "cv_redaction_version": REDACTION_VERSION,
+            "cv_text_complete": True
+        }}
+    )
+    print(f"[DEBUG] Completed full CV text for {candidate_id}: {len(full_text)} chars")
+
+def schedule_cv_text_completion(candidate_id: str, cv_url: str, filename: str):
+    """Finish full-text extraction for a candidate created from a PDF prefix"""
+    if candidate_id in cv_text_completion_tasks:
+        return
+    task = asyncio.create_task(_complete_cv_text(candidate_id, cv_url, filename))
+    cv_text_completion_tasks[candidate_id] = task
+    
+    def _done(finished: asyncio.Task):
+        cv_text_completion_tasks.pop(candidate_id, None)
+        if not finished.cancelled() and finished.exception():
+            print(f"[ERROR] Full CV text extraction failed for {candidate_id}: {finished.exception()}")
+    task.add_done_callback(_done)
+
+def redacted_cv_text(candidate: dict) -> str:
+    """Render the redacted CV view from the original text and stored PII spans"""
+    original = candidate.get("cv_text_original") or ""
+    spans = candidate.get("cv_redaction_spans")
+    if spans is not None and candidate.get("cv_redaction_version") == REDACTION_VERSION:
+        return render_redacted(original, spans)
+    if spans is None and candidate.get("cv_text_redacted") is not None:
+        # Candidates created before span storage keep their stored copy
+        return candidate["cv_text_redacted"]
+    return redact_text(original)
+
+# Shared, connection-pooled LLM client (created at startup, closed on shutdown)
+llm_client = LLMClient.from_env()
+
+def llm_api_key() -> Optional[str]:
+    """EMERGENT_LLM_KEY, or a placeholder when LLM_BASE_URL points at a keyless (mock) endpoint"""
+    return os.environ.get('EMERGENT_LLM_KEY') or ("mock" if llm_client.base_url else None)
 
 async def call_openai_directly(system_prompt: str, user_prompt: str, api_key: str) -> str:
-    """Call OpenAI API directly using the official SDK"""
+    """
+    Call OpenAI API through the shared pooled client. Slow calls are hedged and
+    hung ones time out (LLM_HEDGE_* / LLM_CALL_TIMEOUT_SECONDS) - the error
+    sends callers to their fallback ParsedResume / CandidateStory.
+    """
     try:
-        client = AsyncOpenAI(api_key=api_key)
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=2000
-        )
-        return response.choices[0].message.content
+        return await llm_client.chat(system_prompt, user_prompt, api_key=api_key)
     except Exception as e:
         raise Exception(f"OpenAI API call failed: {str(e)}")
 
-async def parse_cv_with_ai(cv_text: str, existing_data: dict = None) -> ParsedResume:
-    """Parse CV using RecruitAssist AI with enhanced extraction"""
-    llm_key = os.environ.get('EMERGENT_LLM_KEY')
-    if not llm_key:
-        # Return fallback data if no LLM key
-        if existing_data:
-            return ParsedResume(**existing_data)
-        return ParsedResume(
-            name="CV Upload",
-            summary="AI parsing unavailable - please edit manually"
-        )
-    
-    try:
-        # Enhanced RecruitAssist AI System Prompt
-        system_prompt = """You are an expert CV/Resume parser. Extract ALL information from the resume text.
+# Bump whenever the CV parsing prompt or post-processing changes (invalidates cached parses)
+PARSE_PROMPT_VERSION = "2"
+
+# Token budgets for the CV parse / story prompts (LLM_*_PROMPT_TOKENS env vars)
+prompt_builder = PromptBuilder.from_env(llm_client.model)
+
+# Rule-based parser for well-structured CVs; the LLM is only called below this confidence
+LOCAL_CV_PARSE = os.environ.get('CV_LOCAL_PARSE', 'true').lower() == 'true'
+LOCAL_CV_PARSE_MIN_CONFIDENCE = float(os.environ.get('CV_LOCAL_PARSE_MIN_CONFIDENCE', '0.8'))
+
+# RecruitAssist AI CV parsing system prompt
+CV_PARSE_SYSTEM_PROMPT = """You are an expert CV/Resume parser. Extract ALL information from the resume text.
 
 CRITICAL CONTACT EXTRACTION - DO NOT MISS:
 1. EMAIL: Look for @ symbol anywhere in the text (e.g., name@gmail.com, user@company.co.in)
@@ -940,18 +1093,20 @@ RULES:
 6. DO NOT use null values
 7. Return ONLY the JSON, no markdown, no explanations"""
 
-        # Use more CV text for better extraction (increased to 6000 chars)
-        cv_text_to_use = cv_text[:6000] if len(cv_text) > 6000 else cv_text
-        
-        # Pre-extract contact info using regex as backup
-        email_match = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', cv_text)
-        phone_match = re.search(r'(?:\+91[-\s]?)?(?:\d{10}|\d{5}[-\s]?\d{5}|\(\d{3}\)\s?\d{3}[-\s]?\d{4})', cv_text)
-        linkedin_match = re.search(r'linkedin\.com/in/[a-zA-Z0-9-]+', cv_text)
-        
-        backup_email = email_match.group() if email_match else ""
-        backup_phone = phone_match.group() if phone_match else ""
-        backup_linkedin = f"https://{linkedin_match.group()}" if linkedin_match else ""
-        
+
+def _build_cv_parse_prompt(cv_text: str, job_requirements: str = "") -> tuple[str, dict]:
+    """
+    CV parsing user prompt plus regex-detected contact details used as a backup.
+    The CV text is fitted to the parse token budget; `job_requirements` is
+    appended (within the same budget) for the combined parse + story call.
+    """
+    # Pre-extract contact info using regex as backup
+    backups = extract_contact_details(cv_text)
+    backup_email = backups["email"]
+    backup_phone = backups["phone"]
+    backup_linkedin = backups["linkedin"]
+    
+    def render(resume_text: str) -> str:
         prompt = f"""Extract ALL information from this resume. Pay special attention to contact details.
 
 PRE-DETECTED CONTACT INFO (verify and include if correct):
@@ -961,16 +1116,110 @@ PRE-DETECTED CONTACT INFO (verify and include if correct):
 
 RESUME TEXT:
 ---
-{cv_text_to_use}
+{resume_text}
 ---
 
 Parse the resume thoroughly and return ONLY valid JSON. Include the contact info above if it looks correct."""
+        return prompt + "\n\n" + job_requirements if job_requirements else prompt
+    
+    # Most relevant CV sections that fit next to the fixed prompt text
+    cv_text_to_use = prompt_builder.fit_cv_text(cv_text, reserved_tokens=prompt_builder.count(render("")))
+    prompt = render(cv_text_to_use)
+    kind = "combined" if job_requirements else "cv_parse"
+    prompt_tokens = prompt_builder.record(kind, prompt)
+    print(f"[DEBUG] {kind} prompt: {prompt_tokens} tokens ({len(cv_text_to_use)}/{len(cv_text)} CV chars)")
+    return prompt, backups
+
+
+def _normalize_parsed_resume(parsed_data: dict, backups: dict) -> ParsedResume:
+    """Fill nulls, apply regex contact backups and dedupe experience in a raw AI parse"""
+    # Handle null values
+    for key in ['name', 'current_role', 'email', 'phone', 'linkedin', 'summary']:
+        if parsed_data.get(key) is None:
+            parsed_data[key] = "" if key != 'name' else "Candidate"
+    
+    # Use regex backup for contact info if AI missed it
+    if not parsed_data.get('email') and backups['email']:
+        parsed_data['email'] = backups['email']
+        print(f"[DEBUG] Using regex backup email: {backups['email']}")
+    if not parsed_data.get('phone') and backups['phone']:
+        parsed_data['phone'] = backups['phone']
+        print(f"[DEBUG] Using regex backup phone: {backups['phone']}")
+    if not parsed_data.get('linkedin') and backups['linkedin']:
+        parsed_data['linkedin'] = backups['linkedin']
+        print(f"[DEBUG] Using regex backup linkedin: {backups['linkedin']}")
+    
+    # Ensure lists are not None
+    for key in ['skills', 'experience', 'education']:
+        if parsed_data.get(key) is None:
+            parsed_data[key] = []
+    
+    # Deduplicate experience entries by company name
+    if parsed_data.get('experience'):
+        seen_companies = {}
+        deduped_experience = []
+        for exp in parsed_data['experience']:
+            company = exp.get('company', '').lower().strip()
+            if company and company not in seen_companies:
+                seen_companies[company] = True
+                deduped_experience.append(exp)
+            elif company:
+                print(f"[DEBUG] Deduped duplicate company: {exp.get('company')}")
+        parsed_data['experience'] = deduped_experience
+    
+    return ParsedResume(**parsed_data)
+
+
+def parse_cv_locally_if_confident(cv_text: str) -> Optional[ParsedResume]:
+    """Rule-based parse of a well-structured CV, or None when the LLM should parse it"""
+    if not LOCAL_CV_PARSE:
+        return None
+    try:
+        parsed_data, confidence = parse_cv_locally(cv_text)
+    except Exception as e:
+        print(f"[ERROR] Local CV parse failed: {e}")
+        return None
+    print(f"[DEBUG] Local CV parse confidence {confidence:.2f} (min {LOCAL_CV_PARSE_MIN_CONFIDENCE})")
+    if confidence < LOCAL_CV_PARSE_MIN_CONFIDENCE:
+        return None
+    parsed_resume = _normalize_parsed_resume(parsed_data, extract_contact_details(cv_text))
+    parsed_resume.parse_source = "local"
+    parsed_resume.parse_confidence = confidence
+    return parsed_resume
+
+
+async def parse_cv_with_ai(cv_text: str, existing_data: dict = None) -> ParsedResume:
+    """Parse CV using RecruitAssist AI with enhanced extraction"""
+    # Templated CVs with clear sections are parsed without the LLM
+    local_resume = parse_cv_locally_if_confident(cv_text)
+    if local_resume:
+        return local_resume
+    
+    llm_key = llm_api_key()
+    if not llm_key:
+        # Return fallback data if no LLM key
+        if existing_data:
+            return ParsedResume(**existing_data)
+        return ParsedResume(
+            name="CV Upload",
+            summary="AI parsing unavailable - please edit manually"
+        )
+    
+    # Byte-identical CV text was already parsed - skip the LLM call
+    cv_text_hash = text_sha256(cv_text)
+    cached = await artifact_cache.get(PARSED_RESUME, cv_text_hash, PARSE_PROMPT_VERSION)
+    if cached:
+        print(f"[DEBUG] Parsed resume cache hit for text {cv_text_hash[:12]}")
+        return ParsedResume(**cached)
+    
+    try:
+        prompt, backups = _build_cv_parse_prompt(cv_text)
         
         print(f"[DEBUG] Parsing CV with {len(cv_text)} chars")
-        print(f"[DEBUG] Regex backup - Email: {backup_email}, Phone: {backup_phone}")
+        print(f"[DEBUG] Regex backup - Email: {backups['email']}, Phone: {backups['phone']}")
         
         # Use OpenAI SDK directly
-        response = await call_openai_directly(system_prompt, prompt, llm_key)
+        response = await call_openai_directly(CV_PARSE_SYSTEM_PROMPT, prompt, llm_key)
         
         print(f"[DEBUG] AI Response for parsing: {response[:800]}")
         
@@ -982,41 +1231,10 @@ Parse the resume thoroughly and return ONLY valid JSON. Include the contact info
             print(f"[DEBUG] Email: {parsed_data.get('email')}, Phone: {parsed_data.get('phone')}")
             print(f"[DEBUG] Skills count: {len(parsed_data.get('skills', []))}")
             
-            # Handle null values
-            for key in ['name', 'current_role', 'email', 'phone', 'linkedin', 'summary']:
-                if parsed_data.get(key) is None:
-                    parsed_data[key] = "" if key != 'name' else "Candidate"
-            
-            # Use regex backup for contact info if AI missed it
-            if not parsed_data.get('email') and backup_email:
-                parsed_data['email'] = backup_email
-                print(f"[DEBUG] Using regex backup email: {backup_email}")
-            if not parsed_data.get('phone') and backup_phone:
-                parsed_data['phone'] = backup_phone
-                print(f"[DEBUG] Using regex backup phone: {backup_phone}")
-            if not parsed_data.get('linkedin') and backup_linkedin:
-                parsed_data['linkedin'] = backup_linkedin
-                print(f"[DEBUG] Using regex backup linkedin: {backup_linkedin}")
-            
-            # Ensure lists are not None
-            for key in ['skills', 'experience', 'education']:
-                if parsed_data.get(key) is None:
-                    parsed_data[key] = []
-            
-            # Deduplicate experience entries by company name
-            if parsed_data.get('experience'):
-                seen_companies = {}
-                deduped_experience = []
-                for exp in parsed_data['experience']:
-                    company = exp.get('company', '').lower().strip()
-                    if company and company not in seen_companies:
-                        seen_companies[company] = True
-                        deduped_experience.append(exp)
-                    elif company:
-                        print(f"[DEBUG] Deduped duplicate company: {exp.get('company')}")
-                parsed_data['experience'] = deduped_experience
-            
-            return ParsedResume(**parsed_data)
+            parsed_resume = _normalize_parsed_resume(parsed_data, backups)
+            parsed_resume.parse_source = "ai"
+            await artifact_cache.put(PARSED_RESUME, cv_text_hash, PARSE_PROMPT_VERSION, parsed_resume.model_dump())
+            return parsed_resume
         else:
             raise ValueError("No JSON found in response")
     except Exception as e:
@@ -1031,23 +1249,8 @@ Parse the resume thoroughly and return ONLY valid JSON. Include the contact info
             summary="AI parsing failed - please edit manually"
         )
 
-async def generate_candidate_story(candidate_data: dict, job_data: dict) -> CandidateStory:
-    """Generate AI candidate story using RecruitAssist AI with accurate scoring"""
-    llm_key = os.environ.get('EMERGENT_LLM_KEY')
-    if not llm_key:
-        # Return fallback story if no LLM key
-        return CandidateStory(
-            headline=f"Candidate for {job_data.get('title', 'Position')}",
-            summary="AI story generation unavailable - LLM key not configured",
-            timeline=[],
-            skills=candidate_data.get('skills', []),
-            fit_score=50,
-            highlights=["Manual review recommended"]
-        )
-    
-    try:
-        # Enhanced RecruitAssist AI System Prompt for Story Generation
-        system_prompt = """You are an expert recruiter analyzing candidate-job fit. Generate an ACCURATE candidate story.
+# RecruitAssist AI candidate story system prompt
+CANDIDATE_STORY_SYSTEM_PROMPT = """You are an expert recruiter analyzing candidate-job fit. Generate an ACCURATE candidate story.
 
 CRITICAL RULES - READ CAREFULLY:
 
@@ -1097,68 +1300,278 @@ Return ONLY this JSON structure:
 
 IMPORTANT: If candidate is from a different domain than the job, the fit_score should be LOW (15-35). Do NOT try to make them seem like a fit."""
 
-        # Build comprehensive candidate data
-        experience_list = candidate_data.get('experience', [])
-        essential_candidate_data = {
-            "name": candidate_data.get('name', ''),
-            "current_role": candidate_data.get('current_role', ''),
-            "skills": candidate_data.get('skills', []),
-            "summary": candidate_data.get('summary', ''),
-            "experience": [
-                {
-                    "role": exp.get('role', ''),
-                    "company": exp.get('company', ''),
-                    "duration": exp.get('duration', ''),
-                    "achievements": exp.get('achievements', [])
-                }
-                for exp in experience_list[:7]
-            ],
-            "education": candidate_data.get('education', [])[:5]
-        }
-        
-        # Get job requirements
-        job_skills = job_data.get('required_skills', [])
-        exp_range = job_data.get('experience_range', {})
-        
-        # Determine job domain keywords
-        job_title = job_data.get('title', 'Position').lower()
-        job_domain_keywords = []
-        if any(x in job_title for x in ['qa', 'test', 'quality']):
-            job_domain_keywords = ['testing', 'qa', 'test automation', 'selenium', 'manual testing', 'bug', 'defect']
-        elif any(x in job_title for x in ['developer', 'engineer', 'programmer']):
-            job_domain_keywords = ['development', 'coding', 'programming', 'software', 'api', 'backend', 'frontend']
-        elif any(x in job_title for x in ['analyst', 'data']):
-            job_domain_keywords = ['analysis', 'data', 'analytics', 'reporting', 'sql', 'excel']
-        
-        prompt = f'''Analyze this candidate for the job and generate an HONEST story.
 
-CANDIDATE DATA:
-{json.dumps(essential_candidate_data, indent=2)}
+def _story_candidate_data(candidate_data: dict) -> dict:
+    """Parsed candidate fields the story prompt draws on (fitted to the token budget when built)"""
+    return {
+        "name": candidate_data.get('name', ''),
+        "current_role": candidate_data.get('current_role', ''),
+        "skills": candidate_data.get('skills', []),
+        "summary": candidate_data.get('summary', ''),
+        "experience": [
+            {
+                "role": exp.get('role', ''),
+                "company": exp.get('company', ''),
+                "duration": exp.get('duration', ''),
+                "achievements": exp.get('achievements', [])
+            }
+            for exp in candidate_data.get('experience', [])
+        ],
+        "education": candidate_data.get('education', [])
+    }
+
 
-JOB REQUIREMENTS:
-- Title: {job_data.get('title', 'Position')}
-- Description: {job_data.get('description', '')[:1500]}
+def _build_story_job_requirements(candidate_data: dict, job_data: dict) -> str:
+    """Job requirements and scoring checklist section of the story prompt"""
+    # Normalized skills, domain and summarized description are precomputed per job
+    digest = job_digest_for(job_data)
+    job_title = digest['title']
+    job_skills = digest['required_skills']
+    exp_range = digest['experience_range']
+    
+    return f'''JOB REQUIREMENTS:
+- Title: {job_title}
+- Description: {digest['description_summary']}
 - Required Skills: {', '.join(job_skills) if job_skills else 'Not specified'}
-- Experience Required: {exp_range.get('min_years', 0)}-{exp_range.get('max_years', 10)} years
-- Domain Keywords: {', '.join(job_domain_keywords)}
+- Experience Required: {exp_range['min_years']}-{exp_range['max_years']} years
+- Domain Keywords: {', '.join(digest['domain_keywords'])}
 
 SCORING CHECKLIST:
-1. Is candidate's current role in the same domain as "{job_data.get('title', '')}"? 
+1. Is candidate's current role in the same domain as "{job_title}"? 
    - If NO (different domain): Start with base score of 20-30
    - If YES (same domain): Start with base score of 50-60
 2. How many required skills does candidate have? Add 1-2 points per matching skill
 3. Does experience level match? Adjust +/- 5-10 points
 
 CANDIDATE'S DOMAIN: Based on their current role "{candidate_data.get('current_role', '')}", what domain are they in?
-JOB'S DOMAIN: Based on title "{job_data.get('title', '')}", what domain is this job?
+JOB'S DOMAIN: Based on title "{job_title}", what domain is this job?
 
 If domains are DIFFERENT (e.g., Risk/Analytics vs QA Testing), fit_score should be 15-35%.
 Do NOT pretend they are transitioning or a good fit if they are not.
 
 Generate ACCURATE JSON response.'''
+
+
+def _build_story_prompt(candidate_data: dict, job_data: dict) -> str:
+    """Full user prompt for story generation, fitted to the story token budget"""
+    intro = "Analyze this candidate for the job and generate an HONEST story.\n\nCANDIDATE DATA:\n"
+    job_requirements = _build_story_job_requirements(candidate_data, job_data)
+    digest = job_digest_for(job_data)
+    essential_candidate_data = prompt_builder.fit_story_candidate_data(
+        _story_candidate_data(candidate_data),
+        relevant_terms=digest['required_skills'] + digest['domain_keywords'],
+        reserved_tokens=prompt_builder.count(intro + "\n\n" + job_requirements)
+    )
+    prompt = intro + json.dumps(essential_candidate_data, indent=2) + "\n\n" + job_requirements
+    prompt_tokens = prompt_builder.record("story", prompt)
+    print(f"[DEBUG] story prompt: {prompt_tokens} tokens")
+    return prompt
+
+
+def _normalize_candidate_story(story_data: dict, candidate_data: dict, job_data: dict) -> CandidateStory:
+    """Dedupe the timeline and fill any fields the AI left empty"""
+    # Deduplicate timeline entries by company name
+    if story_data.get('timeline'):
+        seen_companies = {}
+        deduped_timeline = []
+        for entry in story_data['timeline']:
+            company = entry.get('company', '').lower().strip()
+            if company and company not in seen_companies:
+                seen_companies[company] = True
+                deduped_timeline.append(entry)
+            elif company:
+                print(f"[DEBUG] Deduped duplicate timeline company: {entry.get('company')}")
+        story_data['timeline'] = deduped_timeline
+    
+    # Validate fit_score - only override if clearly wrong
+    ai_fit_score = story_data.get('fit_score')
+    if ai_fit_score is None or ai_fit_score == 0:
+        # Calculate our own fit score
+        print("[DEBUG] AI didn't provide fit_score, calculating...")
+        story_data['fit_score'] = calculate_fit_score(candidate_data, job_data)
+    
+    # Ensure all fields have values
+    if not story_data.get('headline'):
+        story_data['headline'] = f"{candidate_data.get('name', 'Candidate')} - {candidate_data.get('current_role', 'Professional')}"
+    if not story_data.get('summary'):
+        story_data['summary'] = candidate_data.get('summary', 'Professional candidate profile')
+    if not story_data.get('highlights'):
+        story_data['highlights'] = []
+    if not story_data.get('timeline'):
+        # Build timeline from experience if AI didn't provide it
+        seen_companies = {}
+        deduped_exp_timeline = []
+        for exp in candidate_data.get('experience', [])[:5]:
+            company = exp.get('company', '').lower().strip()
+            if company and company not in seen_companies:
+                seen_companies[company] = True
+                deduped_exp_timeline.append({
+                    "year": exp.get('duration', ''),
+                    "title": exp.get('role', ''),
+                    "company": exp.get('company', ''),
+                    "achievement": exp.get('achievements', [''])[0] if exp.get('achievements') else ''
+                })
+        story_data['timeline'] = deduped_exp_timeline
+    if not story_data.get('skills'):
+        story_data['skills'] = candidate_data.get('skills', [])[:15]
+        
+    return CandidateStory(**story_data)
+
+
+def _fallback_candidate_story(candidate_data: dict, job_data: dict) -> CandidateStory:
+    """Calculated story used when the AI call fails"""
+    fit_score = calculate_fit_score(candidate_data, job_data)
+    return CandidateStory(
+        headline=f"{candidate_data.get('name', 'Candidate')} for {job_data.get('title', 'Position')}",
+        summary=candidate_data.get('summary', 'Professional candidate - AI story generation failed'),
+        timeline=[
+            {
+                "year": exp.get('duration', ''),
+                "title": exp.get('role', ''),
+                "company": exp.get('company', ''),
+                "achievement": exp.get('achievements', [''])[0] if exp.get('achievements') else ''
+            }
+            for exp in candidate_data.get('experience', [])[:5]
+        ],
+        skills=candidate_data.get('skills', [])[:15],
+        fit_score=fit_score,
+        highlights=["Review candidate profile for details"]
+    )
+
+
+# Bump whenever the story prompt or post-processing changes (invalidates story fingerprints)
+STORY_PROMPT_VERSION = "3"
+
+
+def story_fingerprint(candidate_data: dict, job_data: dict) -> str:
+    """Hash of the canonicalized story inputs - candidate fields, job digest, prompt version and model"""
+    job_digest = job_digest_for(job_data)
+    payload = {
+        "prompt_version": STORY_PROMPT_VERSION,
+        "prompt_budget": prompt_builder.story_budget,
+        "model": llm_client.model,
+        "candidate": _story_candidate_data(candidate_data),
+        "job": {key: value for key, value in job_digest.items() if key != "source_hash"}
+    }
+    return text_sha256(json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str))
+
+
+def stored_story_if_unchanged(candidate: Optional[dict], fingerprint: str) -> Optional[CandidateStory]:
+    """The candidate's stored story when it was generated from exactly these inputs"""
+    if not candidate or not candidate.get("ai_story"):
+        return None
+    if candidate.get("story_fingerprint") != fingerprint:
+        return None
+    return CandidateStory(**candidate["ai_story"])
+
+
+async def generate_candidate_story(candidate_data: dict, job_data: dict) -> CandidateStory:
+    """Generate AI candidate story using RecruitAssist AI with accurate scoring"""
+    story, _ = await _generate_candidate_story(candidate_data, job_data)
+    return story
+
+
+async def generate_candidate_story_if_changed(
+    candidate_data: dict,
+    job_data: dict,
+    previous: dict = None,
+    force: bool = False
+) -> tuple[CandidateStory, Optional[str], bool]:
+    """
+    Generate a story unless `previous` (the stored candidate) already holds one
+    for the same inputs. Returns (story, fingerprint to store, regenerated);
+    fallback stories get no fingerprint so the next request retries the LLM.
+    """
+    fingerprint = story_fingerprint(candidate_data, job_data)
+    if not force:
+        stored_story = stored_story_if_unchanged(previous, fingerprint)
+        if stored_story:
+            print(f"[DEBUG] Story inputs unchanged ({fingerprint[:12]}) - reusing stored story")
+            return stored_story, fingerprint, False
+    story, from_llm = await _generate_candidate_story(candidate_data, job_data)
+    return story, (fingerprint if from_llm else None), True
+
+
+# Concurrent regenerations of the same candidate's story share one LLM call;
+# STORY_SINGLEFLIGHT_CROSS_WORKER=true coalesces across workers through Mongo leases
+story_flights = SingleFlight(
+    db.story_regeneration_leases
+    if os.environ.get('STORY_SINGLEFLIGHT_CROSS_WORKER', 'false').lower() == 'true' else None,
+    lease_seconds=float(os.environ.get('STORY_SINGLEFLIGHT_LEASE_SECONDS', '120'))
+)
+
+def story_flight_key(candidate: dict) -> str:
+    return f"story:{candidate['candidate_id']}:{candidate['job_id']}"
+
+
+async def regenerate_and_store_story(candidate: dict, job: dict, force: bool = False) -> dict:
+    """
+    Regenerate and persist a candidate's story unless its inputs are unchanged
+    (or `force`). Concurrent calls for the same candidate and job await one
+    shared generation. Returns {ai_story, story_fingerprint,
+    story_last_generated, regenerated}.
+    """
+    fingerprint = story_fingerprint(candidate, job)
+    if not force:
+        stored_story = stored_story_if_unchanged(candidate, fingerprint)
+        if stored_story:
+            print(f"[DEBUG] Story inputs unchanged ({fingerprint[:12]}) - reusing stored story")
+            return {
+                "ai_story": stored_story.model_dump(),
+                "story_fingerprint": fingerprint,
+                "story_last_generated": candidate.get("story_last_generated"),
+                "regenerated": False
+            }
+
+    async def regenerate() -> dict:
+        story, from_llm = await _generate_candidate_story(candidate, job)
+        return await _store_regenerated_story(candidate["candidate_id"], story, fingerprint if from_llm else None)
+
+    result, shared = await story_flights.do(story_flight_key(candidate), regenerate)
+    if shared:
+        print(f"[DEBUG] Story regeneration for {candidate['candidate_id']} joined an in-flight call")
+    return result
+
+
+async def _store_regenerated_story(candidate_id: str, story: CandidateStory, fingerprint: Optional[str]) -> dict:
+    generated_at = datetime.now(timezone.utc).isoformat()
+    await db.candidates.update_one(
+        {"candidate_id": candidate_id},
+        {
+            "$set": {
+                "ai_story": story.model_dump(),
+                "story_fingerprint": fingerprint,
+                "story_last_generated": generated_at
+            }
+        }
+    )
+    return {
+        "ai_story": story.model_dump(),
+        "story_fingerprint": fingerprint,
+        "story_last_generated": generated_at,
+        "regenerated": True
+    }
+
+
+async def _generate_candidate_story(candidate_data: dict, job_data: dict) -> tuple[CandidateStory, bool]:
+    """Story plus whether the LLM wrote it (False for the no-key and error fallbacks)"""
+    llm_key = llm_api_key()
+    if not llm_key:
+        # Return fallback story if no LLM key
+        return CandidateStory(
+            headline=f"Candidate for {job_data.get('title', 'Position')}",
+            summary="AI story generation unavailable - LLM key not configured",
+            timeline=[],
+            skills=candidate_data.get('skills', []),
+            fit_score=50,
+            highlights=["Manual review recommended"]
+        ), False
+    
+    try:
+        prompt = _build_story_prompt(candidate_data, job_data)
         
         # Use OpenAI SDK directly
-        response = await call_openai_directly(system_prompt, prompt, llm_key)
+        response = await call_openai_directly(CANDIDATE_STORY_SYSTEM_PROMPT, prompt, llm_key)
         
         print(f"[DEBUG] AI Story Response: {response[:1000]}")
         
@@ -1168,177 +1581,133 @@ Generate ACCURATE JSON response.'''
             print(f"[DEBUG] Story fit_score from AI: {story_data.get('fit_score')}")
             print(f"[DEBUG] Timeline entries: {len(story_data.get('timeline', []))}")
             
-            # Deduplicate timeline entries by company name
-            if story_data.get('timeline'):
-                seen_companies = {}
-                deduped_timeline = []
-                for entry in story_data['timeline']:
-                    company = entry.get('company', '').lower().strip()
-                    if company and company not in seen_companies:
-                        seen_companies[company] = True
-                        deduped_timeline.append(entry)
-                    elif company:
-                        print(f"[DEBUG] Deduped duplicate timeline company: {entry.get('company')}")
-                story_data['timeline'] = deduped_timeline
-            
-            # Validate fit_score - only override if clearly wrong
-            ai_fit_score = story_data.get('fit_score')
-            if ai_fit_score is None or ai_fit_score == 0:
-                # Calculate our own fit score
-                print("[DEBUG] AI didn't provide fit_score, calculating...")
-                story_data['fit_score'] = calculate_fit_score(candidate_data, job_data)
-            
-            # Ensure all fields have values
-            if not story_data.get('headline'):
-                story_data['headline'] = f"{candidate_data.get('name', 'Candidate')} - {candidate_data.get('current_role', 'Professional')}"
-            if not story_data.get('summary'):
-                story_data['summary'] = candidate_data.get('summary', 'Professional candidate profile')
-            if not story_data.get('highlights'):
-                story_data['highlights'] = []
-            if not story_data.get('timeline'):
-                # Build timeline from experience if AI didn't provide it
-                seen_companies = {}
-                deduped_exp_timeline = []
-                for exp in candidate_data.get('experience', [])[:5]:
-                    company = exp.get('company', '').lower().strip()
-                    if company and company not in seen_companies:
-                        seen_companies[company] = True
-                        deduped_exp_timeline.append({
-                            "year": exp.get('duration', ''),
-                            "title": exp.get('role', ''),
-                            "company": exp.get('company', ''),
-                            "achievement": exp.get('achievements', [''])[0] if exp.get('achievements') else ''
-                        })
-                story_data['timeline'] = deduped_exp_timeline
-            if not story_data.get('skills'):
-                story_data['skills'] = candidate_data.get('skills', [])[:15]
-                
-            return CandidateStory(**story_data)
+            return _normalize_candidate_story(story_data, candidate_data, job_data), True
         else:
             raise ValueError("No JSON found in response")
     except Exception as e:
         print(f"[ERROR] AI story generation error: {e}")
         import traceback
         print(f"[ERROR] Traceback: {traceback.format_exc()}")
-        # Return calculated story if AI fails
-        fit_score = calculate_fit_score(candidate_data, job_data)
-        return CandidateStory(
-            headline=f"{candidate_data.get('name', 'Candidate')} for {job_data.get('title', 'Position')}",
-            summary=candidate_data.get('summary', 'Professional candidate - AI story generation failed'),
-            timeline=[
-                {
-                    "year": exp.get('duration', ''),
-                    "title": exp.get('role', ''),
-                    "company": exp.get('company', ''),
-                    "achievement": exp.get('achievements', [''])[0] if exp.get('achievements') else ''
-                }
-                for exp in candidate_data.get('experience', [])[:5]
-            ],
-            skills=candidate_data.get('skills', [])[:15],
-            fit_score=fit_score,
-            highlights=["Review candidate profile for details"]
-        )
+        return _fallback_candidate_story(candidate_data, job_data), False
+
+
+# One LLM round trip returns both the parsed resume and the job-specific story
+COMBINED_PARSE_STORY = os.environ.get('CV_COMBINED_PARSE_STORY', 'true').lower() == 'true'
+
+COMBINED_PARSE_STORY_SYSTEM_PROMPT = f"""You perform TWO tasks on the same resume in a single response.
+
+=== TASK 1: CV PARSING ===
+{CV_PARSE_SYSTEM_PROMPT}
+
+=== TASK 2: CANDIDATE STORY ===
+Use ONLY the data you extracted in Task 1 as the candidate data.
+{CANDIDATE_STORY_SYSTEM_PROMPT}
+
+=== OUTPUT ===
+Return ONLY one JSON object, no markdown, no explanations:
+{{"resume": <Task 1 JSON>, "story": <Task 2 JSON>}}"""
+
+
+def _candidate_data_for_story(parsed_resume: ParsedResume, defaults: dict = None) -> dict:
+    """Story input from a parse; empty fields fall back to `defaults` (e.g. the existing candidate)"""
+    candidate_data = {
+        "name": parsed_resume.name,
+        "current_role": parsed_resume.current_role,
+        "skills": parsed_resume.skills,
+        "experience": parsed_resume.experience,
+        "education": parsed_resume.education,
+        "summary": parsed_resume.summary
+    }
+    if defaults:
+        for key, value in candidate_data.items():
+            candidate_data[key] = value or defaults.get(key, value)
+    return candidate_data
+
+
+async def parse_cv_and_generate_story(
+    cv_text: str,
+    job_data: Optional[dict],
+    story_defaults: dict = None,
+    on_stage=None,
+    force_story: bool = False
+) -> tuple[ParsedResume, CandidateStory, Optional[str]]:
+    """
+    Parse a CV and generate its story for a job; returns (parse, story, story fingerprint).
+    In combined mode a single structured prompt returns both; a cached or
+    confident local parse only needs the story call. Without job context or
+    if the combined response is unusable it falls back to parse_cv_with_ai
+    followed by generate_candidate_story.
+    `story_defaults` is the existing candidate on CV replace - it fills fields
+    the new parse lacks, and its story is kept if the story inputs are unchanged.
+    """
+    async def report_stage(stage: str):
+        if on_stage:
+            await on_stage(stage)
+    
+    llm_key = llm_api_key()
+    parsed_resume = None
+    
+    if COMBINED_PARSE_STORY and job_data and llm_key:
+        cv_text_hash = text_sha256(cv_text)
+        cached = await artifact_cache.get(PARSED_RESUME, cv_text_hash, PARSE_PROMPT_VERSION)
+        if cached:
+            # Parse already known - only the story needs the LLM
+            parsed_resume = ParsedResume(**cached)
+        else:
+            # Well-structured CV - the local fast path parses it, the LLM only writes the story
+            parsed_resume = parse_cv_locally_if_confident(cv_text)
+        if parsed_resume is None:
+            try:
+                prompt, backups = _build_cv_parse_prompt(cv_text, _build_story_job_requirements(
+                    {"current_role": "the most recent role from the resume"}, job_data
+                ))
+                response = await call_openai_directly(COMBINED_PARSE_STORY_SYSTEM_PROMPT, prompt, llm_key)
+                print(f"[DEBUG] Combined parse/story response: {response[:800]}")
+                
+                json_match = re.search(r'\{.*\}', response, re.DOTALL)
+                if not json_match:
+                    raise ValueError("No JSON found in response")
+                combined = json.loads(json_match.group())
+                if not isinstance(combined.get("resume"), dict) or not isinstance(combined.get("story"), dict):
+                    raise ValueError("Combined response missing 'resume' or 'story'")
+                
+                parsed_resume = _normalize_parsed_resume(combined["resume"], backups)
+                parsed_resume.parse_source = "ai"
+                await artifact_cache.put(PARSED_RESUME, cv_text_hash, PARSE_PROMPT_VERSION, parsed_resume.model_dump())
+                await report_stage("story")
+                candidate_data = _candidate_data_for_story(parsed_resume, story_defaults)
+                return (
+                    parsed_resume,
+                    _normalize_candidate_story(combined["story"], candidate_data, job_data),
+                    story_fingerprint(candidate_data, job_data)
+                )
+            except Exception as e:
+                print(f"[ERROR] Combined parse/story failed, falling back to two calls: {e}")
+                parsed_resume = None
+    
+    if parsed_resume is None:
+        parsed_resume = await parse_cv_with_ai(cv_text)
+    await report_stage("story")
+    candidate_data = _candidate_data_for_story(parsed_resume, story_defaults)
+    ai_story, fingerprint, _ = await generate_candidate_story_if_changed(
+        candidate_data, job_data or {}, previous=story_defaults, force=force_story
+    )
+    return parsed_resume, ai_story, fingerprint
 
 
 def calculate_fit_score(candidate_data: dict, job_data: dict) -> int:
     """Calculate fit score based on skills, experience, and role alignment"""
-    
-    # Skills Match (45% weight)
-    candidate_skills = set([s.lower().strip() for s in candidate_data.get('skills', [])])
-    job_skills = set([s.lower().strip() for s in job_data.get('required_skills', [])])
-    
-    if job_skills:
-        # Direct match
-        direct_matches = len(candidate_skills & job_skills)
-        # Partial match (check if job skill is substring of candidate skill or vice versa)
-        partial_matches = 0
-        for js in job_skills:
-            if js not in candidate_skills:
-                for cs in candidate_skills:
-                    if js in cs or cs in js:
-                        partial_matches += 0.5
-                        break
-        total_matches = direct_matches + partial_matches
-        skills_match_score = min((total_matches / len(job_skills)) * 45, 45)
-    else:
-        skills_match_score = 22  # Base score if no job skills specified
-    
-    # Experience Match (35% weight)
-    experience_list = candidate_data.get('experience', [])
-    candidate_years = len(experience_list) * 2  # Rough estimate: 2 years per position
-    
-    # Try to extract actual years from duration strings
-    total_months = 0
-    for exp in experience_list:
-        duration = exp.get('duration', '').lower()
-        if 'present' in duration or 'current' in duration:
-            total_months += 24  # Assume 2 years if current
-        elif '-' in duration:
-            try:
-                parts = duration.split('-')
-                if len(parts) == 2:
-                    # Try to parse years
-                    import re
-                    years = re.findall(r'20\d{2}|19\d{2}', duration)
-                    if len(years) >= 2:
-                        total_months += (int(years[1]) - int(years[0])) * 12
-                    else:
-                        total_months += 24
-            except:
-                total_months += 24
-        else:
-            total_months += 24
-    
-    candidate_years = max(candidate_years, total_months // 12)
-    
-    exp_range = job_data.get('experience_range', {})
-    min_years = exp_range.get('min_years', 0)
-    max_years = exp_range.get('max_years', 15)
-    
-    if min_years <= candidate_years <= max_years:
-        exp_match_score = 35
-    elif candidate_years > max_years:
-        exp_match_score = 30  # Overqualified but still good
-    elif candidate_years >= min_years * 0.7:
-        exp_match_score = 25  # Close enough
-    else:
-        exp_match_score = max((candidate_years / min_years) * 35, 10) if min_years > 0 else 20
-    
-    # Role Alignment (20% weight)
-    candidate_role = candidate_data.get('current_role', '').lower()
-    job_title = job_data.get('title', '').lower()
-    
-    # Check for keyword matches
-    job_keywords = set(job_title.replace('-', ' ').replace('/', ' ').split())
-    role_keywords = set(candidate_role.replace('-', ' ').replace('/', ' ').split())
-    
-    common_keywords = job_keywords & role_keywords
-    if common_keywords:
-        role_match_score = min(len(common_keywords) * 5 + 10, 20)
-    else:
-        # Check for related terms
-        related_terms = {
-            'developer': ['engineer', 'programmer', 'coder'],
-            'engineer': ['developer', 'architect', 'designer'],
-            'manager': ['lead', 'head', 'director', 'supervisor'],
-            'analyst': ['consultant', 'specialist', 'advisor'],
-            'designer': ['ux', 'ui', 'creative', 'artist']
-        }
-        role_match_score = 8
-        for key, synonyms in related_terms.items():
-            if key in job_title:
-                for syn in synonyms:
-                    if syn in candidate_role:
-                        role_match_score = 15
-                        break
-    
-    total_score = int(skills_match_score + exp_match_score + role_match_score)
-    final_score = min(max(total_score, 20), 100)
+    skills_match_score, exp_match_score, role_match_score = fit_score_components(candidate_data, job_data)
+    final_score = combine_fit_score(skills_match_score, exp_match_score, role_match_score)
     
     print(f"[DEBUG] Fit Score Calculation: Skills={skills_match_score:.1f}, Exp={exp_match_score:.1f}, Role={role_match_score} = {final_score}%")
     
     return final_score
 
+def skill_id_fields(skills: Optional[list]) -> dict:
+    """Canonical skill IDs stored next to the raw skill strings (candidates and jobs)"""
+    return {"skill_ids": canonical_skill_ids(skills), "skill_taxonomy_version": TAXONOMY_VERSION}
+
 def create_access_token(data: dict) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -3175,11 +3544,14 @@ async def create_job(
         "city": job_data.city,
         "notice_period_days": job_data.notice_period_days,
         "required_skills": job_data.required_skills,
+        **skill_id_fields(job_data.required_skills),
         "description": job_data.description,
         "status": job_data.status,
         "created_at": datetime.now(timezone.utc).isoformat(),
         "created_by": current_user["email"]
     }
+    # Story prompts for this job's candidates reuse the precomputed digest
+    job_doc["digest"] = build_job_digest(job_doc)
     
     await db.jobs.insert_one(job_doc)
     
@@ -3272,12 +3644,15 @@ async def list_jobs(
         if client_id:
             query["client_id"] = client_id
     
-    # Search by title or skills
+    # Search by title or skills (a known skill or synonym also matches by canonical ID)
     if search:
         query["$or"] = [
             {"title": {"$regex": search, "$options": "i"}},
             {"required_skills": {"$regex": search, "$options": "i"}}
         ]
+        search_skill_id = canonical_skill_id(search)
+        if search_skill_id is not None and is_listed(search_skill_id):
+            query["$or"].append({"skill_ids": search_skill_id})
     
     # Filter by status
     if status:
@@ -3400,6 +3775,11 @@ async def update_job(
         if hasattr(update_data["salary_range"], 'model_dump'):
             update_data["salary_range"] = update_data["salary_range"].model_dump()
     
+    if "required_skills" in update_data:
+        update_data.update(skill_id_fields(update_data["required_skills"]))
+    # Rebuild the story-prompt digest from the merged job
+    update_data["digest"] = build_job_digest({**job, **update_data})
+    
     await db.jobs.update_one(
         {"job_id": job_id},
         {"$set": update_data}
@@ -3461,7 +3841,11 @@ async def delete_job(
     candidate_count = len(candidates)
     
     for candidate in candidates:
-        # Delete CV versions
+        # Delete CV versions and release their stored files
+        cv_versions = await db.candidate_cv_versions.find({"candidate_id": candidate["candidate_id"]}).to_list(1000)
+        for cv_version in cv_versions:
+            if cv_version.get("file_url") and cv_version["file_url"] != "[HARD_DELETED]":
+                await cv_blob_store.release(cv_version["file_url"])
         await db.candidate_cv_versions.delete_many({"candidate_id": candidate["candidate_id"]})
         # Delete reviews
         await db.candidate_reviews.delete_many({"candidate_id": candidate["candidate_id"]})
@@ -3540,9 +3924,22 @@ async def close_job(
 async def upload_candidate_cv(
     job_id: str = Form(...),
     file: UploadFile = File(...),
+    async_mode: bool = Form(False),
+    idempotency_key: Optional[str] = Header(None),
     current_user: dict = Depends(get_current_user)
 ):
-    """Upload CV and create candidate with AI parsing"""
+    """
+    Upload CV and create candidate with AI parsing (async_mode=true returns 202 with an ingestion job id).
+    A retry with the same `Idempotency-Key` header returns the original response.
+    """
+    fingerprint = request_fingerprint(job_id=job_id, filename=file.filename, size=file.size, async_mode=async_mode)
+    return await run_idempotent(
+        idempotency_key, "candidates.upload", fingerprint, current_user,
+        lambda: _upload_candidate_cv(job_id, file, async_mode, current_user)
+    )
+
+
+async def _upload_candidate_cv(job_id: str, file: UploadFile, async_mode: bool, current_user: dict):
     # Check permission to upload CV
     if current_user["role"] == "client_user":
         has_permission = await check_permission(current_user, "can_upload_cv", current_user.get("client_id"))
@@ -3571,48 +3968,93 @@ async def upload_candidate_cv(
     # Save CV file
     cv_url = await save_cv_file(file, candidate_id)
     
+    # Ingestion-job mode: return immediately, parse and story run in the worker pool
+    if async_mode:
+        ingestion_job = await ingestion_queue.enqueue(
+            payload={
+                "job_id": job_id,
+                "candidate_id": candidate_id,
+                "cv_url": cv_url,
+                "source_filename": file.filename,
+                "uploaded_by": {
+                    "email": current_user["email"],
+                    "user_id": current_user.get("user_id", current_user["email"]),
+                    "role": current_user["role"]
+                }
+            },
+            created_by=current_user["email"],
+            client_id=job.get("client_id")
+        )
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "ingestion_job_id": ingestion_job["ingestion_job_id"],
+                "candidate_id": candidate_id,
+                "status": ingestion_job["status"],
+                "status_url": f"/api/ingestion-jobs/{ingestion_job['ingestion_job_id']}"
+            }
+        )
+    
+    return await ingest_candidate_cv(job, candidate_id, cv_url, file.filename, current_user)
+
+
+async def ingest_candidate_cv(
+    job: dict,
+    candidate_id: str,
+    cv_url: str,
+    source_filename: str,
+    uploaded_by: dict,
+    on_stage=None
+) -> CandidateResponse:
+    """Extract, parse and story-generate a saved CV, then create the candidate and its first CV version"""
+    async def report_stage(stage: str):
+        if on_stage:
+            await on_stage(stage)
+    
     # Extract text from CV using proper PDF/DOCX parsing
-    cv_text = await extract_text_from_cv(file)
+    await report_stage("extracting")
+    cv_path, content_hash = await cv_blob_store.resolve(cv_url)
+    if cv_path is None:
+        raise ValueError(f"CV file {cv_url} not found")
+    # Large PDFs are read only as far as the parser needs; the rest follows in the background
+    cv_text, cv_text_complete = await extract_cv_text_for_parsing(cv_path, source_filename, content_hash)
     print(f"[DEBUG] Extracted CV text length: {len(cv_text)} chars")
     print(f"[DEBUG] CV text preview: {cv_text[:500]}")
     
-    # Parse CV with AI
-    parsed_resume = await parse_cv_with_ai(cv_text)
-    
-    # Generate candidate story with full parsed data
-    candidate_data_for_story = {
-        "name": parsed_resume.name,
-        "current_role": parsed_resume.current_role,
-        "skills": parsed_resume.skills,
-        "experience": parsed_resume.experience,
-        "education": parsed_resume.education,
-        "summary": parsed_resume.summary
-    }
-    ai_story = await generate_candidate_story(candidate_data_for_story, job)
+    # Parse CV and generate the candidate story (single LLM call in combined mode)
+    await report_stage("parsing")
+    parsed_resume, ai_story, story_fp = await parse_cv_and_generate_story(cv_text, job, on_stage=report_stage)
     
     # Create candidate document
+    await report_stage("saving")
     candidate_doc = {
         "candidate_id": candidate_id,
-        "job_id": job_id,
+        "job_id": job["job_id"],
         "name": parsed_resume.name,
         "current_role": parsed_resume.current_role,
         "email": parsed_resume.email,
         "phone": parsed_resume.phone,
         "linkedin": parsed_resume.linkedin,
         "skills": parsed_resume.skills,
+        **skill_id_fields(parsed_resume.skills),
         "experience": parsed_resume.experience,
         "education": parsed_resume.education,
         "summary": parsed_resume.summary,
         "cv_file_url": cv_url,
         "cv_text_original": cv_text,
-        "cv_text_redacted": redact_text(cv_text),
+        "cv_redaction_spans": find_pii_spans(cv_text),
+        "cv_redaction_version": REDACTION_VERSION,
+        "cv_text_complete": cv_text_complete,
         "ai_story": ai_story.model_dump(),
+        "story_fingerprint": story_fp,
         "status": "NEW",
         "created_at": datetime.now(timezone.utc).isoformat(),
-        "created_by": current_user["email"]
+        "created_by": uploaded_by["email"]
     }
     
     await db.candidates.insert_one(candidate_doc)
+    if not cv_text_complete:
+        schedule_cv_text_completion(candidate_id, cv_url, source_filename)
     
     # Create initial CV version entry
     version_id = f"cv_v_{uuid.uuid4().hex[:12]}"
@@ -3621,9 +4063,10 @@ async def upload_candidate_cv(
         "candidate_id": candidate_id,
         "version_number": 1,
         "file_url": cv_url,
-        "source_filename": file.filename,
-        "uploaded_by_user_id": current_user.get("user_id", current_user["email"]),
-        "uploaded_by_email": current_user["email"],
+        "content_hash": content_hash,
+        "source_filename": source_filename,
+        "uploaded_by_user_id": uploaded_by.get("user_id", uploaded_by["email"]),
+        "uploaded_by_email": uploaded_by["email"],
         "uploaded_at": datetime.now(timezone.utc).isoformat(),
         "is_active": True,
         "ai_parsed_data": {
@@ -3639,6 +4082,8 @@ async def upload_candidate_cv(
         },
         "ai_story_json": ai_story.model_dump(),
         "fit_score": ai_story.fit_score,
+        "parse_source": parsed_resume.parse_source,
+        "parse_confidence": parsed_resume.parse_confidence,
         "deleted_at": None,
         "delete_type": None,
         "deleted_by_user_id": None
@@ -3647,7 +4092,7 @@ async def upload_candidate_cv(
     
     return CandidateResponse(
         candidate_id=candidate_id,
-        job_id=job_id,
+        job_id=job["job_id"],
         name=parsed_resume.name,
         current_role=parsed_resume.current_role,
         email=parsed_resume.email,
@@ -3661,8 +4106,254 @@ async def upload_candidate_cv(
         ai_story=ai_story,
         status="NEW",
         created_at=candidate_doc["created_at"],
-        created_by=current_user["email"]
+        created_by=uploaded_by["email"]
+    )
+
+
+async def process_ingestion_job(ingestion_job: dict, set_stage) -> dict:
+    """Ingestion worker handler - runs the upload pipeline for a queued CV"""
+    payload = ingestion_job["payload"]
+    
+    # A previous attempt may have finished before its worker died
+    existing = await db.candidates.find_one({"candidate_id": payload["candidate_id"]}, {"_id": 0, "candidate_id": 1})
+    if existing:
+        return {"candidate_id": payload["candidate_id"]}
+    
+    job = await db.jobs.find_one({"job_id": payload["job_id"]}, {"_id": 0})
+    if not job:
+        raise ValueError(f"Job {payload['job_id']} no longer exists")
+    
+    candidate = await ingest_candidate_cv(
+        job,
+        payload["candidate_id"],
+        payload["cv_url"],
+        payload["source_filename"],
+        payload["uploaded_by"],
+        on_stage=set_stage
     )
+    return {"candidate_id": candidate.candidate_id, "name": candidate.name}
+
+
+# Asynchronous ingestion workers (configured via INGESTION_* env vars)
+ingestion_queue = IngestionJobQueue(
+    db,
+    handler=process_ingestion_job,
+    concurrency=int(os.environ.get('INGESTION_WORKERS', '2')),
+    lease_seconds=int(os.environ.get('INGESTION_LEASE_SECONDS', '300')),
+    max_attempts=int(os.environ.get('INGESTION_MAX_ATTEMPTS', '3'))
+)
+
+
+@api_router.get("/ingestion-jobs/{ingestion_job_id}")
+async def get_ingestion_job(
+    ingestion_job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get status of an asynchronous CV ingestion job"""
+    ingestion_job = await ingestion_queue.get(ingestion_job_id)
+    if not ingestion_job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ingestion job not found"
+        )
+    
+    # Tenant check for client users
+    if current_user["role"] == "client_user":
+        if ingestion_job.get("client_id") != current_user["client_id"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
+            )
+    
+    return {
+        "ingestion_job_id": ingestion_job["ingestion_job_id"],
+        "status": ingestion_job["status"],
+        "current_stage": ingestion_job["current_stage"],
+        "stages": ingestion_job["stages"],
+        "candidate_id": ingestion_job["payload"]["candidate_id"],
+        "job_id": ingestion_job["payload"]["job_id"],
+        "source_filename": ingestion_job["payload"]["source_filename"],
+        "attempts": ingestion_job["attempts"],
+        "result": ingestion_job.get("result"),
+        "error": ingestion_job.get("error"),
+        "created_at": ingestion_job["created_at"],
+        "updated_at": ingestion_job["updated_at"],
+        "completed_at": ingestion_job.get("completed_at")
+    }
+
+# ============ BULK CV UPLOAD ============
+
+BULK_UPLOAD_MAX_FILES = int(os.environ.get('BULK_UPLOAD_MAX_FILES', '500'))
+
+# Process-wide cap on concurrent extraction + LLM pipelines across all bulk uploads
+bulk_ingest_semaphore = asyncio.Semaphore(int(os.environ.get('BULK_INGEST_CONCURRENCY', '8')))
+
+
+async def _collect_bulk_upload_files(files: List[UploadFile], manifest: list) -> list[dict]:
+    """Save uploaded files (expanding zip archives) and return the ones to ingest"""
+    accepted = []
+    
+    def accept(filename: str) -> Optional[dict]:
+        extension = Path(filename).suffix.lower()
+        if extension not in ALLOWED_CV_EXTENSIONS:
+            manifest.append({"filename": filename, "status": "skipped", "error": f"Unsupported file type '{extension}'"})
+            return None
+        if len(accepted) >= BULK_UPLOAD_MAX_FILES:
+            manifest.append({"filename": filename, "status": "skipped", "error": f"Batch limit of {BULK_UPLOAD_MAX_FILES} files reached"})
+            return None
+        candidate_id = f"cand_{uuid.uuid4().hex[:8]}"
+        entry = {
+            "filename": filename,
+            "candidate_id": candidate_id,
+            "cv_url": f"/api/uploads/{candidate_id}{extension}"
+        }
+        accepted.append(entry)
+        return entry
+    
+    def reject(entry: dict, error: str):
+        accepted.remove(entry)
+        manifest.append({"filename": entry["filename"], "status": "skipped", "error": error})
+    
+    for upload in files:
+        if upload.filename.lower().endswith(".zip"):
+            try:
+                archive = zipfile.ZipFile(upload.file)
+            except zipfile.BadZipFile:
+                manifest.append({"filename": upload.filename, "status": "failed", "error": "Invalid zip archive"})
+                continue
+            with archive:
+                for info in archive.infolist():
+                    member_name = Path(info.filename).name
+                    if info.is_dir() or not member_name or info.filename.startswith("__MACOSX/"):
+                        continue
+                    if info.file_size > MAX_CV_UPLOAD_BYTES:
+                        manifest.append({"filename": member_name, "status": "skipped", "error": "File too large"})
+                        continue
+                    entry = accept(member_name)
+                    if entry:
+                        try:
+                            with archive.open(info) as src:
+                                await cv_blob_store.store_stream(src, member_name, Path(entry["cv_url"]).name)
+                        except CVUploadRejected as e:
+                            reject(entry, e.detail)
+        else:
+            entry = accept(upload.filename)
+            if entry:
+                try:
+                    await cv_blob_store.store_upload(upload, Path(entry["cv_url"]).name)
+                except CVUploadRejected as e:
+                    reject(entry, e.detail)
+    
+    return accepted
+
+
+@api_router.post("/jobs/{job_id}/candidates/bulk-upload")
+async def bulk_upload_candidate_cvs(
+    job_id: str,
+    files: List[UploadFile] = File(...),
+    async_mode: bool = Form(False),
+    current_user: dict = Depends(get_current_user)
+):
+    """Upload many CVs (or zip archives of CVs) for a job and return a per-file manifest"""
+    # Check permission to upload CV
+    if current_user["role"] == "client_user":
+        has_permission = await check_permission(current_user, "can_upload_cv", current_user.get("client_id"))
+        if not has_permission:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Permission denied: can_upload_cv required"
+            )
+    elif current_user["role"] not in ["admin", "recruiter"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin/recruiter can upload candidates"
+        )
+    
+    job = await db.jobs.find_one({"job_id": job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    if current_user["role"] == "client_user" and job["client_id"] != current_user["client_id"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    manifest = []
+    accepted = await _collect_bulk_upload_files(files, manifest)
+    uploaded_by = {
+        "email": current_user["email"],
+        "user_id": current_user.get("user_id", current_user["email"]),
+        "role": current_user["role"]
+    }
+    
+    if async_mode:
+        # Hand everything to the ingestion workers and return job ids for polling
+        for entry in accepted:
+            ingestion_job = await ingestion_queue.enqueue(
+                payload={
+                    "job_id": job_id,
+                    "candidate_id": entry["candidate_id"],
+                    "cv_url": entry["cv_url"],
+                    "source_filename": entry["filename"],
+                    "uploaded_by": uploaded_by
+                },
+                created_by=current_user["email"],
+                client_id=job.get("client_id")
+            )
+            manifest.append({
+                "filename": entry["filename"],
+                "status": "queued",
+                "candidate_id": entry["candidate_id"],
+                "ingestion_job_id": ingestion_job["ingestion_job_id"]
+            })
+    else:
+        async def ingest_one(entry: dict) -> dict:
+            async with bulk_ingest_semaphore:
+                try:
+                    candidate = await ingest_candidate_cv(
+                        job, entry["candidate_id"], entry["cv_url"], entry["filename"], uploaded_by
+                    )
+                    return {
+                        "filename": entry["filename"],
+                        "status": "created",
+                        "candidate_id": candidate.candidate_id,
+                        "name": candidate.name,
+                        "fit_score": candidate.ai_story.fit_score if candidate.ai_story else None
+                    }
+                except Exception as e:
+                    print(f"[ERROR] Bulk ingestion failed for {entry['filename']}: {e}")
+                    return {"filename": entry["filename"], "status": "failed", "error": str(e)}
+        
+        manifest.extend(await asyncio.gather(*[ingest_one(entry) for entry in accepted]))
+    
+    await log_audit_event(
+        user_id=uploaded_by["user_id"],
+        user_email=current_user["email"],
+        user_role=current_user["role"],
+        action_type="CV_BULK_UPLOAD",
+        entity_type="job",
+        entity_id=job_id,
+        client_id=job.get("client_id"),
+        metadata={
+            "files_received": len(files),
+            "files_accepted": len(accepted),
+            "async_mode": async_mode
+        }
+    )
+    
+    return {
+        "job_id": job_id,
+        "total": len(manifest),
+        "created": sum(1 for m in manifest if m["status"] == "created"),
+        "queued": sum(1 for m in manifest if m["status"] == "queued"),
+        "failed": sum(1 for m in manifest if m["status"] == "failed"),
+        "skipped": sum(1 for m in manifest if m["status"] == "skipped"),
+        "files": manifest
+    }
+
 
 @api_router.post("/candidates", response_model=CandidateResponse)
 async def create_candidate_manual(
@@ -3695,7 +4386,7 @@ async def create_candidate_manual(
     candidate_id = f"cand_{uuid.uuid4().hex[:8]}"
     
     # Generate AI story
-    ai_story = await generate_candidate_story(candidate_data.model_dump(), job)
+    ai_story, story_fp, _ = await generate_candidate_story_if_changed(candidate_data.model_dump(), job)
     
     candidate_doc = {
         "candidate_id": candidate_id,
@@ -3705,11 +4396,13 @@ async def create_candidate_manual(
         "email": candidate_data.email,
         "phone": candidate_data.phone,
         "skills": candidate_data.skills,
+        **skill_id_fields(candidate_data.skills),
         "experience": candidate_data.experience,
         "education": candidate_data.education,
         "summary": candidate_data.summary,
         "cv_file_url": None,
         "ai_story": ai_story.model_dump(),
+        "story_fingerprint": story_fp,
         "status": "NEW",
         "created_at": datetime.now(timezone.utc).isoformat(),
         "created_by": current_user["email"]
@@ -3736,13 +4429,182 @@ async def create_candidate_manual(
         created_by=current_user["email"]
     )
 
+@api_router.post("/candidates/{candidate_id}/submit", response_model=CandidateResponse)
+async def submit_candidate_to_job(
+    candidate_id: str,
+    submission: CandidateSubmit,
+    idempotency_key: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Submit an existing candidate to another job. The parse and CV are reused
+    from the source candidate record - only the story is generated.
+    A retry with the same `Idempotency-Key` header returns the original response.
+    """
+    fingerprint = request_fingerprint(job_id=submission.job_id)
+    return await run_idempotent(
+        idempotency_key, f"candidates.submit:{candidate_id}", fingerprint, current_user,
+        lambda: _submit_candidate_to_job(candidate_id, submission, current_user)
+    )
+
+
+async def _submit_candidate_to_job(candidate_id: str, submission: CandidateSubmit, current_user: dict):
+    if current_user["role"] == "client_user":
+        has_permission = await check_permission(current_user, "can_upload_cv", current_user.get("client_id"))
+        if not has_permission:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Permission denied: can_upload_cv required"
+            )
+    elif current_user["role"] not in ["admin", "recruiter"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin/recruiter can submit candidates"
+        )
+    
+    candidate = await db.candidates.find_one({"candidate_id": candidate_id}, {"_id": 0})
+    if not candidate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Candidate not found"
+        )
+    job = await db.jobs.find_one({"job_id": submission.job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    # Tenant check for client users - both the source candidate and the target job
+    if current_user["role"] == "client_user":
+        source_job = await db.jobs.find_one({"job_id": candidate["job_id"]}, {"_id": 0, "client_id": 1})
+        if job["client_id"] != current_user["client_id"] or not source_job or source_job["client_id"] != current_user["client_id"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
+            )
+    
+    # The person's profile in the target job's client (profiles never cross clients)
+    profile = await person_profiles.get(candidate.get("person_id"), job.get("client_id"))
+    if profile is None:
+        profile = await person_profiles.find(
+            job.get("client_id"), candidate.get("email"), candidate.get("phone"), candidate.get("name")
+        )
+    
+    duplicate_query = {"job_id": submission.job_id, "submitted_from_candidate_id": candidate_id}
+    if profile:
+        duplicate_query = {"job_id": submission.job_id, "$or": [duplicate_query, {"person_id": profile["person_id"]}]}
+    existing = await db.candidates.find_one(duplicate_query, {"_id": 0, "candidate_id": 1})
+    if existing or candidate["job_id"] == submission.job_id:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Candidate already submitted to this job ({existing['candidate_id'] if existing else candidate_id})"
+        )
+    
+    # Parse, CV text, redaction spans and file all come from the source candidate itself.
+    # One story call for the new job - no extraction or parsing
+    cv_version = await db.candidate_cv_versions.find_one(
+        {"candidate_id": candidate_id, "is_active": True},
+        {"_id": 0}
+    )
+    submitted_fields = submitted_candidate_fields(candidate)
+    parsed_resume = parsed_resume_from_candidate(candidate, cv_version)
+    ai_story, story_fp, _ = await generate_candidate_story_if_changed(parsed_resume.model_dump(), job)
+    
+    new_candidate_id = f"cand_{uuid.uuid4().hex[:8]}"
+    now = datetime.now(timezone.utc).isoformat()
+    # The new record gets its own alias (and blob reference), so deleting either candidate keeps the other's file
+    cv_url = None
+    if cv_version:
+        cv_url = await alias_cv_for_candidate(cv_version["file_url"], cv_version.get("content_hash"), new_candidate_id)
+    
+    profile = await person_profiles.save(
+        candidate, job.get("client_id"), person_id=profile["person_id"] if profile else None
+    )
+    # Link the source record too when it is in the same client, so it is found by person_id next time
+    if not candidate.get("person_id"):
+        if current_user["role"] != "client_user":
+            source_job = await db.jobs.find_one({"job_id": candidate["job_id"]}, {"_id": 0, "client_id": 1})
+        if source_job and source_job.get("client_id") == job.get("client_id"):
+            await db.candidates.update_one(
+                {"candidate_id": candidate_id, "person_id": None},
+                {"$set": {"person_id": profile["person_id"]}}
+            )
+    
+    candidate_doc = {
+        "candidate_id": new_candidate_id,
+        "job_id": submission.job_id,
+        "person_id": profile["person_id"],
+        **submitted_fields,
+        **skill_id_fields(parsed_resume.skills),
+        "cv_file_url": cv_url,
+        "ai_story": ai_story.model_dump(),
+        "story_fingerprint": story_fp,
+        "status": "NEW",
+        "submitted_from_candidate_id": candidate_id,
+        "created_at": now,
+        "created_by": current_user["email"]
+    }
+    await db.candidates.insert_one(candidate_doc)
+    
+    # The new record starts its own CV history from the shared (content-addressed) file
+    if cv_url:
+        await db.candidate_cv_versions.insert_one({
+            "version_id": f"cv_v_{uuid.uuid4().hex[:12]}",
+            "candidate_id": new_candidate_id,
+            "version_number": 1,
+            "file_url": cv_url,
+            "content_hash": cv_version.get("content_hash"),
+            "source_filename": cv_version["source_filename"],
+            "uploaded_by_user_id": current_user.get("user_id", current_user["email"]),
+            "uploaded_by_email": current_user["email"],
+            "uploaded_at": now,
+            "is_active": True,
+            "ai_parsed_data": {field: getattr(parsed_resume, field) for field in PROFILE_FIELDS},
+            "ai_story_json": ai_story.model_dump(),
+            "fit_score": ai_story.fit_score,
+            "parse_source": parsed_resume.parse_source,
+            "parse_confidence": parsed_resume.parse_confidence,
+            "deleted_at": None,
+            "delete_type": None,
+            "deleted_by_user_id": None
+        })
+    
+    await log_audit_event(
+        user_id=current_user.get("user_id", current_user["email"]),
+        user_email=current_user["email"],
+        user_role=current_user["role"],
+        action_type="CANDIDATE_CREATE",
+        entity_type="candidate",
+        entity_id=new_candidate_id,
+        client_id=job.get("client_id"),
+        metadata={
+            "person_id": profile["person_id"],
+            "source_candidate_id": candidate_id,
+            "job_id": submission.job_id
+        }
+    )
+    
+    return CandidateResponse(
+        candidate_id=new_candidate_id,
+        job_id=submission.job_id,
+        **{field: getattr(parsed_resume, field) for field in PROFILE_FIELDS},
+        cv_file_url=cv_url,
+        ai_story=ai_story,
+        status="NEW",
+        created_at=now,
+        created_by=current_user["email"],
+        person_id=profile["person_id"]
+    )
+
 @api_router.get("/jobs/{job_id}/candidates", response_model=list[CandidateResponse])
 async def list_job_candidates(
     job_id: str,
     show_rejected: bool = False,
+    skill: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """List all candidates for a job (excluding rejected by default)"""
+    """List all candidates for a job (excluding rejected by default), optionally with a skill or any of its synonyms"""
     # Verify job exists and user has access
     job = await db.jobs.find_one({"job_id": job_id}, {"_id": 0})
     if not job:
@@ -3770,6 +4632,9 @@ async def list_job_candidates(
     query = {"job_id": job_id}
     if not show_rejected:
         query["status"] = {"$ne": "REJECT"}
+    skill_id = canonical_skill_id(skill)
+    if skill_id is not None:
+        query["skill_ids"] = skill_id
     
     candidates = await db.candidates.find(
         query,
@@ -3799,6 +4664,135 @@ async def list_job_candidates(
     
     return result
 
+@api_router.get("/jobs/{job_id}/candidates/skill-facets")
+async def job_candidate_skill_facets(
+    job_id: str,
+    show_rejected: bool = False,
+    limit: int = 30,
+    current_user: dict = Depends(get_current_user)
+):
+    """Candidate counts per canonical skill for a job, with the job's required skills flagged"""
+    job = await db.jobs.find_one({"job_id": job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    # Tenant check for client users
+    if current_user["role"] == "client_user":
+        if job["client_id"] != current_user["client_id"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
+            )
+        has_permission = await check_permission(current_user, "can_view_candidates", current_user.get("client_id"))
+        if not has_permission:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Permission denied: can_view_candidates required"
+            )
+    
+    match = {"job_id": job_id}
+    if not show_rejected:
+        match["status"] = {"$ne": "REJECT"}
+    
+    # Only taxonomy skills are faceted - unlisted skill IDs have no display name
+    facets = await db.candidates.aggregate([
+        {"$match": match},
+        {"$unwind": "$skill_ids"},
+        {"$match": {"skill_ids": {"$lt": UNLISTED_ID_BASE}}},
+        {"$group": {"_id": "$skill_ids", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": limit}
+    ]).to_list(limit)
+    
+    required_ids = set(job.get("skill_ids") or canonical_skill_ids(job.get("required_skills")))
+    return {
+        "job_id": job_id,
+        "skills": [
+            {
+                "skill_id": facet["_id"],
+                "name": canonical_skill_name(facet["_id"]),
+                "count": facet["count"],
+                "required": facet["_id"] in required_ids
+            }
+            for facet in facets
+        ]
+    }
+
+@api_router.get("/jobs/{job_id}/candidates/ranked")
+async def rank_job_candidates(
+    job_id: str,
+    top_k: int = 20,
+    show_rejected: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    """Rank a job's candidates by calculated fit score, scoring the whole pool in one batch"""
+    if top_k < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="top_k must be at least 1"
+        )
+    
+    job = await db.jobs.find_one({"job_id": job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    # Tenant check for client users
+    if current_user["role"] == "client_user":
+        if job["client_id"] != current_user["client_id"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
+            )
+        has_permission = await check_permission(current_user, "can_view_candidates", current_user.get("client_id"))
+        if not has_permission:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Permission denied: can_view_candidates required"
+            )
+    
+    query = {"job_id": job_id}
+    if not show_rejected:
+        query["status"] = {"$ne": "REJECT"}
+    
+    # Only the fields the scorer and the ranked list need
+    candidates = await db.candidates.find(
+        query,
+        {
+            "_id": 0, "candidate_id": 1, "name": 1, "current_role": 1, "status": 1,
+            "skills": 1, "experience.duration": 1, "ai_story.fit_score": 1
+        }
+    ).to_list(None)
+    
+    started = time.perf_counter()
+    ranked = JobFitScorer(job).top_k(candidates, top_k)
+    scoring_ms = (time.perf_counter() - started) * 1000
+    print(f"[DEBUG] Ranked {len(candidates)} candidates for {job_id} in {scoring_ms:.1f}ms")
+    
+    return {
+        "job_id": job_id,
+        "total": len(candidates),
+        "top_k": top_k,
+        "scoring_ms": round(scoring_ms, 2),
+        "candidates": [
+            {
+                "rank": rank,
+                "candidate_id": candidates[index]["candidate_id"],
+                "name": candidates[index].get("name"),
+                "current_role": candidates[index].get("current_role"),
+                "status": candidates[index].get("status"),
+                "fit_score": score,
+                "ai_fit_score": (candidates[index].get("ai_story") or {}).get("fit_score")
+            }
+            for rank, (score, index) in enumerate(ranked, start=1)
+        ]
+    }
+
 @api_router.get("/candidates/{candidate_id}", response_model=CandidateResponse)
 async def get_candidate(
     candidate_id: str,
@@ -3881,8 +4875,11 @@ async def delete_candidate(
     # Get job for client_id
     job = await db.jobs.find_one({"job_id": candidate["job_id"]}, {"_id": 0})
     
-    # Delete CV versions
+    # Delete CV versions and release their stored files
     cv_versions = await db.candidate_cv_versions.find({"candidate_id": candidate_id}).to_list(1000)
+    for cv_version in cv_versions:
+        if cv_version.get("file_url") and cv_version["file_url"] != "[HARD_DELETED]":
+            await cv_blob_store.release(cv_version["file_url"])
     await db.candidate_cv_versions.delete_many({"candidate_id": candidate_id})
     
     # Delete reviews
@@ -3960,7 +4957,11 @@ async def get_candidate_cv(
         if not await check_permission(current_user, "can_view_full_cv", current_user.get("client_id")):
             redacted = True
     
-    cv_text = candidate.get("cv_text_redacted") if redacted else candidate.get("cv_text_original")
+    # Full-text extraction was interrupted (e.g. restart) - pick it up again
+    if candidate.get("cv_text_complete") is False and candidate.get("cv_file_url"):
+        schedule_cv_text_completion(candidate_id, candidate["cv_file_url"], Path(candidate["cv_file_url"]).name)
+    
+    cv_text = redacted_cv_text(candidate) if redacted else candidate.get("cv_text_original")
     
     return {
         "candidate_id": candidate_id,
@@ -4022,6 +5023,8 @@ async def update_candidate(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No update data provided"
         )
+    if "skills" in update_dict:
+        update_dict.update(skill_id_fields(update_dict["skills"]))
     
     await db.candidates.update_one(
         {"candidate_id": candidate_id},
@@ -4064,9 +5067,10 @@ async def update_candidate(
 @api_router.post("/candidates/{candidate_id}/regenerate-story", response_model=CandidateResponse)
 async def regenerate_candidate_story(
     candidate_id: str,
+    force: bool = False,
     current_user: dict = Depends(get_current_user)
 ):
-    """Regenerate AI candidate story"""
+    """Regenerate AI candidate story (skipped when its inputs are unchanged, unless `force=true`)"""
     # Only admin/recruiter can regenerate
     if current_user["role"] not in ["admin", "recruiter"]:
         raise HTTPException(
@@ -4083,13 +5087,9 @@ async def regenerate_candidate_story(
     
     job = await db.jobs.find_one({"job_id": candidate["job_id"]}, {"_id": 0})
     
-    # Generate new story
-    ai_story = await generate_candidate_story(candidate, job)
-    
-    await db.candidates.update_one(
-        {"candidate_id": candidate_id},
-        {"$set": {"ai_story": ai_story.model_dump()}}
-    )
+    # Generate new story (concurrent requests share one generation)
+    regeneration = await regenerate_and_store_story(candidate, job, force=force)
+    ai_story = CandidateStory(**regeneration["ai_story"])
     
     updated_candidate = await db.candidates.find_one({"candidate_id": candidate_id}, {"_id": 0})
     
@@ -4233,9 +5233,14 @@ from io import BytesIO
 @api_router.post("/candidates/{candidate_id}/story/regenerate")
 async def regenerate_candidate_story_endpoint(
     candidate_id: str,
+    force: bool = False,
     current_user: dict = Depends(get_current_user)
 ):
-    """Regenerate AI candidate story with editorial formatting"""
+    """
+    Regenerate AI candidate story with editorial formatting.
+    The stored story is returned as-is when the candidate and job fields it
+    was generated from are unchanged; `force=true` always calls the LLM.
+    """
     # Only admin and recruiter can regenerate
     if current_user["role"] not in ["admin", "recruiter"]:
         raise HTTPException(
@@ -4260,19 +5265,8 @@ async def regenerate_candidate_story_endpoint(
                 detail="Access denied"
             )
     
-    # Generate new story
-    new_story = await generate_candidate_story(candidate, job)
-    
-    # Update candidate with new story and timestamp
-    await db.candidates.update_one(
-        {"candidate_id": candidate_id},
-        {
-            "$set": {
-                "ai_story": new_story.model_dump(),
-                "story_last_generated": datetime.now(timezone.utc).isoformat()
-            }
-        }
-    )
+    # Generate and store new story (concurrent requests share one generation)
+    await regenerate_and_store_story(candidate, job, force=force)
     
     # Return updated candidate
     updated_candidate = await db.candidates.find_one({"candidate_id": candidate_id}, {"_id": 0})
@@ -4297,6 +5291,113 @@ async def regenerate_candidate_story_endpoint(
         created_by=updated_candidate["created_by"]
     )
 
+@api_router.post("/candidates/{candidate_id}/story/regenerate/stream")
+async def regenerate_candidate_story_stream(
+    candidate_id: str,
+    force: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Regenerate AI candidate story, streamed as Server-Sent Events.
+    Events: `stage` (generating / saving), `field` (partial story fields as
+    tokens arrive), `story` (final persisted CandidateStory), `error`.
+    With unchanged story inputs (and no `force=true`) only the stored story
+    is sent, with `regenerated: false`. A request arriving while the same
+    story is already being generated waits for that generation (`shared: true`).
+    """
+    # Only admin and recruiter can regenerate
+    if current_user["role"] not in ["admin", "recruiter"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin and recruiter can regenerate stories"
+        )
+    
+    candidate = await db.candidates.find_one({"candidate_id": candidate_id}, {"_id": 0})
+    if not candidate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Candidate not found"
+        )
+    job = await db.jobs.find_one({"job_id": candidate["job_id"]}, {"_id": 0}) or {}
+    fingerprint = story_fingerprint(candidate, job)
+    
+    async def regenerate(events: asyncio.Queue) -> dict:
+        llm_key = llm_api_key()
+        story_fp = None
+        
+        if not llm_key:
+            new_story = await generate_candidate_story(candidate, job)
+        else:
+            scanner = StoryFieldScanner()
+            try:
+                async for delta in llm_client.chat_stream(
+                    CANDIDATE_STORY_SYSTEM_PROMPT,
+                    _build_story_prompt(candidate, job),
+                    api_key=llm_key
+                ):
+                    for name, value, complete in scanner.feed(delta):
+                        events.put_nowait(sse_event("field", {"name": name, "value": value, "complete": complete}))
+                
+                json_match = re.search(r'\{.*\}', scanner.buffer, re.DOTALL)
+                if not json_match:
+                    raise ValueError("No JSON found in response")
+                new_story = _normalize_candidate_story(json.loads(json_match.group()), candidate, job)
+                story_fp = fingerprint
+            except Exception as e:
+                print(f"[ERROR] Streamed story generation error: {e}")
+                events.put_nowait(sse_event("error", {"detail": "AI story generation failed - using calculated story"}))
+                new_story = _fallback_candidate_story(candidate, job)
+        
+        events.put_nowait(sse_event("stage", {"stage": "saving"}))
+        return await _store_regenerated_story(candidate_id, new_story, story_fp)
+    
+    async def event_stream():
+        stored_story = None if force else stored_story_if_unchanged(candidate, fingerprint)
+        if stored_story:
+            yield sse_event("story", {
+                "ai_story": stored_story.model_dump(),
+                "story_last_generated": candidate.get("story_last_generated"),
+                "regenerated": False
+            })
+            return
+        
+        yield sse_event("stage", {"stage": "generating"})
+        # The first caller streams field events; callers joining its flight get the final story
+        events = asyncio.Queue()
+        flight, leader = story_flights.start(story_flight_key(candidate), lambda: regenerate(events))
+        getter = None
+        try:
+            while leader and not (flight.done() and events.empty()):
+                getter = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait({getter, flight}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    yield getter.result()
+                else:
+                    getter.cancel()
+        finally:
+            if getter is not None and not getter.done():
+                getter.cancel()
+        
+        try:
+            result = await asyncio.shield(flight)
+        except Exception as e:
+            # e.g. the story could not be stored - every caller of the flight gets the error event
+            print(f"[ERROR] Story regeneration failed for {candidate_id}: {e}")
+            yield sse_event("error", {"detail": "Story regeneration failed"})
+            return
+        yield sse_event("story", {
+            "ai_story": result["ai_story"],
+            "story_last_generated": result["story_last_generated"],
+            "regenerated": True,
+            "shared": not leader
+        })
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @api_router.get("/candidates/{candidate_id}/story/export")
 async def export_candidate_story_pdf(
     candidate_id: str,
@@ -4482,10 +5583,22 @@ async def root():
 async def replace_candidate_cv(
     candidate_id: str,
     file: UploadFile = File(...),
+    force: bool = False,
+    idempotency_key: Optional[str] = Header(None),
     current_user: dict = Depends(get_current_user)
 ):
-    """Upload a new CV for an existing candidate (replacement workflow)"""
-    
+    """
+    Upload a new CV for an existing candidate (replacement workflow); `force=true` always rewrites the story.
+    A retry with the same `Idempotency-Key` header returns the original response.
+    """
+    fingerprint = request_fingerprint(filename=file.filename, size=file.size, force=force)
+    return await run_idempotent(
+        idempotency_key, f"candidates.cv:{candidate_id}", fingerprint, current_user,
+        lambda: _replace_candidate_cv(candidate_id, file, force, current_user)
+    )
+
+
+async def _replace_candidate_cv(candidate_id: str, file: UploadFile, force: bool, current_user: dict):
     # Get candidate
     candidate = await db.candidates.find_one({"candidate_id": candidate_id}, {"_id": 0})
     if not candidate:
@@ -4535,42 +5648,34 @@ async def replace_candidate_cv(
     
     next_version_number = max([v.get("version_number", 0) for v in existing_versions], default=0) + 1
     
-    # Mark current active version as inactive
-    if existing_versions:
-        await db.candidate_cv_versions.update_many(
-            {"candidate_id": candidate_id, "is_active": True},
-            {"$set": {"is_active": False}}
-        )
-    
     # Save new CV file
     version_id = f"cv_v_{uuid.uuid4().hex[:12]}"
     file_extension = Path(file.filename).suffix
     filename = f"{candidate_id}_v{next_version_number}{file_extension}"
-    file_path = UPLOAD_DIR / filename
     
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+    try:
+        stored_cv = await cv_blob_store.store_upload(file, filename)
+    except CVUploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    
+    cv_url = stored_cv["url"]
+    file_path = cv_blob_store.blob_path(stored_cv["sha256"])
     
-    cv_url = f"/api/uploads/{filename}"
+    # Mark current active version as inactive
+    if existing_versions:
+        await db.candidate_cv_versions.update_many(
+            {"candidate_id": candidate_id, "is_active": True},
+            {"$set": {"is_active": False}}
+        )
     
     # Extract text from CV using proper PDF/DOCX parsing
-    cv_text = await extract_text_from_cv(file)
+    cv_text, cv_text_complete = await extract_cv_text_for_parsing(file_path, file.filename, stored_cv["sha256"])
     print(f"[DEBUG] Replace CV - Extracted text length: {len(cv_text)} chars")
     
-    # Parse CV with AI
-    parsed_resume = await parse_cv_with_ai(cv_text)
-    
-    # Generate candidate story with full parsed data
-    candidate_data_for_story = {
-        "name": parsed_resume.name or candidate.get("name"),
-        "current_role": parsed_resume.current_role or candidate.get("current_role"),
-        "skills": parsed_resume.skills or candidate.get("skills", []),
-        "experience": parsed_resume.experience or candidate.get("experience", []),
-        "education": parsed_resume.education or candidate.get("education", []),
-        "summary": parsed_resume.summary or candidate.get("summary", "")
-    }
-    ai_story = await generate_candidate_story(candidate_data_for_story, job)
+    # Parse CV and generate the story, keeping existing candidate fields the new CV lacks
+    parsed_resume, ai_story, story_fp = await parse_cv_and_generate_story(
+        cv_text, job, story_defaults=candidate, force_story=force
+    )
     
     # Create new version entry
     version_doc = {
@@ -4578,6 +5683,7 @@ async def replace_candidate_cv(
         "candidate_id": candidate_id,
         "version_number": next_version_number,
         "file_url": cv_url,
+        "content_hash": stored_cv["sha256"],
         "source_filename": file.filename,
         "uploaded_by_user_id": current_user.get("user_id", current_user["email"]),
         "uploaded_by_email": current_user["email"],
@@ -4596,6 +5702,8 @@ async def replace_candidate_cv(
         },
         "ai_story_json": ai_story.model_dump(),
         "fit_score": ai_story.fit_score,
+        "parse_source": parsed_resume.parse_source,
+        "parse_confidence": parsed_resume.parse_confidence,
         "deleted_at": None,
         "delete_type": None,
         "deleted_by_user_id": None
@@ -4603,28 +5711,40 @@ async def replace_candidate_cv(
     
     await db.candidate_cv_versions.insert_one(version_doc)
     
+    # New parse, keeping existing candidate fields the new CV lacks
+    candidate_fields = {
+        "name": parsed_resume.name or candidate.get("name"),
+        "current_role": parsed_resume.current_role or candidate.get("current_role"),
+        "email": parsed_resume.email or candidate.get("email"),
+        "phone": parsed_resume.phone or candidate.get("phone"),
+        "linkedin": parsed_resume.linkedin or candidate.get("linkedin"),
+        "skills": parsed_resume.skills or candidate.get("skills", []),
+        "experience": parsed_resume.experience or candidate.get("experience", []),
+        "education": parsed_resume.education or candidate.get("education", []),
+        "summary": parsed_resume.summary or candidate.get("summary")
+    }
+    
     # Update main candidate document with new data
     await db.candidates.update_one(
         {"candidate_id": candidate_id},
         {
             "$set": {
-                "name": parsed_resume.name or candidate.get("name"),
-                "current_role": parsed_resume.current_role or candidate.get("current_role"),
-                "email": parsed_resume.email or candidate.get("email"),
-                "phone": parsed_resume.phone or candidate.get("phone"),
-                "linkedin": parsed_resume.linkedin or candidate.get("linkedin"),
-                "skills": parsed_resume.skills or candidate.get("skills", []),
-                "experience": parsed_resume.experience or candidate.get("experience", []),
-                "education": parsed_resume.education or candidate.get("education", []),
-                "summary": parsed_resume.summary or candidate.get("summary"),
+                **candidate_fields,
+                **skill_id_fields(candidate_fields["skills"]),
                 "cv_file_url": cv_url,
                 "cv_text_original": cv_text,
-                "cv_text_redacted": redact_text(cv_text),
+                "cv_redaction_spans": find_pii_spans(cv_text),
+                "cv_redaction_version": REDACTION_VERSION,
+                "cv_text_complete": cv_text_complete,
                 "ai_story": ai_story.model_dump(),
+                "story_fingerprint": story_fp,
                 "story_last_generated": datetime.now(timezone.utc).isoformat()
-            }
+            },
+            "$unset": {"cv_text_redacted": ""}
         }
     )
+    if not cv_text_complete:
+        schedule_cv_text_completion(candidate_id, cv_url, file.filename)
     
     # Log audit event
     await log_audit_event(
@@ -4823,10 +5943,8 @@ async def delete_cv_version(
         message = "CV version soft deleted (archived)"
         
     elif mode == "hard":
-        # Hard delete: remove file and mark as hard deleted
-        file_path = UPLOAD_DIR / Path(version["file_url"]).name
-        if file_path.exists():
-            file_path.unlink()
+        # Hard delete: release the file reference (blob removed when unreferenced)
+        await cv_blob_store.release(version["file_url"])
         
         await db.candidate_cv_versions.update_one(
             {"version_id": version_id},
@@ -6823,11 +7941,61 @@ async def mark_all_notifications_read(
 async def health_check():
     return {"status": "healthy"}
 
+@api_router.get("/admin/cv-extraction/metrics")
+async def get_cv_extraction_metrics(
+    current_user: dict = Depends(get_current_user)
+):
+    """CV extraction pool metrics - queue depth, timeouts, durations (Admin only)"""
+    if current_user["role"] not in ["admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only Arbeit Admin can view extraction metrics"
+        )
+    return cv_extraction_engine.metrics()
+
+@api_router.get("/admin/artifact-cache/metrics")
+async def get_artifact_cache_metrics(
+    current_user: dict = Depends(get_current_user)
+):
+    """CV artifact cache hit/miss counters (Admin only)"""
+    if current_user["role"] not in ["admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only Arbeit Admin can view cache metrics"
+        )
+    return artifact_cache.metrics()
+
+@api_router.get("/admin/llm/metrics")
+async def get_llm_metrics(
+    current_user: dict = Depends(get_current_user)
+):
+    """LLM rate limiter state, prompt token usage, idempotent replays and coalesced story calls (Admin only)"""
+    if current_user["role"] not in ["admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only Arbeit Admin can view LLM metrics"
+        )
+    return {
+        **llm_client.metrics(),
+        "prompts": prompt_builder.metrics(),
+        "idempotency": idempotency_store.metrics(),
+        "story_singleflight": story_flights.metrics()
+    }
+
 # Include the router in the main app
 app.include_router(api_router)
 
-# Mount static files directory for serving uploaded CVs
-app.mount("/api/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
+# Serve uploaded CVs - aliases resolve to content-addressed blobs, older files are served as stored
+@app.get("/api/uploads/{filename}")
+async def serve_uploaded_cv(filename: str):
+    file_path, _ = await cv_blob_store.resolve(filename)
+    if file_path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+    media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    return FileResponse(file_path, media_type=media_type)
 
 app.add_middleware(
     CORSMiddleware,
@@ -6844,6 +8012,78 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def start_cv_extraction_engine():
+    cv_extraction_engine.start()
+
+@app.on_event("startup")
+async def start_llm_client():
+    llm_client.start(llm_api_key())
+
+@app.on_event("startup")
+async def ensure_cv_storage_indexes():
+    await cv_blob_store.ensure_indexes()
+    await artifact_cache.ensure_indexes()
+    await person_profiles.ensure_indexes()
+    await idempotency_store.ensure_indexes()
+    await story_flights.ensure_indexes()
+
+async def backfill_skill_ids():
+    """Store canonical skill IDs on candidates and jobs saved before (or under an older) taxonomy"""
+    for collection, id_field, skills_field in (
+        (db.candidates, "candidate_id", "skills"),
+        (db.jobs, "job_id", "required_skills")
+    ):
+        updated = 0
+        async for doc in collection.find(
+            {"skill_taxonomy_version": {"$ne": TAXONOMY_VERSION}},
+            {"_id": 0, id_field: 1, skills_field: 1}
+        ):
+            await collection.update_one({id_field: doc[id_field]}, {"$set": skill_id_fields(doc.get(skills_field))})
+            updated += 1
+        if updated:
+            print(f"[DEBUG] Stored canonical skill IDs on {updated} {collection.name}")
+
+# Startup backfill of skill IDs (kept referenced so it is not garbage collected mid-run)
+skill_id_backfill_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def ensure_skill_id_indexes():
+    global skill_id_backfill_task
+    await db.candidates.create_index([("job_id", 1), ("skill_ids", 1)])
+    await db.jobs.create_index("skill_ids")
+    skill_id_backfill_task = asyncio.create_task(backfill_skill_ids())
+    
+    def _done(finished: asyncio.Task):
+        if not finished.cancelled() and finished.exception():
+            print(f"[ERROR] Skill ID backfill failed: {finished.exception()}")
+    skill_id_backfill_task.add_done_callback(_done)
+
+@app.on_event("shutdown")
+async def stop_skill_id_backfill():
+    if skill_id_backfill_task is not None and not skill_id_backfill_task.done():
+        skill_id_backfill_task.cancel()
+
+@app.on_event("startup")
+async def start_ingestion_workers():
+    await ingestion_queue.ensure_indexes()
+    ingestion_queue.start()
+
+@app.on_event("shutdown")
+async def shutdown_ingestion_workers():
+    await ingestion_queue.stop()
+
+@app.on_event("shutdown")
+async def shutdown_cv_extraction_engine():
+    # Unfinished full-text extractions resume on the next CV read
+    for task in list(cv_text_completion_tasks.values()):
+        task.cancel()
+    cv_extraction_engine.shutdown()
+
+@app.on_event("shutdown")
+async def shutdown_llm_client():
+    await llm_client.close()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
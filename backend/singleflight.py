@@ -0,0 +1,166 @@
+"""
+Single-Flight - coalesce concurrent identical calls into one
+Concurrent callers with the same key await one shared in-flight call and all
+receive its result. Within a process the call is an asyncio task shared by
+every caller (a caller disconnecting does not cancel it for the others).
+With a Mongo collection, a lease document extends this across workers: the
+worker holding the lease runs the call and stores the result, the others
+poll for it.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Lease states
+RUNNING = "running"
+DONE = "done"
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class SingleFlight:
+    """
+    In-flight calls keyed by string.
+
+    - `collection` (optional) holds one lease per key across workers; results
+      stored there must be BSON-serializable dicts
+    - A lease older than `lease_seconds` belongs to a crashed worker and is
+      taken over; a follower that waits longer than `wait_seconds` runs the
+      call itself rather than failing
+    - Finished leases are kept `result_ttl_seconds` so workers that were
+      polling can read the result (Mongo TTL index)
+    """
+
+    def __init__(
+        self,
+        collection=None,
+        lease_seconds: float = 120,
+        wait_seconds: float = 90,
+        poll_interval_seconds: float = 0.5,
+        result_ttl_seconds: float = 300
+    ):
+        self.collection = collection
+        self.lease_seconds = lease_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self._flights: dict[str, asyncio.Future] = {}
+        self._counters = {"calls": 0, "coalesced": 0, "remote_coalesced": 0, "taken_over": 0, "wait_timeouts": 0}
+
+    async def ensure_indexes(self):
+        if self.collection is None:
+            return
+        await self.collection.create_index("flight_key", unique=True)
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights
+
+    def start(self, key: str, fn: Callable[[], Awaitable]) -> tuple[asyncio.Future, bool]:
+        """
+        Join the call in flight for `key`, or start `fn()` as that call.
+        Returns (shared future, whether this caller started it). Registration is
+        synchronous, so two callers in the same process can never both lead.
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            self._counters["coalesced"] += 1
+            return flight, False
+
+        flight = asyncio.ensure_future(self._run(key, fn))
+        self._flights[key] = flight
+        flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        # Retrieve the exception so an abandoned flight does not log "never retrieved"
+        flight.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return flight, True
+
+    async def do(self, key: str, fn: Callable[[], Awaitable]) -> tuple[object, bool]:
+        """Result of the shared call for `key`, and whether it was shared with another caller"""
+        flight, leader = self.start(key, fn)
+        return await asyncio.shield(flight), not leader
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable]):
+        if self.collection is None:
+            self._counters["calls"] += 1
+            return await fn()
+
+        token = uuid.uuid4().hex
+        started = datetime.now(timezone.utc)
+        deadline = asyncio.get_running_loop().time() + self.wait_seconds
+        while not await self._claim(key, token, started):
+            record = await self.collection.find_one({"flight_key": key}, {"_id": 0})
+            if record is not None and record["status"] == DONE and _aware(record["completed_at"]) >= started:
+                self._counters["remote_coalesced"] += 1
+                return record["result"]
+            if asyncio.get_running_loop().time() >= deadline:
+                self._counters["wait_timeouts"] += 1
+                logger.warning(f"Single-flight {key}: gave up waiting for another worker, running the call here")
+                self._counters["calls"] += 1
+                return await fn()
+            await asyncio.sleep(self.poll_interval_seconds)
+
+        self._counters["calls"] += 1
+        try:
+            result = await fn()
+        except BaseException:
+            await self.collection.delete_one({"flight_key": key, "token": token})
+            raise
+
+        now = datetime.now(timezone.utc)
+        await self.collection.update_one(
+            {"flight_key": key, "token": token},
+            {"$set": {
+                "status": DONE,
+                "result": result,
+                "completed_at": now,
+                "expires_at": now + timedelta(seconds=self.result_ttl_seconds)
+            }}
+        )
+        return result
+
+    async def _claim(self, key: str, token: str, started: datetime) -> bool:
+        """Take the lease for `key` if it is free, finished before `started`, or abandoned"""
+        from pymongo.errors import DuplicateKeyError
+
+        now = datetime.now(timezone.utc)
+        lease = {
+            "flight_key": key,
+            "token": token,
+            "status": RUNNING,
+            "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+            "expires_at": now + timedelta(seconds=self.lease_seconds + self.result_ttl_seconds)
+        }
+        try:
+            await self.collection.insert_one(dict(lease))
+            return True
+        except DuplicateKeyError:
+            pass
+
+        # A result from before this call started is stale; an expired lease is abandoned
+        replaced = await self.collection.find_one_and_update(
+            {
+                "flight_key": key,
+                "$or": [
+                    {"status": DONE, "completed_at": {"$lt": started}},
+                    {"status": RUNNING, "lease_expires_at": {"$lt": now}}
+                ]
+            },
+            {"$set": lease, "$unset": {"result": "", "completed_at": ""}}
+        )
+        if replaced is not None and replaced["status"] == RUNNING:
+            self._counters["taken_over"] += 1
+            logger.info(f"Single-flight {key}: took over an abandoned lease")
+        return replaced is not None
+
+    def metrics(self) -> dict:
+        return {
+            **self._counters,
+            "in_flight": len(self._flights),
+            "cross_worker": self.collection is not None
+        }
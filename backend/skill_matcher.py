@@ -0,0 +1,145 @@
+"""
+Skill Matcher - exact and substring skill hits against a job in one pass
+The fit score gives full credit for a job skill the candidate lists exactly
+and half credit for a partial match: the job skill inside a candidate skill
+("react" in "react native") or a candidate skill inside the job skill ("sql"
+in "postgresql"). Instead of comparing every job skill with every candidate
+skill, `SkillMatcher` prebuilds per job:
+
+- an Aho-Corasick automaton over the job skills, which finds every job skill
+  contained in a candidate skill (or a whole CV text) in one scan of it
+- the job skills joined into one string, so "candidate skill inside a job
+  skill" is a few C-level `str.find` calls instead of a loop over the skills
+
+Both are linear in the total length of the job skills, so even unvalidated
+free-text skills cannot make a build expensive.
+
+Matchers are cached by the job's normalized skill set, so an edited job gets
+a new matcher and unchanged jobs reuse theirs.
+"""
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from typing import Iterable
+
+MEMO_SIZE = 20000
+
+# Joins the job skills for substring search; cannot occur in a skill string
+SEPARATOR = "\x00"
+
+# Longest required skill accepted on job create / update (a skill, not a paragraph)
+MAX_JOB_SKILL_CHARS = 100
+
+
+class SkillMatcher:
+    """Matches candidate skills (lowercased, stripped) against a fixed list of job skills"""
+
+    def __init__(self, job_skills: Iterable[str]):
+        self.skills = tuple(job_skills)
+        self._exact = {skill: index for index, skill in enumerate(self.skills)}
+        # "" is contained in every string - those job skills hit any candidate skill
+        self._empty = frozenset(index for index, skill in enumerate(self.skills) if not skill)
+
+        # Automaton: goto transitions, failure links and per-node outputs (job skill indices)
+        self._goto: list[dict[str, int]] = [{}]
+        outputs: list[set[int]] = [set()]
+        for index, skill in enumerate(self.skills):
+            if not skill:
+                continue
+            node = 0
+            for char in skill:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    outputs.append(set())
+                node = next_node
+            outputs[node].add(index)
+
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                outputs[child] |= outputs[self._fail[child]]
+        self._outputs = [frozenset(output) for output in outputs]
+
+        # All job skills in one string; _starts[i] is where skill i begins
+        self._joined = SEPARATOR.join(self.skills)
+        self._starts = []
+        offset = 0
+        for skill in self.skills:
+            self._starts.append(offset)
+            offset += len(skill) + len(SEPARATOR)
+
+        # Candidate skill strings repeat across a pool ("python", "sql") - remember their hits
+        self._memo: dict[str, tuple[int, frozenset[int]]] = {}
+
+    def find_in_text(self, text: str) -> set[int]:
+        """Indices of job skills occurring anywhere in `text`, in one scan"""
+        found = set(self._empty)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found |= outputs[node]
+        return found
+
+    def containing(self, text: str) -> set[int]:
+        """Indices of job skills that contain `text` (non-empty)"""
+        found = set()
+        if SEPARATOR in text:
+            return found
+        position = self._joined.find(text)
+        while position != -1:
+            # A hit never spans the separator, so it lies inside one skill - continue after that skill
+            index = bisect_right(self._starts, position) - 1
+            found.add(index)
+            if index + 1 >= len(self._starts):
+                break
+            position = self._joined.find(text, self._starts[index + 1])
+        return found
+
+    def match(self, candidate_skill: str) -> tuple[int, frozenset[int]]:
+        """(index of the job skill equal to it or -1, job skills matching it partially)"""
+        cached = self._memo.get(candidate_skill)
+        if cached is not None:
+            return cached
+        if candidate_skill:
+            partial = self.find_in_text(candidate_skill) | self.containing(candidate_skill)
+        else:
+            partial = set(range(len(self.skills)))
+        exact = self._exact.get(candidate_skill, -1)
+        partial.discard(exact)
+        result = (exact, frozenset(partial))
+        if len(self._memo) < MEMO_SIZE:
+            self._memo[candidate_skill] = result
+        return result
+
+    def match_skills(self, candidate_skills: Iterable[str]) -> tuple[set[int], set[int]]:
+        """
+        (job skills matched exactly, job skills matched only partially) for a
+        candidate's normalized skills
+        """
+        exact, partial = set(), set()
+        for skill in candidate_skills:
+            index, hits = self.match(skill)
+            if index >= 0:
+                exact.add(index)
+            partial |= hits
+        return exact, partial - exact
+
+
+@lru_cache(maxsize=512)
+def skill_matcher(job_skills: tuple[str, ...]) -> SkillMatcher:
+    """Shared matcher for a job's normalized, sorted skills"""
+    return SkillMatcher(job_skills)
@@ -0,0 +1,197 @@
+"""
+Skill Taxonomy - canonical skill IDs for candidate and job skills
+Skills arrive as free text from the LLM and from job forms ("JS",
+"Javascript", "javascript ES6"). Each skill is normalized and mapped through
+a synonym table to a canonical integer ID at ingest, and the IDs are stored
+next to the raw strings (`skill_ids` on candidates and jobs, indexed), so
+matching, search and faceting are exact set operations.
+
+Skills outside the table get a stable ID derived from their normalized text
+(at or above UNLISTED_ID_BASE), so two records with the same unlisted skill
+still match exactly. IDs below the base are permanent - never renumber an
+entry; bump TAXONOMY_VERSION when synonyms change so stored IDs are rebuilt.
+"""
+import hashlib
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+
+TAXONOMY_VERSION = "2"
+
+UNLISTED_ID_BASE = 1 << 32
+
+# (id, canonical name, synonyms) - the canonical name is matched too. Canonical
+# names are the short common form ("AWS", not "Amazon Web Services") because fit
+# scoring still credits substring matches on them ("aws" in "aws lambda").
+SKILL_TAXONOMY = [
+    (1, "JavaScript", ["js", "javascript es6", "es6", "ecmascript", "vanilla js", "vanilla javascript"]),
+    (2, "TypeScript", ["ts"]),
+    (3, "Python", ["python3", "py"]),
+    (4, "Java", ["core java", "java se", "j2ee", "java ee"]),
+    (5, "C", ["c language", "c programming"]),
+    (6, "C++", ["cpp", "cplusplus", "c plus plus"]),
+    (7, "C#", ["c sharp", "csharp"]),
+    (8, "Go", ["golang"]),
+    (9, "Rust", []),
+    (10, "Ruby", []),
+    (11, "PHP", []),
+    (12, "Kotlin", []),
+    (13, "Swift", []),
+    (14, "Scala", []),
+    (15, "R", ["r programming", "r language"]),
+    (16, "SQL", ["structured query language", "t-sql", "tsql", "pl/sql", "plsql"]),
+    (17, "PostgreSQL", ["postgres", "psql"]),
+    (18, "MySQL", []),
+    (19, "MongoDB", ["mongo"]),
+    (20, "Redis", []),
+    (21, "Oracle", ["oracle database", "oracle db"]),
+    (22, "SQL Server", ["microsoft sql server", "mssql", "ms sql"]),
+    (23, "NoSQL", []),
+    (24, "React", ["react.js", "reactjs", "react js"]),
+    (25, "React Native", []),
+    (26, "Angular", ["angularjs", "angular.js", "angular js"]),
+    (27, "Vue.js", ["vue", "vuejs", "vue js"]),
+    (28, "Node.js", ["node", "nodejs", "node js"]),
+    (29, "Express.js", ["express", "expressjs"]),
+    (30, "Next.js", ["nextjs", "next js"]),
+    (31, "Django", []),
+    (32, "Flask", []),
+    (33, "FastAPI", ["fast api"]),
+    (34, "Spring Boot", ["spring", "springboot", "spring framework"]),
+    (35, ".NET", ["dotnet", "dot net", "asp.net", "asp.net core", ".net core"]),
+    (36, "HTML", ["html5"]),
+    (37, "CSS", ["css3"]),
+    (38, "Tailwind CSS", ["tailwind", "tailwindcss"]),
+    (39, "GraphQL", []),
+    (40, "REST APIs", ["rest", "rest api", "restful", "restful apis", "restful api"]),
+    (41, "AWS", ["amazon web services", "amazon aws"]),
+    (42, "Azure", ["microsoft azure"]),
+    (43, "GCP", ["google cloud platform", "google cloud"]),
+    (44, "Docker", []),
+    (45, "Kubernetes", ["k8s"]),
+    (46, "Terraform", []),
+    (47, "CI/CD", ["ci cd", "cicd", "continuous integration", "continuous delivery"]),
+    (48, "Jenkins", []),
+    (49, "Git", ["github", "gitlab", "version control"]),
+    (50, "Linux", ["unix"]),
+    (51, "Machine Learning", ["ml"]),
+    (52, "Deep Learning", []),
+    (53, "Artificial Intelligence", ["ai"]),
+    (54, "Natural Language Processing", ["nlp"]),
+    (55, "Computer Vision", []),
+    (56, "TensorFlow", []),
+    (57, "PyTorch", []),
+    (58, "scikit-learn", ["sklearn", "scikit learn"]),
+    (59, "Pandas", []),
+    (60, "NumPy", []),
+    (61, "Spark", ["apache spark", "pyspark"]),
+    (62, "Kafka", ["apache kafka"]),
+    (63, "Airflow", ["apache airflow"]),
+    (64, "Data Analysis", ["data analytics"]),
+    (65, "Excel", ["microsoft excel", "ms excel", "advanced excel"]),
+    (66, "Power BI", ["powerbi", "microsoft power bi"]),
+    (67, "Tableau", []),
+    (68, "Selenium", []),
+    (69, "Agile", ["agile methodology", "agile methodologies"]),
+    (70, "Scrum", []),
+    (71, "Jira", []),
+    (72, "Project Management", []),
+    (73, "Figma", []),
+    (74, "UI/UX Design", ["ui/ux", "ux", "ui", "ux design", "ui design", "user experience"]),
+    (75, "Communication", ["communication skills"]),
+    (76, "Leadership", ["team leadership"]),
+    (77, "Salesforce", ["sfdc"]),
+    (78, "SAP", []),
+    (79, "Microservices", ["microservice architecture"]),
+    (80, "Bash", ["shell scripting", "shell"]),
+    (81, "Cypress", []),
+    (82, "Playwright", []),
+    (83, "Appium", []),
+    (84, "TestNG", []),
+    (85, "JUnit", []),
+    (86, "PyTest", []),
+    (87, "Postman", []),
+    (88, "Manual Testing", []),
+    (89, "Automation Testing", ["test automation"]),
+    (90, "API Testing", []),
+    (91, "Regression Testing", []),
+    (92, "SDLC", []),
+    (93, "STLC", []),
+    (94, "SAS", []),
+]
+
+_WHITESPACE = re.compile(r"[\s_]+")
+# "python 3.10", "java 8", "javascript es6", "react v18"
+_TRAILING_VERSION = re.compile(r"\s+(v?\d+(\.\d+)*x?|es\d+)$")
+_TRAILING_PARENTHETICAL = re.compile(r"\s*\([^)]*\)$")
+
+
+def normalize_skill(skill: Optional[str]) -> str:
+    """Lowercase, single-spaced, without trailing punctuation"""
+    return _WHITESPACE.sub(" ", (skill or "").lower()).strip().rstrip(",;:").strip()
+
+
+_IDS_BY_NAME = {}
+_NAMES_BY_ID = {}
+for _skill_id, _name, _synonyms in SKILL_TAXONOMY:
+    _NAMES_BY_ID[_skill_id] = _name
+    for _alias in [_name, *_synonyms]:
+        _IDS_BY_NAME.setdefault(normalize_skill(_alias), _skill_id)
+
+
+def _listed_id(normalized: str) -> Optional[int]:
+    skill_id = _IDS_BY_NAME.get(normalized)
+    if skill_id is None:
+        # "Amazon Web Services (AWS)", "Python 3.10"
+        for pattern in (_TRAILING_PARENTHETICAL, _TRAILING_VERSION):
+            stripped = pattern.sub("", normalized)
+            if stripped and stripped != normalized:
+                skill_id = _IDS_BY_NAME.get(stripped)
+                if skill_id is not None:
+                    break
+    return skill_id
+
+
+def canonical_skill_id(skill: Optional[str]) -> Optional[int]:
+    """Taxonomy ID, or a stable ID for an unlisted skill; None for blank input"""
+    normalized = normalize_skill(skill)
+    if not normalized:
+        return None
+    skill_id = _listed_id(normalized)
+    if skill_id is not None:
+        return skill_id
+    return UNLISTED_ID_BASE + int(hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12], 16)
+
+
+def canonical_skill_ids(skills: Optional[Iterable[str]]) -> list[int]:
+    """Sorted, de-duplicated IDs for a list of skills (the stored `skill_ids`)"""
+    return sorted({skill_id for skill_id in map(canonical_skill_id, skills or []) if skill_id is not None})
+
+
+def canonical_skill_name(skill_id: int) -> Optional[str]:
+    """Display name of a taxonomy ID (None for unlisted skills)"""
+    return _NAMES_BY_ID.get(skill_id)
+
+
+def listed_skill_name(skill: Optional[str]) -> Optional[str]:
+    """Display name of a listed skill ("reactjs" -> "React"); None when it is not in the table"""
+    normalized = normalize_skill(skill)
+    skill_id = _listed_id(normalized) if normalized else None
+    return _NAMES_BY_ID.get(skill_id) if skill_id is not None else None
+
+
+def skill_aliases() -> dict[str, str]:
+    """Every normalized name and synonym in the table -> display name"""
+    return {alias: _NAMES_BY_ID[skill_id] for alias, skill_id in _IDS_BY_NAME.items()}
+
+
+@lru_cache(maxsize=65536)
+def canonical_skill_key(skill: Optional[str]) -> str:
+    """Lowercased canonical name of a listed skill, or the normalized text otherwise"""
+    normalized = normalize_skill(skill)
+    skill_id = _listed_id(normalized) if normalized else None
+    return _NAMES_BY_ID[skill_id].lower() if skill_id is not None else normalized
+
+
+def is_listed(skill_id: int) -> bool:
+    return skill_id < UNLISTED_ID_BASE
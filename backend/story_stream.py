@@ -0,0 +1,95 @@
+"""
+Story Streaming - Server-Sent Events helpers for candidate story regeneration
+The LLM streams the story JSON token by token; StoryFieldScanner picks
+top-level fields out of the incomplete buffer so the UI can paint the
+headline and summary while the rest of the story is still being written.
+"""
+import json
+import re
+from typing import Optional
+
+# Fields pushed while streaming, in the order they usually appear
+STREAMED_STRING_FIELDS = ["headline", "summary"]
+STREAMED_VALUE_FIELDS = ["timeline", "skills", "highlights", "fit_score"]
+
+_decoder = json.JSONDecoder()
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _key_pattern(key: str) -> re.Pattern:
+    return re.compile(r'"' + re.escape(key) + r'"\s*:\s*')
+
+
+_KEY_PATTERNS = {key: _key_pattern(key) for key in STREAMED_STRING_FIELDS + STREAMED_VALUE_FIELDS}
+
+
+def _partial_string(buffer: str, start: int) -> Optional[tuple[str, bool]]:
+    """Decode a JSON string starting at `start` (the opening quote); returns (text, complete)"""
+    if start >= len(buffer) or buffer[start] != '"':
+        return None
+    i = start + 1
+    while i < len(buffer):
+        char = buffer[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '"':
+            return json.loads(buffer[start:i + 1]), True
+        i += 1
+    # Unterminated - drop a dangling escape sequence before decoding what we have
+    body = buffer[start + 1:]
+    body = re.sub(r'\\(u[0-9a-fA-F]{0,3})?$', '', body)
+    try:
+        return json.loads('"' + body + '"'), False
+    except json.JSONDecodeError:
+        return None
+
+
+class StoryFieldScanner:
+    """
+    Incremental extractor for the story JSON.
+
+    Call `feed(delta)` with each streamed chunk; it returns the fields whose
+    value changed as `(name, value, complete)` tuples. String fields are
+    reported while they grow, list/number fields once they are complete.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._sent: dict = {}
+        self._complete: set = set()
+
+    def feed(self, delta: str) -> list[tuple[str, object, bool]]:
+        self.buffer += delta
+        updates = []
+        for key, pattern in _KEY_PATTERNS.items():
+            if key in self._complete:
+                continue
+            match = pattern.search(self.buffer)
+            if not match:
+                continue
+            start = match.end()
+            if key in STREAMED_STRING_FIELDS:
+                decoded = _partial_string(self.buffer, start)
+                if decoded is None:
+                    continue
+                value, complete = decoded
+            else:
+                try:
+                    value, end = _decoder.raw_decode(self.buffer, start)
+                except json.JSONDecodeError:
+                    continue
+                if end >= len(self.buffer):
+                    # A number at the end of the buffer may still be growing
+                    continue
+                complete = True
+            if complete:
+                self._complete.add(key)
+            if self._sent.get(key) != value or complete:
+                self._sent[key] = value
+                updates.append((key, value, complete))
+        return updates
@@ -0,0 +1,136 @@
+"""
+In-memory stand-in for the few motor collection methods the unit tests touch
+(equality / $lte / $in filters, $set / $inc / $addToSet / $setOnInsert
+updates, upserts).
+Integration behaviour against a real MongoDB is covered by the live tests.
+"""
+import copy
+import uuid
+from types import SimpleNamespace
+
+
+def _matches(document: dict, query: dict) -> bool:
+    for field, condition in query.items():
+        value = document.get(field)
+        if isinstance(condition, dict) and any(key.startswith("$") for key in condition):
+            for operator, operand in condition.items():
+                if operator == "$lte" and not (value is not None and value <= operand):
+                    return False
+                if operator == "$gte" and not (value is not None and value >= operand):
+                    return False
+                if operator == "$in" and value not in operand and not (
+                    isinstance(value, list) and set(value) & set(operand)
+                ):
+                    return False
+                if operator == "$ne" and value == operand:
+                    return False
+        elif isinstance(value, list) and not isinstance(condition, list):
+            if condition not in value:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _project(document: dict, projection) -> dict:
+    document = copy.deepcopy(document)
+    if projection and projection.get("_id") == 0:
+        document.pop("_id", None)
+    return document
+
+
+class FakeCollection:
+    def __init__(self):
+        self.documents: list[dict] = []
+
+    def _find(self, query: dict):
+        return next((document for document in self.documents if _matches(document, query)), None)
+
+    def _apply(self, document: dict, update: dict, inserting: bool):
+        for field, value in update.get("$set", {}).items():
+            document[field] = copy.deepcopy(value)
+        for field, value in update.get("$inc", {}).items():
+            document[field] = document.get(field, 0) + value
+        for field, value in update.get("$addToSet", {}).items():
+            values = value["$each"] if isinstance(value, dict) else [value]
+            document[field] = document.get(field, []) + [v for v in values if v not in document.get(field, [])]
+        if inserting:
+            for field, value in update.get("$setOnInsert", {}).items():
+                document[field] = copy.deepcopy(value)
+
+    def _upsert(self, query: dict, update: dict) -> dict:
+        document = {"_id": uuid.uuid4().hex}
+        document.update({field: value for field, value in query.items() if not isinstance(value, dict)})
+        self._apply(document, update, inserting=True)
+        self.documents.append(document)
+        return document
+
+    async def create_index(self, *args, **kwargs):
+        return None
+
+    async def find_one(self, query: dict, projection=None, sort=None):
+        documents = [document for document in self.documents if _matches(document, query)]
+        for field, direction in reversed(sort or []):
+            documents.sort(key=lambda document: document.get(field) or "", reverse=direction < 0)
+        return _project(documents[0], projection) if documents else None
+
+    def find(self, query: dict, projection=None):
+        documents = [_project(document, projection) for document in self.documents if _matches(document, query)]
+        return FakeCursor(documents)
+
+    async def insert_one(self, document: dict):
+        document.setdefault("_id", uuid.uuid4().hex)
+        self.documents.append(copy.deepcopy(document))
+        return SimpleNamespace(inserted_id=document["_id"])
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False):
+        document = self._find(query)
+        if document is None:
+            if not upsert:
+                return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=None)
+            return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=self._upsert(query, update)["_id"])
+        self._apply(document, update, inserting=False)
+        return SimpleNamespace(matched_count=1, modified_count=1, upserted_id=None)
+
+    async def find_one_and_update(self, query: dict, update: dict, upsert: bool = False, return_document=False, projection=None):
+        document = self._find(query)
+        if document is None:
+            if not upsert:
+                return None
+            inserted = self._upsert(query, update)
+            return _project(inserted, projection) if return_document else None
+        before = copy.deepcopy(document)
+        self._apply(document, update, inserting=False)
+        return _project(document if return_document else before, projection)
+
+    async def find_one_and_delete(self, query: dict, projection=None):
+        document = self._find(query)
+        if document is None:
+            return None
+        self.documents.remove(document)
+        return _project(document, projection)
+
+    async def delete_one(self, query: dict):
+        document = self._find(query)
+        if document is None:
+            return SimpleNamespace(deleted_count=0)
+        self.documents.remove(document)
+        return SimpleNamespace(deleted_count=1)
+
+
+class FakeCursor:
+    def __init__(self, documents: list[dict]):
+        self.documents = documents
+
+    async def to_list(self, length=None):
+        return self.documents[:length] if length else list(self.documents)
+
+
+class FakeDatabase:
+    def __init__(self):
+        self._collections: dict[str, FakeCollection] = {}
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._collections.setdefault(name, FakeCollection())
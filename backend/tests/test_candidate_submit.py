@@ -0,0 +1,77 @@
+"""
+Candidate Submit Tests
+Submitting an existing candidate to another job reuses their person profile,
+and a second submission to the same job is rejected
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+ADMIN_EMAIL = "connect@arbeit.co.in"
+ADMIN_PASSWORD = "admin123"
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": ADMIN_EMAIL,
+        "password": ADMIN_PASSWORD
+    })
+    assert response.status_code == 200, f"Admin login failed: {response.text}"
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="module")
+def jobs(auth_headers):
+    jobs = requests.get(f"{BASE_URL}/api/jobs", headers=auth_headers).json()
+    if len(jobs) < 2:
+        pytest.skip("Need two jobs to submit a candidate across jobs")
+    return jobs[:2]
+
+
+@pytest.fixture(scope="module")
+def candidate(auth_headers, jobs):
+    response = requests.post(
+        f"{BASE_URL}/api/candidates",
+        json={
+            "job_id": jobs[0]["job_id"],
+            "name": f"TEST_Submit_{os.urandom(4).hex()}",
+            "email": f"test_submit_{os.urandom(4).hex()}@example.com",
+            "current_role": "QA Engineer",
+            "skills": ["Selenium", "Python"]
+        },
+        headers=auth_headers
+    )
+    assert response.status_code in [200, 201], f"Create candidate failed: {response.text}"
+    created = [response.json()["candidate_id"]]
+    yield response.json(), created
+    for candidate_id in created:
+        requests.delete(f"{BASE_URL}/api/candidates/{candidate_id}", headers=auth_headers)
+
+
+class TestCandidateSubmit:
+    def test_submit_to_second_job(self, auth_headers, jobs, candidate):
+        source, created = candidate
+        response = requests.post(
+            f"{BASE_URL}/api/candidates/{source['candidate_id']}/submit",
+            json={"job_id": jobs[1]["job_id"]},
+            headers=auth_headers
+        )
+        assert response.status_code == 200, response.text
+        submitted = response.json()
+        created.append(submitted["candidate_id"])
+        assert submitted["job_id"] == jobs[1]["job_id"]
+        assert submitted["name"] == source["name"]
+        assert submitted["person_id"]
+        assert submitted["ai_story"] is not None
+
+        # Same person, same job again
+        response = requests.post(
+            f"{BASE_URL}/api/candidates/{source['candidate_id']}/submit",
+            json={"job_id": jobs[1]["job_id"]},
+            headers=auth_headers
+        )
+        assert response.status_code == 409
@@ -0,0 +1,179 @@
+"""
+CV Extraction Tests
+Tests for budget-bounded (early terminating) PDF extraction on the uploaded CV fixtures
+and for parity between the streaming DOCX reader and python-docx, and for
+terminating hung workers when the extraction pool is replaced
+"""
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pdfplumber = pytest.importorskip("pdfplumber")
+docx = pytest.importorskip("docx")
+from docx.oxml import OxmlElement  # noqa: E402
+from docx.oxml.ns import qn  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cv_extraction import CVExtractionEngine, extract_docx_text, extract_text_from_path, extract_text_prefix  # noqa: E402
+
+UPLOADS_DIR = Path(__file__).resolve().parents[1] / "uploads"
+
+
+def _multi_page_fixture() -> Path:
+    for path in sorted(UPLOADS_DIR.glob("*.pdf")):
+        try:
+            with pdfplumber.open(path) as pdf:
+                if len(pdf.pages) > 1:
+                    return path
+        except Exception:
+            # Some fixtures are placeholder files, not real PDFs
+            continue
+    pytest.skip("No multi-page PDF fixture in backend/uploads")
+
+
+class TestExtractTextPrefix:
+    def test_page_budget_stops_early(self):
+        path = _multi_page_fixture()
+        prefix, complete = extract_text_prefix(str(path), path.name, max_pages=1)
+        assert complete is False
+        assert extract_text_from_path(str(path), path.name).startswith(prefix)
+
+    def test_char_budget_stops_at_page_boundary(self):
+        path = _multi_page_fixture()
+        prefix, complete = extract_text_prefix(str(path), path.name, max_chars=1)
+        assert complete is False
+        assert len(prefix) >= 1
+
+    def test_unbounded_matches_full_extraction(self):
+        path = _multi_page_fixture()
+        text, complete = extract_text_prefix(str(path), path.name)
+        assert complete is True
+        assert text == extract_text_from_path(str(path), path.name)
+
+    def test_plain_text_is_always_complete(self):
+        path = next(UPLOADS_DIR.glob("*.txt"))
+        _, complete = extract_text_prefix(str(path), path.name, max_chars=1, max_pages=1)
+        assert complete is True
+
+
+def _python_docx_text(path) -> str:
+    """The previous DOCX branch - walk the python-docx object model"""
+    doc = docx.Document(str(path))
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                text += cell.text + " "
+            text += "\n"
+    return text
+
+
+def _table_heavy_docx(path):
+    doc = docx.Document()
+    doc.add_heading("Priya Sharma", level=1)
+    paragraph = doc.add_paragraph("Senior QA Engineer\tPune")
+    run = paragraph.add_run("Selenium")
+    run.add_break()
+    run.add_text("Cypress")
+    paragraph.add_run().add_break(docx.enum.text.WD_BREAK.PAGE)
+    doc.add_paragraph("")
+
+    table = doc.add_table(rows=4, cols=3)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"r{r}c{c}"
+    table.cell(0, 0).merge(table.cell(0, 1))      # horizontal span
+    table.cell(1, 2).merge(table.cell(3, 2))      # vertical span
+    table.cell(2, 0).merge(table.cell(3, 1))      # block span
+    table.cell(1, 0).add_paragraph("second line")
+    table.cell(1, 1).add_table(rows=1, cols=2).cell(0, 0).text = "nested"
+
+    skills = doc.add_table(rows=1, cols=2)
+    skills.cell(0, 0).text = "Skills"
+    skills.cell(0, 1).text = "Python, SQL"
+    doc.add_paragraph("References on request")
+    doc.save(str(path))
+    return path
+
+
+def _add_hyperlink(paragraph, text):
+    hyperlink = OxmlElement("w:hyperlink")
+    run = OxmlElement("w:r")
+    t = OxmlElement("w:t")
+    t.text = text
+    run.append(t)
+    hyperlink.append(run)
+    paragraph._p.append(hyperlink)
+
+
+class TestStreamingDocx:
+    def test_matches_python_docx_on_tables(self, tmp_path):
+        path = _table_heavy_docx(tmp_path / "cv.docx")
+        assert extract_docx_text(str(path)) == _python_docx_text(path)
+
+    def test_hyperlinks_and_grid_before(self, tmp_path):
+        doc = docx.Document()
+        _add_hyperlink(doc.add_paragraph("Portfolio: "), "github.com/priya")
+        table = doc.add_table(rows=2, cols=2)
+        table.cell(0, 0).text = "a"
+        table.cell(1, 1).text = "b"
+        tr_pr = table.rows[1]._tr.get_or_add_trPr()
+        grid_before = OxmlElement("w:gridBefore")
+        grid_before.set(qn("w:val"), "1")
+        tr_pr.insert(0, grid_before)
+        table.rows[1]._tr.remove(table.rows[1]._tr.tc_lst[0])
+        path = tmp_path / "links.docx"
+        doc.save(str(path))
+        assert extract_docx_text(str(path)) == _python_docx_text(path)
+
+    def test_extract_text_prefix_uses_streaming_reader(self, tmp_path):
+        path = _table_heavy_docx(tmp_path / "cv.docx")
+        text, complete = extract_text_prefix(str(path), path.name)
+        assert complete is True
+        assert "r1c0\nsecond line" in text
+        assert "References on request" in text
+
+    def test_invalid_docx_falls_back_to_filename(self, tmp_path):
+        path = tmp_path / "broken.docx"
+        path.write_bytes(b"not a zip")
+        assert extract_text_from_path(str(path), path.name) == "CV Upload - broken.docx"
+
+
+class TestPoolRestart:
+    def test_restart_terminates_hung_workers(self):
+        engine = CVExtractionEngine(max_workers=1, job_timeout_seconds=1)
+        engine.start()
+        try:
+            old_executor = engine._executor
+            old_executor.submit(time.sleep, 60)
+            deadline = time.time() + 30
+            while not old_executor._processes and time.time() < deadline:
+                time.sleep(0.05)
+            processes = list(old_executor._processes.values())
+            assert processes
+
+            engine._restart_pool(old_executor)
+
+            assert engine._executor is not old_executor
+            assert not any(process.is_alive() for process in processes)
+            assert engine.metrics()["pool_restarts"] == 1
+        finally:
+            engine.shutdown()
+
+    def test_stale_executor_does_not_restart_new_pool(self):
+        engine = CVExtractionEngine(max_workers=1)
+        engine.start()
+        try:
+            stale = engine._executor
+            engine._restart_pool(stale)
+            current = engine._executor
+            engine._restart_pool(stale)
+            assert engine._executor is current
+            assert engine.metrics()["pool_restarts"] == 1
+        finally:
+            engine.shutdown()
@@ -0,0 +1,129 @@
+"""
+CV Storage Tests
+Tests for type sniffing, size-bounded streaming writes, content hashing of
+uploaded CVs and blob reference counting
+"""
+import asyncio
+import hashlib
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cv_storage import (  # noqa: E402
+    CVBlobStore,
+    CVUploadRejected,
+    copy_stream_bounded,
+    sniff_cv_content,
+)
+from fake_mongo import FakeDatabase  # noqa: E402
+
+UPLOADS_DIR = Path(__file__).resolve().parents[1] / "uploads"
+
+
+class TestSniffCVContent:
+    """Magic-byte validation against the file extension"""
+
+    def test_real_pdf_fixture_accepted(self):
+        fixture = next(UPLOADS_DIR.glob("*.pdf"))
+        sniff_cv_content(fixture.read_bytes()[:1024], fixture.name)
+
+    def test_docx_requires_zip_header(self):
+        sniff_cv_content(b"PK\x03\x04rest-of-archive", "resume.docx")
+        with pytest.raises(CVUploadRejected) as exc:
+            sniff_cv_content(b"%PDF-1.7", "resume.docx")
+        assert exc.value.status_code == 400
+
+    def test_pdf_with_wrong_content_rejected(self):
+        with pytest.raises(CVUploadRejected):
+            sniff_cv_content(b"MZ\x90\x00\x03\x00\x00\x00", "resume.pdf")
+
+    def test_text_with_nul_bytes_rejected(self):
+        sniff_cv_content(b"John Doe\nPython Developer", "resume.txt")
+        with pytest.raises(CVUploadRejected):
+            sniff_cv_content(b"\x7fELF\x02\x01\x01\x00", "resume.txt")
+
+    def test_unsupported_extension_rejected(self):
+        with pytest.raises(CVUploadRejected) as exc:
+            sniff_cv_content(b"#!/bin/sh", "resume.sh")
+        assert "Unsupported file type" in exc.value.detail
+
+    def test_empty_file_rejected(self):
+        with pytest.raises(CVUploadRejected):
+            sniff_cv_content(b"", "resume.pdf")
+
+
+class TestCopyStreamBounded:
+    """Chunked copy with a hard size limit"""
+
+    def test_copy_writes_full_content(self, tmp_path):
+        content = b"%PDF-1.4\n" + b"x" * 3_000_000
+        dest = tmp_path / "cand_test.pdf"
+        written, sha256 = copy_stream_bounded(io.BytesIO(content), dest, "cand_test.pdf")
+        assert written == len(content)
+        assert sha256 == hashlib.sha256(content).hexdigest()
+        assert dest.read_bytes() == content
+
+    def test_oversized_stream_rejected_without_leftovers(self, tmp_path):
+        dest = tmp_path / "cand_big.txt"
+        with pytest.raises(CVUploadRejected) as exc:
+            copy_stream_bounded(io.BytesIO(b"a" * 5000), dest, "cand_big.txt", max_bytes=4096)
+        assert exc.value.status_code == 413
+        assert not dest.exists()
+        assert list(tmp_path.iterdir()) == []
+
+
+def _store_bytes(store: CVBlobStore, content: bytes, public_name: str) -> dict:
+    return asyncio.run(store.store_stream(io.BytesIO(content), public_name, public_name))
+
+
+class TestCVBlobStoreReferences:
+    """Alias reference counting and blob deletion"""
+
+    def test_identical_uploads_share_one_blob(self, tmp_path):
+        store = CVBlobStore(FakeDatabase(), tmp_path)
+        first = _store_bytes(store, b"John Doe CV", "cand_a.txt")
+        second = _store_bytes(store, b"John Doe CV", "cand_b.txt")
+        assert second["deduplicated"] and first["sha256"] == second["sha256"]
+
+        asyncio.run(store.release("cand_a.txt"))
+        path, _ = asyncio.run(store.resolve("cand_b.txt"))
+        assert path is not None and path.read_bytes() == b"John Doe CV"
+
+        asyncio.run(store.release("cand_b.txt"))
+        assert not store.blob_path(first["sha256"]).exists()
+
+    def test_repointed_alias_releases_old_blob(self, tmp_path):
+        store = CVBlobStore(FakeDatabase(), tmp_path)
+        old = _store_bytes(store, b"version one", "cand_a.txt")
+        new = _store_bytes(store, b"version two", "cand_a.txt")
+        assert not store.blob_path(old["sha256"]).exists()
+        assert store.blob_path(new["sha256"]).exists()
+
+        # Re-storing the same content under the same alias keeps a single reference
+        _store_bytes(store, b"version two", "cand_a.txt")
+        asyncio.run(store.release("cand_a.txt"))
+        assert not store.blob_path(new["sha256"]).exists()
+
+    def test_release_keeps_file_recommitted_concurrently(self, tmp_path):
+        db = FakeDatabase()
+        store = CVBlobStore(db, tmp_path)
+        stored = _store_bytes(store, b"same content", "cand_a.txt")
+        blob_path = store.blob_path(stored["sha256"])
+        real_find_one = db.cv_blobs.find_one
+
+        async def find_one_after_recommit(query, projection=None):
+            # A new upload of the same content lands between delete_one and the re-check
+            db.cv_blobs.find_one = real_find_one
+            await store.store_stream(io.BytesIO(b"same content"), "cand_b.txt", "cand_b.txt")
+            return await real_find_one(query, projection)
+
+        db.cv_blobs.find_one = find_one_after_recommit
+        asyncio.run(store.release("cand_a.txt"))
+
+        path, _ = asyncio.run(store.resolve("cand_b.txt"))
+        assert path == blob_path and path.read_bytes() == b"same content"
+        assert list(store.trash_dir.iterdir()) == []
@@ -0,0 +1,94 @@
+"""
+Fit Scoring Tests
+Tests that batch scoring matches the single-candidate fit score and that
+top-k ranking orders a job's pool by score
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fit_scoring import JobFitScorer, candidate_years, combine_fit_score, fit_score_components  # noqa: E402
+
+SKILLS = [
+    "Python", "python ", "Java", "JavaScript", "React", "React Native", "SQL", "PostgreSQL", "AWS",
+    "Docker", "Kubernetes", "Go", "Machine Learning", "ML", "Excel", "Tableau", "C", "C++", "",
+]
+ROLES = ["Senior Software Engineer", "Data Analyst", "Engineering Manager", "UX Designer", "Developer", "", None]
+DURATIONS = ["2019 - Present", "2015 - 2019", "Jan 2020 - Mar 2021", "2 years", "2010-2012-2014", "", "Current"]
+
+JOB = {
+    "title": "Senior Python Developer",
+    "required_skills": ["Python", "SQL", "AWS", "Docker", "React", "Machine Learning"],
+    "experience_range": {"min_years": 5, "max_years": 10},
+}
+
+
+def scalar_score(candidate: dict, job: dict) -> int:
+    return combine_fit_score(*fit_score_components(candidate, job))
+
+
+def random_candidates(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "candidate_id": f"cand_{i}",
+            "current_role": rng.choice(ROLES),
+            "skills": rng.sample(SKILLS, rng.randint(0, 8)),
+            "experience": [{"duration": rng.choice(DURATIONS)} for _ in range(rng.randint(0, 5))],
+        }
+        for i in range(n)
+    ]
+
+
+class TestScalarRules:
+    def test_candidate_years(self):
+        assert candidate_years([]) == 0
+        assert candidate_years([{"duration": "2012 - 2020"}]) == 8
+        assert candidate_years([{"duration": "2019 - Present"}, {"duration": "2018"}]) == 4
+
+    def test_strong_candidate(self):
+        candidate = {
+            "current_role": "Python Developer",
+            "skills": ["Python", "SQL", "AWS", "Docker", "React", "Machine Learning"],
+            "experience": [{"duration": "2014 - 2021"}],
+        }
+        assert fit_score_components(candidate, JOB) == (45, 35, 20)
+        assert scalar_score(candidate, JOB) == 100
+
+
+class TestJobFitScorer:
+    def test_batch_matches_scalar(self):
+        candidates = random_candidates(2000)
+        jobs = [
+            JOB,
+            {"title": "Data Analyst", "required_skills": ["SQL", "Excel", "Tableau"], "experience_range": {"min_years": 0, "max_years": 3}},
+            {"title": "Engineering Manager", "required_skills": [], "experience_range": {"min_years": 8, "max_years": 15}},
+            {"title": "", "required_skills": ["C", "Go"]},
+        ]
+        for job in jobs:
+            batch = JobFitScorer(job).score(candidates).tolist()
+            assert batch == [scalar_score(candidate, job) for candidate in candidates]
+
+    def test_empty_pool(self):
+        assert JobFitScorer(JOB).score([]).tolist() == []
+        assert JobFitScorer(JOB).top_k([], 5) == []
+
+    def test_top_k(self):
+        candidates = random_candidates(500)
+        scores = [scalar_score(candidate, JOB) for candidate in candidates]
+        ranked = JobFitScorer(JOB).top_k(candidates, 10)
+        assert len(ranked) == 10
+        assert [score for score, _ in ranked] == sorted(scores, reverse=True)[:10]
+        assert all(scores[index] == score for score, index in ranked)
+        # Ties keep pool order
+        for (score_a, index_a), (score_b, index_b) in zip(ranked, ranked[1:]):
+            assert score_a > score_b or index_a < index_b
+
+    def test_ranks_five_thousand_quickly(self):
+        candidates = random_candidates(5000)
+        started = time.perf_counter()
+        JobFitScorer(JOB).top_k(candidates, 20)
+        assert time.perf_counter() - started < 1.0
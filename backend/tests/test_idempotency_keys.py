@@ -0,0 +1,94 @@
+"""
+Idempotency Key Tests
+A CV upload retried with the same Idempotency-Key returns the original
+candidate instead of creating a second one; reusing the key for a different
+file is rejected
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+ADMIN_EMAIL = "connect@arbeit.co.in"
+ADMIN_PASSWORD = "admin123"
+
+CV_TEXT = """Priya Raman
+priya.raman.{tag}@example.com | +91 98765 43210
+
+EXPERIENCE
+Senior Data Engineer - Acme Analytics (2021 - Present)
+- Built streaming pipelines in Python and Kafka
+
+SKILLS
+Python, Kafka, Airflow, SQL
+"""
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": ADMIN_EMAIL,
+        "password": ADMIN_PASSWORD
+    })
+    assert response.status_code == 200, f"Admin login failed: {response.text}"
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="module")
+def job(auth_headers):
+    jobs = requests.get(f"{BASE_URL}/api/jobs", headers=auth_headers).json()
+    if not jobs:
+        pytest.skip("Need a job to upload a CV to")
+    return jobs[0]
+
+
+class TestIdempotentUpload:
+    def test_retry_replays_original_candidate(self, auth_headers, job):
+        tag = os.urandom(4).hex()
+        cv = CV_TEXT.format(tag=tag).encode("utf-8")
+        headers = {**auth_headers, "Idempotency-Key": f"test-upload-{tag}"}
+
+        def upload(content: bytes):
+            return requests.post(
+                f"{BASE_URL}/api/candidates/upload",
+                data={"job_id": job["job_id"]},
+                files={"file": ("priya_raman.txt", content, "text/plain")},
+                headers=headers
+            )
+
+        first = upload(cv)
+        assert first.status_code == 200, first.text
+        candidate_id = first.json()["candidate_id"]
+        try:
+            retry = upload(cv)
+            assert retry.status_code == 200, retry.text
+            assert retry.headers.get("Idempotent-Replayed") == "true"
+            assert retry.json()["candidate_id"] == candidate_id
+
+            # Same key, different file
+            conflict = upload(cv + b"\nCERTIFICATIONS\nAWS Data Analytics\n")
+            assert conflict.status_code == 422
+        finally:
+            requests.delete(f"{BASE_URL}/api/candidates/{candidate_id}", headers=auth_headers)
+
+    def test_without_key_creates_new_candidates(self, auth_headers, job):
+        tag = os.urandom(4).hex()
+        cv = CV_TEXT.format(tag=tag).encode("utf-8")
+        created = []
+        try:
+            for _ in range(2):
+                response = requests.post(
+                    f"{BASE_URL}/api/candidates/upload",
+                    data={"job_id": job["job_id"]},
+                    files={"file": ("priya_raman.txt", cv, "text/plain")},
+                    headers=auth_headers
+                )
+                assert response.status_code == 200, response.text
+                assert "Idempotent-Replayed" not in response.headers
+                created.append(response.json()["candidate_id"])
+            assert created[0] != created[1]
+        finally:
+            for candidate_id in created:
+                requests.delete(f"{BASE_URL}/api/candidates/{candidate_id}", headers=auth_headers)
@@ -0,0 +1,69 @@
+"""
+Job Digest Tests
+Tests for the precomputed job context used by story prompts
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from job_digest import build_job_digest, classify_domain, job_digest_for, summarize_description  # noqa: E402
+
+DESCRIPTION = """About Us: Acme is a leading fintech company with offices in 12 countries and many awards.
+Role overview: We are looking for a QA Engineer to join our payments team.
+Responsibilities:
+- Design and execute manual and automated test cases for web and mobile apps.
+- Build and maintain Selenium automation suites in Python.
+Requirements:
+- 3+ years of experience in software testing.
+- Hands-on experience with Selenium, Postman and JIRA.
+Benefits: health insurance, flexible hours, learning budget, team offsites and more perks.
+Equal opportunity employer committed to an inclusive environment for all employees.
+"""
+
+JOB = {
+    "title": "Senior QA Engineer",
+    "description": DESCRIPTION * 2,
+    "required_skills": ["selenium", "Postman ", "JIRA", "jira"],
+    "experience_range": {"min_years": 3, "max_years": 6},
+}
+
+
+class TestDomain:
+    def test_title_markers(self):
+        assert classify_domain("Senior QA Engineer")[0] == "qa"
+        assert classify_domain("Backend Developer")[0] == "engineering"
+        assert classify_domain("Data Analyst")[0] == "analytics"
+        assert classify_domain("Office Manager") == ("general", [])
+
+
+class TestSummary:
+    def test_keeps_requirements_and_drops_boilerplate(self):
+        summary = summarize_description(JOB["description"])
+        assert "Selenium automation suites" in summary
+        assert "3+ years of experience" in summary
+        assert "Acme" not in summary
+        assert "health insurance" not in summary
+        assert "Equal opportunity" not in summary
+
+    def test_repeated_sentences_appear_once(self):
+        summary = summarize_description(JOB["description"])
+        assert summary.count("3+ years of experience") == 1
+
+    def test_short_description_kept_whole(self):
+        assert summarize_description("Test   payments APIs.") == "Test payments APIs."
+
+
+class TestDigest:
+    def test_fields(self):
+        digest = build_job_digest(JOB)
+        assert digest["required_skills"] == ["Selenium", "Postman", "Jira"]
+        assert digest["domain"] == "qa"
+        assert digest["experience_range"] == {"min_years": 3, "max_years": 6}
+        assert len(digest["description_summary"]) <= 600 < len(JOB["description"])
+
+    def test_stored_digest_reused_until_job_changes(self):
+        job = {**JOB, "digest": build_job_digest(JOB)}
+        assert job_digest_for(job) is job["digest"]
+        edited = {**job, "title": "Data Analyst"}
+        assert job_digest_for(edited)["domain"] == "analytics"
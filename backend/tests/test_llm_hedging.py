@@ -0,0 +1,146 @@
+"""
+LLM Hedging Tests
+Tests for hedged attempts, the hedge budget, the per-call hard timeout and
+the total deadline of streamed calls
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from llm_hedging import HedgingPolicy  # noqa: E402
+from llm_rate_limiter import AdaptiveRateLimiter  # noqa: E402
+
+
+def make_attempt(delays):
+    """Attempt factory whose n-th call sleeps delays[n] seconds; records cancellations"""
+    calls = []
+    cancelled = []
+
+    async def attempt():
+        index = len(calls)
+        calls.append(index)
+        try:
+            await asyncio.sleep(delays[index])
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return f"attempt {index}"
+
+    return attempt, calls, cancelled
+
+
+class TestHedging:
+    def test_fast_call_is_not_hedged(self):
+        policy = HedgingPolicy(initial_delay_seconds=0.5, budget_percent=100)
+        attempt, calls, _ = make_attempt([0.01])
+        assert asyncio.run(policy.run(attempt)) == "attempt 0"
+        assert calls == [0]
+
+    def test_slow_call_hedged_and_loser_cancelled(self):
+        policy = HedgingPolicy(initial_delay_seconds=0.05, budget_percent=100)
+        attempt, calls, cancelled = make_attempt([5, 0.01])
+
+        async def run():
+            result = await policy.run(attempt)
+            await asyncio.sleep(0)
+            return result
+
+        assert asyncio.run(run()) == "attempt 1"
+        assert calls == [0, 1]
+        assert cancelled == [0]
+        assert policy.metrics()["hedge_wins"] == 1
+
+    def test_budget_caps_hedges(self):
+        policy = HedgingPolicy(initial_delay_seconds=0.01, budget_percent=25)
+
+        async def run():
+            for _ in range(8):
+                attempt, _, _ = make_attempt([0.03, 0.03])
+                await policy.run(attempt)
+
+        asyncio.run(run())
+        metrics = policy.metrics()
+        assert metrics["hedges"] == 2
+        assert metrics["hedges_skipped"] == 6
+
+    def test_hard_timeout(self):
+        policy = HedgingPolicy(enabled=False, timeout_seconds=0.05)
+        attempt, _, cancelled = make_attempt([5])
+
+        async def run():
+            with pytest.raises(asyncio.TimeoutError):
+                await policy.run(attempt)
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+        assert cancelled == [0]
+        assert policy.metrics()["timeouts"] == 1
+
+    def test_slow_dripping_stream_times_out(self):
+        policy = HedgingPolicy(enabled=False, timeout_seconds=0.2)
+        closed = []
+
+        class DrippingStream:
+            """Each chunk arrives well within a per-read timeout, but it never ends"""
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                await asyncio.sleep(0.03)
+                return "token"
+
+            async def close(self):
+                closed.append(True)
+
+        async def open_stream():
+            return DrippingStream()
+
+        async def run():
+            received = []
+            with pytest.raises(asyncio.TimeoutError):
+                async for chunk in policy.stream(open_stream):
+                    received.append(chunk)
+            return received
+
+        received = asyncio.run(run())
+        assert 0 < len(received) < 10
+        assert closed == [True]
+        assert policy.metrics()["timeouts"] == 1
+
+    def test_stream_within_deadline_yields_everything(self):
+        policy = HedgingPolicy(enabled=False, timeout_seconds=1)
+
+        async def chunks():
+            for token in ["a", "b", "c"]:
+                yield token
+
+        async def open_stream():
+            return chunks()
+
+        async def run():
+            return [chunk async for chunk in policy.stream(open_stream)]
+
+        assert asyncio.run(run()) == ["a", "b", "c"]
+
+    def test_deadline_follows_latency_percentile(self):
+        policy = HedgingPolicy(percentile=90, min_samples=10, min_delay_seconds=0)
+        policy._latencies.extend([0.1] * 9 + [2.0] * 1)
+        assert policy.hedge_delay() == 0.1
+
+
+def test_cancelled_attempt_frees_rate_limiter_slot():
+    limiter = AdaptiveRateLimiter(max_concurrency=1)
+
+    async def run():
+        task = asyncio.ensure_future(limiter.run(lambda: asyncio.sleep(5), "prompt"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return limiter.metrics()["active"]
+
+    assert asyncio.run(run()) == 0
@@ -0,0 +1,77 @@
+"""
+LLM Rate Limiter Tests
+Tests for token bucket accounting, retry on throttling and adaptive concurrency
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from llm_rate_limiter import AdaptiveRateLimiter, TokenBucket  # noqa: E402
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class TestTokenBucket:
+    def test_waits_when_budget_exhausted(self):
+        bucket = TokenBucket(60)
+        bucket.consume(60)
+        assert bucket.wait_time(1) == pytest.approx(1.0, abs=0.05)
+
+    def test_refund_is_capped_at_capacity(self):
+        bucket = TokenBucket(100)
+        bucket.refund(500)
+        assert bucket.tokens == 100
+
+
+class TestAdaptiveRateLimiter:
+    def test_retries_429_then_succeeds_and_halves_concurrency(self):
+        limiter = AdaptiveRateLimiter(max_concurrency=8, base_backoff_seconds=0.001)
+        attempts = []
+
+        async def call():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise FakeAPIError(429)
+            return "ok"
+
+        assert asyncio.run(limiter.run(call, "prompt")) == "ok"
+        assert len(attempts) == 3
+        assert limiter.concurrency_limit == 2
+        assert limiter.metrics()["retries"] == 2
+
+    def test_client_errors_are_not_retried(self):
+        limiter = AdaptiveRateLimiter(base_backoff_seconds=0.001)
+        attempts = []
+
+        async def call():
+            attempts.append(1)
+            raise FakeAPIError(400)
+
+        with pytest.raises(FakeAPIError):
+            asyncio.run(limiter.run(call, "prompt"))
+        assert len(attempts) == 1
+
+    def test_concurrency_limit_is_respected(self):
+        limiter = AdaptiveRateLimiter(max_concurrency=2)
+        active = {"now": 0, "peak": 0}
+
+        async def call():
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return True
+
+        async def main():
+            await asyncio.gather(*(limiter.run(call, "p") for _ in range(6)))
+
+        asyncio.run(main())
+        assert active["peak"] == 2
@@ -0,0 +1,98 @@
+"""
+Local CV Parser Tests
+Tests for section detection, date ranges, skills and the confidence score of the rule-based parser
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from job_digest import normalize_skills as normalize_job_skills  # noqa: E402
+from local_cv_parser import (  # noqa: E402
+    canonical_skill,
+    dictionary_skills,
+    find_date_range,
+    parse_cv_locally,
+    parse_experience,
+    split_sections,
+)
+from skill_taxonomy import canonical_skill_id  # noqa: E402
+
+TEMPLATED_CV = (Path(__file__).resolve().parents[1] / "uploads" / "cand_0b2d868a.txt").read_text()
+
+
+class TestSections:
+    def test_headings_split_sections(self):
+        sections = split_sections(TEMPLATED_CV)
+        assert sections["header"][0] == "JOHN SMITH"
+        assert {"summary", "skills", "experience", "education"} <= set(sections)
+
+    def test_heading_variants(self):
+        sections = split_sections("Jane Roe\nWork Experience:\nX\nACADEMIC QUALIFICATIONS\nY\nTools & Technologies\nZ")
+        assert sections["experience"] == ["X"]
+        assert sections["education"] == ["Y"]
+        assert sections["skills"] == ["Z"]
+
+
+class TestDateRanges:
+    def test_formats(self):
+        assert find_date_range("Oct 2024 – Present").group("end") == "Present"
+        assert find_date_range("01/2025 - Current") is not None
+        assert find_date_range("(Oct 2022 to Current)") is not None
+        assert find_date_range("2015 - 2017") is not None
+
+    def test_backwards_range_is_ignored(self):
+        assert find_date_range("Won 2019 - 2012 award") is None
+
+    def test_title_above_date_line(self):
+        entries = parse_experience([
+            "QA Engineer",
+            "ContactSwing | Oct 2024 – Present",
+            "● Built regression suites",
+            "Associate Engineer",
+            "Capgemini Engineering | Nov 2021 – Nov 2023",
+            "● Tested card operations",
+        ])
+        assert [(e["role"], e["company"], e["duration"]) for e in entries] == [
+            ("QA Engineer", "ContactSwing", "Oct 2024 - Present"),
+            ("Associate Engineer", "Capgemini Engineering", "Nov 2021 - Nov 2023"),
+        ]
+        assert entries[0]["achievements"] == ["Built regression suites"]
+
+
+def test_dictionary_skills_use_canonical_names():
+    assert dictionary_skills("Built APIs in nodejs and ReactJS, tested with selenium") == ["Node.js", "React", "Selenium"]
+
+
+def test_skill_names_come_from_the_taxonomy():
+    assert [canonical_skill(s) for s in ["Golang", "JIRA", "MS Excel", "restful api", "Quantum  Annealing"]] == [
+        "Go", "Jira", "Excel", "REST APIs", "Quantum Annealing"
+    ]
+    # CV parse, job digest and stored skill IDs agree on every name
+    cv_names = [canonical_skill(s) for s in ["golang", "Spring", "ms excel"]]
+    job_names = normalize_job_skills(["Go", "Spring Boot", "Excel"])
+    assert cv_names == job_names
+    assert [canonical_skill_id(s) for s in cv_names] == [canonical_skill_id(s) for s in ["go", "springboot", "excel"]]
+
+
+def test_everyday_words_are_not_scanned_as_skills():
+    text = "Will go the extra mile, excel at communication and rest when done. Golang, PyTest and Postman daily."
+    assert dictionary_skills(text) == ["Go", "PyTest", "Postman"]
+
+
+class TestParseCVLocally:
+    def test_templated_cv_is_confident(self):
+        parsed, confidence = parse_cv_locally(TEMPLATED_CV)
+        assert confidence >= 0.8
+        assert parsed["name"] == "John Smith"
+        assert parsed["current_role"] == "Senior Software Engineer"
+        assert parsed["email"] == "john.smith@email.com"
+        assert parsed["experience"][0]["company"] == "Tech Corp Inc"
+        assert parsed["education"][0] == {
+            "degree": "Master of Science in Computer Science", "institution": "MIT", "year": "2015"
+        }
+        assert "Kubernetes" in parsed["skills"]
+
+    def test_unstructured_text_is_not_confident(self):
+        _, confidence = parse_cv_locally("Looking for a job. I have worked at many places and know computers.")
+        assert confidence < 0.5
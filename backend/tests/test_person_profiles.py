@@ -0,0 +1,121 @@
+"""
+Person Profile Tests
+Tests for the normalized email / phone keys that identify a person within a
+client, profile matching / merging, and the fields a submitted candidate copies
+"""
+import asyncio
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cv_storage import CVBlobStore  # noqa: E402
+from fake_mongo import FakeDatabase  # noqa: E402
+from person_profiles import (  # noqa: E402
+    PersonProfileStore,
+    normalize_email,
+    normalize_phone,
+    person_keys,
+    submitted_candidate_fields,
+)
+
+
+def _save(store: PersonProfileStore, client_id: str, person_id=None, **person) -> dict:
+    return asyncio.run(store.save(person, client_id, person_id=person_id))
+
+
+class TestNormalization:
+    def test_email(self):
+        assert normalize_email("  Jane.Roe@Example.COM ") == "jane.roe@example.com"
+        assert normalize_email("not an email") == ""
+        assert normalize_email(None) == ""
+
+    def test_phone(self):
+        assert normalize_phone("+91 98765-43210") == normalize_phone("098765 43210") == "9876543210"
+        assert normalize_phone("12345") == ""
+
+    def test_keys(self):
+        assert person_keys("Jane@Example.com", "+91 98765 43210") == ["email:jane@example.com", "phone:9876543210"]
+        assert person_keys("", None) == []
+
+
+class TestProfileMatching:
+    def test_same_email_same_client_merges(self):
+        store = PersonProfileStore(FakeDatabase())
+        first = _save(store, "client_a", name="Jane Roe", email="jane@example.com")
+        second = _save(store, "client_a", name="Jane Roe", email="JANE@example.com ", phone="9876543210")
+        assert second["person_id"] == first["person_id"]
+        assert len(store.collection.documents) == 1
+        assert store.collection.documents[0]["keys"] == ["email:jane@example.com", "phone:9876543210"]
+        # Profiles hold identity only - the parse stays on the candidate records
+        assert "skills" not in store.collection.documents[0]
+
+    def test_phone_with_same_name_merges(self):
+        store = PersonProfileStore(FakeDatabase())
+        first = _save(store, "client_a", name="Jane Roe", email="jane@example.com", phone="+91 98765 43210")
+        no_email = _save(store, "client_a", name="  jane  ROE", email=None, phone="098765-43210")
+        assert no_email["person_id"] == first["person_id"]
+
+    def test_shared_phone_with_different_name_does_not_merge(self):
+        store = PersonProfileStore(FakeDatabase())
+        first = _save(store, "client_a", name="Jane Roe", email="jane@example.com", phone="+91 98765 43210")
+        second = _save(store, "client_a", name="John Doe", email="john@example.com", phone="098765-43210")
+        no_email = _save(store, "client_a", name="Sam Lee", email=None, phone="9876543210")
+        assert len({first["person_id"], second["person_id"], no_email["person_id"]}) == 3
+        assert store.collection.documents[0]["name"] == "Jane Roe"
+
+    def test_profiles_do_not_cross_clients(self):
+        store = PersonProfileStore(FakeDatabase())
+        first = _save(store, "client_a", name="Jane Roe", email="jane@example.com", phone="9876543210")
+        other = _save(store, "client_b", name="Jane Roe", email="jane@example.com", phone="9876543210")
+        assert other["person_id"] != first["person_id"]
+        assert asyncio.run(store.get(first["person_id"], "client_b")) is None
+        assert asyncio.run(store.find("client_b", "jane@example.com"))["person_id"] == other["person_id"]
+        assert asyncio.run(store.find("client_b", None, "9876543210", "Jane Roe"))["person_id"] == other["person_id"]
+
+    def test_pinned_person_of_another_client_is_not_updated(self):
+        store = PersonProfileStore(FakeDatabase())
+        first = _save(store, "client_a", name="Jane Roe", email="jane@example.com")
+        pinned = _save(store, "client_b", person_id=first["person_id"], name="Jane Roe", email="jane@example.com", phone="9876543210")
+        assert pinned["person_id"] != first["person_id"]
+        assert asyncio.run(store.get(first["person_id"], "client_a"))["keys"] == ["email:jane@example.com"]
+
+
+class TestSubmittedCandidateFields:
+    def test_copies_the_source_candidates_own_cv(self):
+        source = {
+            "candidate_id": "cand_src",
+            "name": "Jane Roe",
+            "email": "jane@example.com",
+            "skills": ["Python"],
+            "cv_file_url": "/api/uploads/cand_src.pdf",
+            "cv_text_original": "Jane Roe - Python developer",
+            "cv_redaction_spans": [[0, 8, "name"]],
+            "cv_redaction_version": "1",
+            "ai_story": {"headline": "not copied"},
+        }
+        fields = submitted_candidate_fields(source)
+        assert fields["cv_text_original"] == "Jane Roe - Python developer"
+        assert fields["cv_redaction_spans"] == [[0, 8, "name"]]
+        assert fields["skills"] == ["Python"]
+        assert fields["cv_text_complete"] is True
+        # The file gets its own alias and the story is regenerated for the new job
+        assert "cv_file_url" not in fields and "ai_story" not in fields
+
+
+class TestSubmittedCVAlias:
+    def test_deleting_one_candidate_keeps_the_others_file(self, tmp_path):
+        store = CVBlobStore(FakeDatabase(), tmp_path)
+        stored = asyncio.run(store.store_stream(io.BytesIO(b"Jane Roe CV"), "cand_src.txt", "cand_src.txt"))
+        alias = asyncio.run(store.add_alias("cand_new.txt", stored["sha256"]))
+        assert alias["url"] == "/api/uploads/cand_new.txt"
+
+        asyncio.run(store.release("cand_src.txt"))
+        path, sha256 = asyncio.run(store.resolve("cand_new.txt"))
+        assert path is not None and path.read_bytes() == b"Jane Roe CV"
+        assert sha256 == stored["sha256"]
+
+        asyncio.run(store.release("cand_new.txt"))
+        assert not store.blob_path(stored["sha256"]).exists()
+        assert asyncio.run(store.add_alias("cand_late.txt", stored["sha256"])) is None
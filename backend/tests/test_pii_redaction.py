@@ -0,0 +1,50 @@
+"""
+PII Redaction Tests
+Tests for the single-pass span scanner and lazy rendering of redacted CV text
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pii_redaction import find_pii_spans, redact_text, render_redacted  # noqa: E402
+
+CV_HEADER = (
+    "Priya Sharma\n"
+    "priya.sharma@gmail.com | +1 415 555 0134 | (555) 123-4567\n"
+    "https://www.linkedin.com/in/priya-sharma https://github.com/priya\n"
+    "Senior QA Engineer, 2019-2023, call 555-1234"
+)
+
+
+class TestFindPIISpans:
+    def test_span_types_in_text_order(self):
+        kinds = [kind for _, _, kind in find_pii_spans(CV_HEADER)]
+        assert kinds == ["email", "phone", "phone", "linkedin", "url", "phone"]
+
+    def test_spans_cover_exact_values(self):
+        values = {CV_HEADER[start:end] for start, end, _ in find_pii_spans(CV_HEADER)}
+        assert "priya.sharma@gmail.com" in values
+        assert "1 415 555 0134" in values
+        assert "555-1234" in values
+
+    def test_year_ranges_are_not_phones(self):
+        assert find_pii_spans("Infosys 2019-2023, TCS 2015-2019") == []
+
+    def test_digits_inside_words_are_not_phones(self):
+        assert find_pii_spans("Employee ID EMP9876543210") == []
+
+
+class TestRendering:
+    def test_redacted_view(self):
+        assert redact_text("Mail a.b@x.io or call 555-1234.") == "Mail [EMAIL REDACTED] or call [PHONE REDACTED]."
+
+    def test_url_with_digits_is_redacted_whole(self):
+        assert redact_text("https://linkedin.com/in/jo-1234567890 next") == "[LINKEDIN REDACTED] next"
+
+    def test_render_from_stored_spans_matches_redact_text(self):
+        spans = find_pii_spans(CV_HEADER)
+        assert render_redacted(CV_HEADER, spans) == redact_text(CV_HEADER)
+
+    def test_no_spans_returns_original(self):
+        assert render_redacted("plain text", []) == "plain text"
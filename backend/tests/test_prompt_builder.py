@@ -0,0 +1,89 @@
+"""
+Prompt Builder Tests
+Tests for token-budgeted CV text and story candidate data
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from prompt_builder import PromptBuilder  # noqa: E402
+
+CV_TEXT = "\n".join([
+    "Jane Roe",
+    "jane.roe@example.com | +91 98765 43210",
+    "Hobbies",
+    *[f"Enjoys long distance running and photography trip number {i}" for i in range(40)],
+    "Work Experience",
+    "QA Engineer | Acme | Jan 2021 - Present",
+    "- Built Selenium regression suites",
+    "Skills",
+    "Selenium, Python, JIRA",
+])
+
+CANDIDATE = {
+    "name": "Jane Roe",
+    "current_role": "QA Engineer",
+    "skills": ["Selenium", "Python"],
+    "summary": "QA engineer",
+    "experience": [
+        {
+            "role": f"Role {i}",
+            "company": f"Company {i}",
+            "duration": f"{2020 - i} - {2021 - i}",
+            "achievements": [f"Organised office event number {i}", f"Automated Selenium tests for release {i}"],
+        }
+        for i in range(12)
+    ],
+    "education": [{"degree": "B.Tech", "institution": "IIT", "year": "2012"}],
+}
+
+
+class TestCVText:
+    def test_small_cv_kept_whole(self):
+        builder = PromptBuilder("gpt-4o-mini", cv_parse_budget=2000)
+        assert builder.fit_cv_text("Jane Roe\nSkills\nPython") == "Jane Roe\nSkills\nPython"
+
+    def test_low_priority_sections_dropped_first(self):
+        builder = PromptBuilder("gpt-4o-mini", cv_parse_budget=150)
+        text = builder.fit_cv_text(CV_TEXT)
+        assert builder.count(text) <= 150
+        assert "jane.roe@example.com" in text
+        assert "Built Selenium regression suites" in text
+        assert "Selenium, Python, JIRA" in text
+        # Sections keep their document order
+        assert text.index("Work Experience") < text.index("Skills")
+        assert "trip number 39" not in text
+
+    def test_reserved_tokens_shrink_budget(self):
+        builder = PromptBuilder("gpt-4o-mini", cv_parse_budget=150)
+        assert builder.count(builder.fit_cv_text(CV_TEXT, reserved_tokens=100)) <= 50
+
+    def test_single_long_line_is_cut(self):
+        builder = PromptBuilder("gpt-4o-mini", cv_parse_budget=50)
+        text = builder.fit_cv_text("word " * 500)
+        assert 0 < builder.count(text) <= 50
+
+
+class TestStoryCandidateData:
+    def test_fits_budget_with_recent_roles_first(self):
+        builder = PromptBuilder("gpt-4o-mini", story_budget=400)
+        data = builder.fit_story_candidate_data(CANDIDATE, ["selenium"])
+        assert builder.count(json.dumps(data, indent=2)) <= 400
+        roles = [exp["role"] for exp in data["experience"]]
+        assert roles == [f"Role {i}" for i in range(len(roles))]
+        assert 0 < len(roles) < 12
+
+    def test_relevant_achievements_first(self):
+        builder = PromptBuilder("gpt-4o-mini", story_budget=600)
+        data = builder.fit_story_candidate_data(CANDIDATE, ["selenium"])
+        achievements = [a for exp in data["experience"] for a in exp["achievements"]]
+        assert sum("Selenium" in a for a in achievements) > sum("office event" in a for a in achievements)
+
+    def test_usage_recorded(self):
+        builder = PromptBuilder("gpt-4o-mini", story_budget=10)
+        builder.record("story", "x" * 400)
+        usage = builder.metrics()["usage"]["story"]
+        assert usage["prompts"] == 1
+        assert usage["over_budget"] == 1
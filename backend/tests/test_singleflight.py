@@ -0,0 +1,82 @@
+"""
+Single-Flight Tests
+Tests for coalescing concurrent calls with the same key into one shared call
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from singleflight import SingleFlight  # noqa: E402
+
+
+def make_call(delay: float = 0.05, fail: bool = False):
+    calls = []
+
+    async def call():
+        calls.append(len(calls))
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("generation failed")
+        return {"story": len(calls)}
+
+    return call, calls
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self):
+        flights = SingleFlight()
+        call, calls = make_call()
+
+        async def run():
+            return await asyncio.gather(*[flights.do("story:cand_1:job_1", call) for _ in range(5)])
+
+        results = asyncio.run(run())
+        assert calls == [0]
+        assert [result for result, _ in results] == [{"story": 1}] * 5
+        assert [shared for _, shared in results] == [False, True, True, True, True]
+        assert flights.metrics()["coalesced"] == 4
+        assert flights.metrics()["in_flight"] == 0
+
+    def test_different_keys_and_later_calls_run_separately(self):
+        flights = SingleFlight()
+        call, calls = make_call()
+
+        async def run():
+            await asyncio.gather(flights.do("story:cand_1:job_1", call), flights.do("story:cand_2:job_1", call))
+            await flights.do("story:cand_1:job_1", call)
+
+        asyncio.run(run())
+        assert len(calls) == 3
+
+    def test_failure_reaches_every_caller(self):
+        flights = SingleFlight()
+        call, calls = make_call(fail=True)
+
+        async def run():
+            return await asyncio.gather(*[flights.do("k", call) for _ in range(3)], return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert calls == [0]
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    def test_cancelled_caller_does_not_cancel_shared_call(self):
+        flights = SingleFlight()
+        call, calls = make_call(delay=0.1)
+
+        async def run():
+            first = asyncio.ensure_future(flights.do("k", call))
+            second = asyncio.ensure_future(flights.do("k", call))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second
+
+        result, shared = asyncio.run(run())
+        assert result == {"story": 1}
+        assert shared
+        assert calls == [0]
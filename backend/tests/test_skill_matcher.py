@@ -0,0 +1,91 @@
+"""
+Skill Matcher Tests
+Tests that the Aho-Corasick matcher finds the same exact / partial skill hits
+as the pairwise substring loop it replaces
+"""
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from skill_matcher import SkillMatcher, skill_matcher  # noqa: E402
+
+
+def pairwise_hits(candidate_skills: set[str], job_skills: list[str]) -> tuple[set[int], set[int]]:
+    """The previous nested loop from calculate_fit_score"""
+    exact, partial = set(), set()
+    for index, js in enumerate(job_skills):
+        if js in candidate_skills:
+            exact.add(index)
+            continue
+        for cs in candidate_skills:
+            if js in cs or cs in js:
+                partial.add(index)
+                break
+    return exact, partial
+
+
+class TestSkillMatcher:
+    def test_exact_and_both_substring_directions(self):
+        job_skills = ["postgresql", "react", "sql"]
+        matcher = SkillMatcher(job_skills)
+        exact, partial = matcher.match_skills({"sql", "react native"})
+        assert {job_skills[i] for i in exact} == {"sql"}
+        # "sql" in "postgresql", "react" in "react native"
+        assert {job_skills[i] for i in partial} == {"postgresql", "react"}
+
+    def test_overlapping_patterns(self):
+        job_skills = ["he", "she", "his", "hers"]
+        matcher = SkillMatcher(job_skills)
+        assert {job_skills[i] for i in matcher.find_in_text("ushers")} == {"he", "she", "hers"}
+
+    def test_find_in_cv_text(self):
+        job_skills = ["aws", "docker", "machine learning"]
+        text = "built machine learning pipelines on aws with terraform"
+        assert {job_skills[i] for i in SkillMatcher(job_skills).find_in_text(text)} == {"aws", "machine learning"}
+
+    def test_matches_pairwise_loop(self):
+        rng = random.Random(3)
+        alphabet = "abcde +#."
+
+        def word():
+            return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 6))).strip()
+
+        for _ in range(300):
+            job_skills = sorted({word() for _ in range(rng.randint(0, 12))})
+            candidate_skills = {word() for _ in range(rng.randint(0, 12))}
+            assert SkillMatcher(job_skills).match_skills(candidate_skills) == pairwise_hits(candidate_skills, job_skills)
+
+    def test_matches_pairwise_loop_on_realistic_skills(self):
+        rng = random.Random(11)
+        vocabulary = [
+            "python", "java", "javascript", "typescript", "react", "react native", "node.js", "sql", "nosql",
+            "postgresql", "mysql", "aws", "azure", "gcp", "docker", "kubernetes", "go", "c", "c++", "c#",
+            "machine learning", "deep learning", "excel", "power bi", "tableau", "r", "scala", "spark",
+        ] + ["".join(rng.choice(string.ascii_lowercase) for _ in range(8)) for _ in range(50)]
+        for _ in range(200):
+            job_skills = sorted(set(rng.sample(vocabulary, rng.randint(1, 15))))
+            candidate_skills = set(rng.sample(vocabulary, rng.randint(0, 20)))
+            assert skill_matcher(tuple(job_skills)).match_skills(candidate_skills) == pairwise_hits(candidate_skills, job_skills)
+
+    def test_long_free_text_skill_builds_quickly(self):
+        # required_skills is free text - a pasted paragraph must not stall the event loop
+        rng = random.Random(1)
+        long_skill = " ".join("".join(rng.choice(string.ascii_lowercase) for _ in range(7)) for _ in range(2500))
+        job_skills = ["python", long_skill, "sql"]
+        started = time.perf_counter()
+        matcher = SkillMatcher(job_skills)
+        assert time.perf_counter() - started < 0.5
+
+        inner = long_skill[7000:7020]
+        candidates = {inner, "postgresql", "python"}
+        assert matcher.match_skills(candidates) == pairwise_hits(candidates, job_skills)
+        assert matcher.containing(inner) == {1}
+        assert matcher.containing("pyth") == {0}
+
+    def test_cached_per_skill_set(self):
+        assert skill_matcher(("aws", "sql")) is skill_matcher(("aws", "sql"))
+        assert skill_matcher(("aws", "sql")) is not skill_matcher(("aws", "go"))
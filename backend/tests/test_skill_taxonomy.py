@@ -0,0 +1,68 @@
+"""
+Skill Taxonomy Tests
+Tests for synonym normalization to canonical skill IDs and its effect on
+fit scoring
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fit_scoring import fit_score_components  # noqa: E402
+from skill_taxonomy import (  # noqa: E402
+    SKILL_TAXONOMY,
+    UNLISTED_ID_BASE,
+    canonical_skill_id,
+    canonical_skill_ids,
+    canonical_skill_key,
+    canonical_skill_name,
+    is_listed,
+    normalize_skill,
+)
+
+
+class TestCanonicalIds:
+    def test_synonyms_share_an_id(self):
+        ids = {canonical_skill_id(skill) for skill in ["JS", "Javascript", "javascript ES6", " JavaScript  "]}
+        assert ids == {1}
+        assert canonical_skill_name(1) == "JavaScript"
+
+    def test_versions_and_parentheticals(self):
+        assert canonical_skill_id("Python 3.10") == canonical_skill_id("python")
+        assert canonical_skill_id("Amazon Web Services (AWS)") == canonical_skill_id("aws")
+        assert canonical_skill_id("React v18") == canonical_skill_id("ReactJS")
+
+    def test_distinct_skills_stay_distinct(self):
+        assert canonical_skill_id("Java") != canonical_skill_id("JavaScript")
+        assert canonical_skill_id("React") != canonical_skill_id("React Native")
+
+    def test_unlisted_skills_get_stable_ids(self):
+        skill_id = canonical_skill_id("Quantum Annealing")
+        assert skill_id >= UNLISTED_ID_BASE and not is_listed(skill_id)
+        assert canonical_skill_id("quantum   annealing") == skill_id
+        assert canonical_skill_name(skill_id) is None
+
+    def test_id_list(self):
+        assert canonical_skill_ids(["JS", "javascript", "SQL", "", None]) == sorted({1, 16})
+        assert canonical_skill_ids(None) == []
+
+    def test_table_has_unique_ids_and_aliases(self):
+        ids = [skill_id for skill_id, _, _ in SKILL_TAXONOMY]
+        assert len(ids) == len(set(ids))
+        aliases = [normalize_skill(alias) for _, name, synonyms in SKILL_TAXONOMY for alias in [name, *synonyms]]
+        assert len(aliases) == len(set(aliases))
+
+
+class TestScoringWithSynonyms:
+    def test_synonyms_count_as_exact_matches(self):
+        job = {"title": "Frontend Developer", "required_skills": ["JavaScript", "React", "AWS"]}
+        candidate = {"current_role": "Developer", "skills": ["JS", "ReactJS", "Amazon Web Services"], "experience": []}
+        skills_score, _, _ = fit_score_components(candidate, job)
+        assert skills_score == 45
+
+    def test_substring_credit_on_canonical_names(self):
+        assert canonical_skill_key("Amazon Web Services") == "aws"
+        job = {"required_skills": ["AWS"]}
+        candidate = {"skills": ["AWS Lambda"]}
+        skills_score, _, _ = fit_score_components(candidate, job)
+        assert skills_score == 22.5
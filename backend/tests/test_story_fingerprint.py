@@ -0,0 +1,72 @@
+"""
+Story Fingerprint Tests
+Regenerating a story with unchanged candidate/job inputs returns the stored story
+without an LLM call; `force=true` always regenerates
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get('REACT_APP_BACKEND_URL', '').rstrip('/')
+
+ADMIN_EMAIL = "connect@arbeit.co.in"
+ADMIN_PASSWORD = "admin123"
+
+
+@pytest.fixture(scope="module")
+def auth_headers():
+    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+        "email": ADMIN_EMAIL,
+        "password": ADMIN_PASSWORD
+    })
+    assert response.status_code == 200, f"Admin login failed: {response.text}"
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="module")
+def candidate(auth_headers):
+    jobs = requests.get(f"{BASE_URL}/api/jobs", headers=auth_headers).json()
+    if not jobs:
+        pytest.skip("No jobs available to attach a test candidate to")
+    response = requests.post(
+        f"{BASE_URL}/api/candidates",
+        json={
+            "job_id": jobs[0]["job_id"],
+            "name": f"TEST_StoryFingerprint_{os.urandom(4).hex()}",
+            "current_role": "QA Engineer",
+            "skills": ["Selenium", "Python", "JIRA"]
+        },
+        headers=auth_headers
+    )
+    assert response.status_code in [200, 201], f"Create candidate failed: {response.text}"
+    yield response.json()
+    requests.delete(f"{BASE_URL}/api/candidates/{response.json()['candidate_id']}", headers=auth_headers)
+
+
+def _regenerate(candidate_id, headers, force=False):
+    response = requests.post(
+        f"{BASE_URL}/api/candidates/{candidate_id}/story/regenerate",
+        params={"force": "true"} if force else None,
+        headers=headers
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["ai_story"]
+
+
+class TestStoryFingerprint:
+    def test_unchanged_inputs_return_stored_story(self, auth_headers, candidate):
+        first = _regenerate(candidate["candidate_id"], auth_headers, force=True)
+        second = _regenerate(candidate["candidate_id"], auth_headers)
+        assert second == first
+
+    def test_stream_reports_skipped_regeneration(self, auth_headers, candidate):
+        _regenerate(candidate["candidate_id"], auth_headers, force=True)
+        response = requests.post(
+            f"{BASE_URL}/api/candidates/{candidate['candidate_id']}/story/regenerate/stream",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert "event: story" in response.text
+        assert '"regenerated": false' in response.text
+        assert "event: stage" not in response.text
@@ -0,0 +1,50 @@
+"""
+Story Streaming Tests
+Tests for incremental extraction of story fields from a partially streamed JSON response
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from story_stream import StoryFieldScanner, sse_event  # noqa: E402
+
+STORY = {
+    "headline": "Risk analyst with 6 years in \"credit\" modelling",
+    "summary": "Builds PD/LGD models.\nLeads a team of 3.",
+    "timeline": [{"year": "2020-Present", "title": "Risk Analyst", "company": "Acme", "achievement": "Built models"}],
+    "skills": ["SAS", "Python"],
+    "highlights": ["Reduced losses 12%"],
+    "fit_score": 25
+}
+
+
+def stream(text, chunk_size):
+    scanner = StoryFieldScanner()
+    updates = []
+    for i in range(0, len(text), chunk_size):
+        updates.extend(scanner.feed(text[i:i + chunk_size]))
+    return updates
+
+
+class TestStoryFieldScanner:
+    def test_final_values_match_full_parse(self):
+        text = json.dumps(STORY, indent=2)
+        for chunk_size in (1, 3, 17, len(text)):
+            final = {name: value for name, value, complete in stream(text, chunk_size) if complete}
+            assert final == STORY
+
+    def test_string_fields_stream_before_complete(self):
+        partial = [(n, v) for n, v, complete in stream(json.dumps(STORY), 5) if n == "headline" and not complete]
+        assert partial
+        assert all(STORY["headline"].startswith(v) for _, v in partial)
+
+    def test_number_at_buffer_end_is_not_reported_early(self):
+        scanner = StoryFieldScanner()
+        assert scanner.feed('{"fit_score": 2') == []
+        assert scanner.feed('5}') == [("fit_score", 25, True)]
+
+
+def test_sse_event_format():
+    assert sse_event("stage", {"stage": "saving"}) == 'event: stage\ndata: {"stage": "saving"}\n\n'
@@ -24,6 +24,8 @@ export const AddCandidateModal = ({ open, onClose, onSuccess, jobId, job }) => {
 
   // Upload mode state
   const [selectedFile, setSelectedFile] = useState(null);
+  // One Idempotency-Key per selected file, so retrying the same upload replays the first result
+  const [uploadKey, setUploadKey] = useState(null);
 
   // Manual mode state
   const [manualData, setManualData] = useState({
@@ -45,6 +47,7 @@ export const AddCandidateModal = ({ open, onClose, onSuccess, jobId, job }) => {
         return;
       }
       setSelectedFile(file);
+      setUploadKey(`${Date.now()}-${Math.random().toString(36).slice(2)}`);
     }
   };
 
@@ -70,7 +73,8 @@ export const AddCandidateModal = ({ open, onClose, onSuccess, jobId, job }) => {
       const response = await axios.post(`${API}/candidates/upload`, formData, {
         headers: {
           Authorization: `Bearer ${token}`,
-          'Content-Type': 'multipart/form-data'
+          'Content-Type': 'multipart/form-data',
+          'Idempotency-Key': uploadKey
         }
       });
 
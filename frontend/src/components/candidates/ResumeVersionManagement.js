@@ -26,6 +26,8 @@ export const ResumeVersionManagement = ({ candidateId, token, userRole, onVersio
   const [uploadProgress, setUploadProgress] = useState('');
   const [showUploadModal, setShowUploadModal] = useState(false);
   const [selectedFile, setSelectedFile] = useState(null);
+  // One Idempotency-Key per selected file, so retrying the same upload replays the first result
+  const [uploadKey, setUploadKey] = useState(null);
 
   useEffect(() => {
     fetchVersions();
@@ -57,6 +59,7 @@ export const ResumeVersionManagement = ({ candidateId, token, userRole, onVersio
         return;
       }
       setSelectedFile(file);
+      setUploadKey(`${Date.now()}-${Math.random().toString(36).slice(2)}`);
     }
   };
 
@@ -81,7 +84,8 @@ export const ResumeVersionManagement = ({ candidateId, token, userRole, onVersio
         {
           headers: {
             Authorization: `Bearer ${token}`,
-            'Content-Type': 'multipart/form-data'
+            'Content-Type': 'multipart/form-data',
+            'Idempotency-Key': uploadKey
           }
         }
       );
@@ -0,0 +1,66 @@
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+const API = `${BACKEND_URL}/api`;
+
+// Regenerate a candidate story over Server-Sent Events.
+// onField(name, value) fires as story fields stream in; resolves with the
+// final persisted { ai_story, story_last_generated, regenerated }.
+// regenerated is false when the story inputs were unchanged and the stored
+// story was returned; pass force: true to always call the LLM.
+export async function streamStoryRegeneration({ candidateId, token, force = false, onStage, onField, onError }) {
+  const query = force ? '?force=true' : '';
+  const response = await fetch(`${API}/candidates/${candidateId}/story/regenerate/stream${query}`, {
+    method: 'POST',
+    headers: {
+      Authorization: `Bearer ${token}`,
+      Accept: 'text/event-stream'
+    }
+  });
+
+  if (!response.ok || !response.body) {
+    let detail = 'Failed to regenerate story';
+    try {
+      detail = (await response.json()).detail || detail;
+    } catch (e) {
+      // Non-JSON error body
+    }
+    throw new Error(detail);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let result = null;
+
+  const handleEvent = (rawEvent) => {
+    let event = 'message';
+    let data = '';
+    rawEvent.split('\n').forEach((line) => {
+      if (line.startsWith('event:')) event = line.slice(6).trim();
+      else if (line.startsWith('data:')) data += line.slice(5).trim();
+    });
+    if (!data) return;
+    const payload = JSON.parse(data);
+    if (event === 'stage' && onStage) onStage(payload.stage);
+    else if (event === 'field' && onField) onField(payload.name, payload.value, payload.complete);
+    else if (event === 'error' && onError) onError(payload.detail);
+    else if (event === 'story') result = payload;
+  };
+
+  // eslint-disable-next-line no-constant-condition
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      handleEvent(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+    }
+  }
+
+  if (!result) {
+    throw new Error('Story stream ended before the story was saved');
+  }
+  return result;
+}
@@ -13,6 +13,7 @@ import { CandidateStorySection } from '../components/candidates/CandidateStorySe
 import { CandidateResumeSection } from '../components/candidates/CandidateResumeSection';
 import { ReviewPanel } from '../components/candidates/ReviewPanel';
 import { InterviewScheduler, InterviewsList } from '../components/interviews';
+import { streamStoryRegeneration } from '../lib/storyStream';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -102,19 +103,26 @@ export const CandidateDetail = () => {
   const handleRegenerateStory = async () => {
     setRegeneratingStory(true);
     try {
-      const response = await axios.post(
-        `${API}/candidates/${candidateId}/regenerate-story`,
-        {},
-        { headers: { Authorization: `Bearer ${token}` } }
-      );
+      // Stream the story so fields paint as the AI writes them
+      const result = await streamStoryRegeneration({
+        candidateId,
+        token,
+        onField: (name, value) => {
+          setCandidate(prev => ({
+            ...prev,
+            ai_story: { ...(prev.ai_story || {}), [name]: value }
+          }));
+        },
+        onError: (detail) => toast.warning(detail)
+      });
       setCandidate(prev => ({
         ...prev,
-        ai_story: response.data.ai_story
+        ai_story: result.ai_story
       }));
-      toast.success('AI Story regenerated successfully');
+      toast.success(result.regenerated ? 'AI Story regenerated successfully' : 'AI Story is already up to date');
     } catch (error) {
       console.error('Failed to regenerate story:', error);
-      toast.error(error.response?.data?.detail || 'Failed to regenerate AI story');
+      toast.error(error.message || 'Failed to regenerate AI story');
     } finally {
       setRegeneratingStory(false);
     }
@@ -5,6 +5,7 @@ import axios from 'axios';
 import { Button } from '../components/ui/button';
 import { Badge } from '../components/ui/badge';
 import { toast } from 'sonner';
+import { streamStoryRegeneration } from '../lib/storyStream';
 import { 
   ArrowLeft, 
   Download, 
@@ -52,13 +53,23 @@ export const CandidateStoryView = () => {
   const handleRegenerateStory = async () => {
     setRegenerating(true);
     try {
-      const response = await axios.post(
-        `${API}/candidates/${candidateId}/story/regenerate`,
-        {},
-        { headers: { Authorization: `Bearer ${token}` } }
-      );
-      setCandidate(response.data);
-      toast.success('Story regenerated successfully');
+      // Stream the story so fields paint as the AI writes them
+      const result = await streamStoryRegeneration({
+        candidateId,
+        token,
+        onField: (name, value) => {
+          setCandidate(prev => ({
+            ...prev,
+            ai_story: { ...(prev.ai_story || {}), [name]: value }
+          }));
+        }
+      });
+      setCandidate(prev => ({
+        ...prev,
+        ai_story: result.ai_story,
+        story_last_generated: result.story_last_generated
+      }));
+      toast.success(result.regenerated ? 'Story regenerated successfully' : 'Story is already up to date');
     } catch (error) {
       console.error('Failed to regenerate story:', error);
       toast.error('Failed to regenerate story');